@@ -0,0 +1,374 @@
+import _ctypes
+import argparse
+import ctypes
+import hashlib
+import importlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+from metrics import compute_metrics, format_report
+from result_columns import ResultColumns
+from snapshot_ring import RING_HEADER_BYTES, RING_SCALARS, SYNC_FIELDS, SlotLayout, decode_slot
+
+# ====================================================================
+# IN-PROCESS ENGINE (ctypes)
+# Builds the embedded C engine (sim_engine.py) once as a shared library
+# with -DSIM_LIBRARY and drives it from Python: no process start,
+# no events.log, no output.json. step() runs one scheduler decision and
+# snapshots are decoded from a buffer the engine fills (or handed to a
+# callback as the engine logs them), using the shared-memory ring's slot
+# layout. The engine keeps its state in C globals, so each Engine loads
+# a private copy of the library; the build itself is cached by source hash,
+# and so is the executable the GUIs run (build_executable).
+#
+#     python engine_lib.py RR 2 12 1 8 seed=3 --bench
+#     python engine_lib.py RR 2 6 1 8 memory=semaphore dispatch=scan
+# ====================================================================
+
+IS_WINDOWS = platform.system() == 'Windows'
+LIB_SUFFIX = ".dll" if IS_WINDOWS else ".so"
+EXE_SUFFIX = ".exe" if IS_WINDOWS else ""
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "semaphore_sim_lib")
+ZLIB_FLAGS, ZLIB_LIBS = ["-DSIM_ZLIB"], ["-lz"] # log_compress=zlib; builds without them when zlib is missing
+RUN_CHUNK = 1000 # Steps per sim_run call when a run has a time limit
+
+# void (*)(const int *words, int count): the words are only valid during the call
+SNAPSHOT_CALLBACK = ctypes.CFUNCTYPE(None, ctypes.POINTER(ctypes.c_int), ctypes.c_int)
+
+
+def engine_source(module="sim_engine"):
+    """C_SOURCE_CODE of an engine module (main.py and phase3.py re-export sim_engine's)."""
+    return importlib.import_module(module).C_SOURCE_CODE
+
+
+def _build(source, suffix, flags, cache_dir):
+    digest = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(cache_dir, f"sim_{digest}{suffix}")
+    if os.path.exists(path):
+        return path
+    os.makedirs(cache_dir, exist_ok=True)
+    c_file = os.path.join(cache_dir, f"sim_{digest}.c")
+    with open(c_file, "w", encoding="utf-8") as f:
+        f.write(source)
+    partial = f"{path}.{os.getpid()}.tmp" # Renamed into place, so a concurrent build never loads half a file
+    for extra_flags, extra_libs in ((ZLIB_FLAGS, ZLIB_LIBS), ([], [])):
+        p = subprocess.run(["gcc"] + flags + extra_flags + [c_file, "-o", partial, "-lm"] + extra_libs, capture_output=True, text=True)
+        if p.returncode == 0:
+            break
+    if p.returncode != 0:
+        raise RuntimeError(f"Build failed:\n{p.stderr}")
+    os.replace(partial, path)
+    return path
+
+
+def build_library(source, cache_dir=CACHE_DIR):
+    """Compiles the C source as a shared library, once per distinct source; returns its path."""
+    flags = ["-shared", "-O2", "-DSIM_LIBRARY"]
+    if not IS_WINDOWS:
+        flags.insert(0, "-fPIC")
+    return _build(source, LIB_SUFFIX, flags, cache_dir)
+
+
+def build_executable(source, cache_dir=CACHE_DIR):
+    """Compiles the C source as the engine executable, once per distinct source; returns its path.
+
+    Every scheduler and memory module is chosen by arguments, so one build serves every mode.
+    """
+    return _build(source, EXE_SUFFIX or ".bin", ["-O2"], cache_dir)
+
+
+def is_library(path):
+    return path.endswith(LIB_SUFFIX)
+
+
+class Engine:
+    """One simulation run inside this process.
+
+    args are the engine executable's arguments (algorithm, quantum, ...,
+    KEY=VALUE options). Wall-clock pacing is off unless realtime=1 is passed.
+    """
+
+    def __init__(self, library, args, on_snapshot=None):
+        fd, self.lib_path = tempfile.mkstemp(prefix="sim_run_", suffix=LIB_SUFFIX)
+        os.close(fd)
+        shutil.copyfile(library, self.lib_path)
+        self.lib = ctypes.CDLL(self.lib_path)
+        self._declare()
+        self.finished = False
+        self._callback = None
+
+        # parse_options() writes into its arguments, so each one gets its own buffer
+        self._argv_buffers = [ctypes.create_string_buffer(a.encode("utf-8")) for a in ["sim"] + list(args)]
+        argv = (ctypes.c_char_p * len(self._argv_buffers))(*(ctypes.cast(b, ctypes.c_char_p) for b in self._argv_buffers))
+        if self.lib.sim_init(len(self._argv_buffers), argv) != 0:
+            self._unload()
+            raise ValueError(f"Engine rejected arguments: {' '.join(args)}")
+
+        header = ctypes.create_string_buffer(RING_HEADER_BYTES)
+        self.lib.sim_header(header)
+        self.layout = SlotLayout(header.raw)
+        self._buffer = (ctypes.c_int * self.lib.sim_snapshot_words())()
+        self._words = memoryview(self._buffer).cast("B").cast("i")
+        if on_snapshot:
+            # sim_init already logged the initial state, before the layout was known
+            self.on_snapshot(on_snapshot)
+            on_snapshot(self.snapshot())
+
+    def _declare(self):
+        lib = self.lib
+        lib.sim_init.argtypes = [ctypes.c_int, ctypes.POINTER(ctypes.c_char_p)]
+        lib.sim_run.argtypes = [ctypes.c_int]
+        lib.sim_set_callback.argtypes = [SNAPSHOT_CALLBACK]
+        lib.sim_set_callback.restype = None
+        lib.sim_header.argtypes = [ctypes.c_char_p]
+        lib.sim_header.restype = None
+        lib.sim_snapshot.argtypes = [ctypes.POINTER(ctypes.c_int), ctypes.c_int]
+        lib.sim_column_name.argtypes = [ctypes.c_int]
+        lib.sim_column_name.restype = ctypes.c_char_p
+        lib.sim_results.argtypes = [ctypes.POINTER(ctypes.c_longlong), ctypes.c_int]
+        lib.sim_totals.argtypes = [ctypes.POINTER(ctypes.c_longlong)]
+        lib.sim_totals.restype = None
+        lib.sim_algorithm.restype = ctypes.c_char_p
+        lib.sim_finish.argtypes = [ctypes.c_int]
+        lib.sim_finish.restype = None
+        if hasattr(lib, "sim_deadlines"):
+            lib.sim_deadlines.argtypes = [ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_int), ctypes.c_int]
+        if hasattr(lib, "sim_sections"):
+            lib.sim_sections.argtypes = [ctypes.c_char_p, ctypes.c_int]
+
+    def step(self):
+        """One scheduler step; False once every process has finished."""
+        return bool(self.lib.sim_step())
+
+    def run(self, max_steps=0, timeout=None):
+        """Steps until the end (or max_steps); returns the number of steps taken.
+
+        With a timeout (wall-clock seconds), steps go in chunks of RUN_CHUNK and
+        TimeoutError is raised once the limit passes before the run is done.
+        """
+        if timeout is None:
+            return self.lib.sim_run(max_steps)
+        deadline = time.perf_counter() + timeout
+        steps = 0
+        while not self.done and (max_steps <= 0 or steps < max_steps):
+            chunk = RUN_CHUNK if max_steps <= 0 else min(RUN_CHUNK, max_steps - steps)
+            steps += self.lib.sim_run(chunk)
+            if not self.done and time.perf_counter() > deadline:
+                raise TimeoutError(f"engine run not done after {timeout} s ({steps} steps)")
+        return steps
+
+    @property
+    def done(self):
+        return bool(self.lib.sim_done())
+
+    @property
+    def time(self):
+        return self.lib.sim_time()
+
+    def snapshot_words(self):
+        """The current state as raw slot words (a view of this Engine's buffer, overwritten on the next call)."""
+        count = self.lib.sim_snapshot(self._buffer, len(self._buffer))
+        return self._words[:count]
+
+    def snapshot(self):
+        """The current state as an events.log-shaped dict."""
+        self.lib.sim_snapshot(self._buffer, len(self._buffer))
+        return decode_slot(self._words, 0, self.layout)
+
+    def on_snapshot(self, fn, raw=False):
+        """Calls fn with every snapshot the engine logs: a dict, or with raw=True an int32 array
+        that is only valid during the call. fn=None stops the calls."""
+        if fn is None:
+            self._callback = None
+            self.lib.sim_set_callback(SNAPSHOT_CALLBACK())
+            return
+        layout = self.layout
+
+        def deliver(words, count):
+            if raw:
+                fn(np.ctypeslib.as_array(words, shape=(count,)))
+            else:
+                fn(decode_slot(words, 0, layout))
+
+        self._callback = SNAPSHOT_CALLBACK(deliver) # Kept referenced for as long as C may call it
+        self.lib.sim_set_callback(self._callback)
+
+    def totals(self):
+        buf = (ctypes.c_longlong * 4)()
+        self.lib.sim_totals(buf)
+        return {"numProcesses": buf[0], "totalTime": buf[1], "totalBurstTime": buf[2],
+                "algorithm": self.lib.sim_algorithm().decode("utf-8"), "seed": buf[3]}
+
+    def timeline(self):
+        words = self.snapshot_words()
+        start = RING_SCALARS + len(self.layout.sync_names) * len(SYNC_FIELDS) + self.layout.num_processes * self.layout.proc_fields
+        return np.array(words[start:], dtype=np.int32)
+
+    def deadlines(self):
+        """output.json's "deadlines" block, or None when the engine or the run has no deadlines."""
+        if not hasattr(self.lib, "sim_deadlines"):
+            return None
+        info = (ctypes.c_double * 6)()
+        count = self.lib.sim_deadlines(info, None, 0)
+        if count < 0:
+            return None
+        lateness = (ctypes.c_int * max(count, 1))()
+        self.lib.sim_deadlines(info, lateness, count)
+        slack, utilization, admitted, bound, admission, rejected = info
+        return {"slack": int(slack), "utilization": round(utilization, 4), "admittedUtilization": round(admitted, 4),
+                "bound": round(bound, 4), "schedulable": utilization <= bound + 1e-9, "admission": bool(admission),
+                "rejected": int(rejected), "jobs": count, "misses": sum(1 for late in lateness[:count] if late > 0),
+                "lateness": list(lateness[:count])}
+
+    def sections(self):
+        """output.json's run-level blocks (contextSwitch, memory, tlb, deadlock, deadlines, ...) as a dict."""
+        if not hasattr(self.lib, "sim_sections"):
+            return {}
+        size = self.lib.sim_sections(None, 0)
+        if size < 0:
+            raise MemoryError("engine could not format its results")
+        buf = ctypes.create_string_buffer(size + 1)
+        self.lib.sim_sections(buf, len(buf))
+        return json.loads(buf.value.decode("utf-8"))
+
+    def results(self):
+        """Per-process results as a ResultColumns (same columns as export=1), unfinished rows included."""
+        names = [self.lib.sim_column_name(c).decode("utf-8") for c in range(self.lib.sim_columns())]
+        meta = self.totals()
+        rows = np.zeros((meta["numProcesses"], len(names)), dtype=np.int64)
+        self.lib.sim_results(rows.ctypes.data_as(ctypes.POINTER(ctypes.c_longlong)), rows.size)
+        meta["columns"] = names
+        return ResultColumns.from_arrays({name: rows[:, c] for c, name in enumerate(names)}, meta, self.timeline())
+
+    def metrics(self, window=None):
+        """compute_metrics() of the run so far, without output.json."""
+        columns = self.results()
+        data = columns.as_results()
+        deadlines = self.deadlines()
+        if deadlines is not None:
+            data["deadlines"] = deadlines
+        return compute_metrics(data, window=window, columns=columns)
+
+    def output(self):
+        """The run as output.json holds it (per-process paging blocks aside), without writing the file."""
+        columns = self.results()
+        data = {**columns.as_results(), **self.sections()}
+        data["timeline"] = [f"P{pid}" for pid in columns.timeline.tolist()]
+        names = list(columns.columns)
+        data["processes"] = [dict(zip(names, row)) for row in zip(*(columns[name].tolist() for name in names))]
+        return data
+
+    def finish(self, write_results=False):
+        """Frees the engine's run; write_results=True also writes output.json to the working directory."""
+        if not self.finished:
+            self.lib.sim_finish(1 if write_results else 0)
+            self.finished = True
+
+    def _unload(self):
+        if self.lib is None:
+            return
+        handle = self.lib._handle
+        self.lib = None
+        if IS_WINDOWS:
+            _ctypes.FreeLibrary(handle)
+        else:
+            _ctypes.dlclose(handle)
+        os.remove(self.lib_path)
+
+    def close(self):
+        if self.lib is not None:
+            self.finish()
+            self._unload()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_output(engine, args, timeout=None):
+    """Runs one configuration to the end without pacing; returns its output.json data, or None if the run failed.
+
+    engine is a library from build_library() (run in process, the timeout is checked between
+    chunks of scheduler steps) or an engine executable (run in a scratch directory).
+    """
+    args = [arg for arg in args if not arg.startswith("realtime=")]
+    if is_library(engine):
+        try:
+            with Engine(engine, args) as run:
+                run.run(timeout=timeout)
+                return run.output()
+        except (OSError, ValueError): # TimeoutError is an OSError
+            return None
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            p = subprocess.run([os.path.abspath(engine)] + args + ["realtime=0"], cwd=workdir,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return None
+        results = os.path.join(workdir, "output.json")
+        if p.returncode != 0 or not os.path.exists(results):
+            return None
+        with open(results, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def run_metrics(library, args, timeout=None):
+    """Runs one configuration to the end in process and returns its metrics (TimeoutError past timeout seconds)."""
+    with Engine(library, args) as engine:
+        engine.run(timeout=timeout)
+        return engine.metrics()
+
+
+def benchmark(library, args):
+    """Per-call costs of the in-process API on one run, in microseconds."""
+    with Engine(library, args) as engine:
+        t0 = time.perf_counter()
+        for _ in range(1000):
+            engine.time # A call that does no work: the bare ctypes overhead
+        call_us = (time.perf_counter() - t0) * 1e3
+        steps = 0
+        step_s = raw_s = snap_s = 0.0
+        while True:
+            t0 = time.perf_counter()
+            more = engine.step()
+            t1 = time.perf_counter()
+            engine.snapshot_words()
+            t2 = time.perf_counter()
+            engine.snapshot()
+            step_s += t1 - t0
+            raw_s += t2 - t1
+            snap_s += time.perf_counter() - t2
+            if not more:
+                break
+            steps += 1
+    calls = steps + 1
+    return {"steps": steps, "call_us": call_us, "step_us": step_s * 1e6 / calls,
+            "words_us": raw_s * 1e6 / calls, "snapshot_us": snap_s * 1e6 / calls}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the simulator engine in process through its shared library")
+    parser.add_argument("args", nargs="+", help="Engine arguments and KEY=VALUE options")
+    parser.add_argument("--bench", action="store_true", help="Report per-call overhead instead of the metrics")
+    args = parser.parse_intermixed_args()
+
+    library = build_library(engine_source())
+    if args.bench:
+        b = benchmark(library, args.args)
+        print(f"{b['steps']} steps | call {b['call_us']:.2f} us | step {b['step_us']:.2f} us | "
+              f"snapshot words {b['words_us']:.2f} us | decoded snapshot {b['snapshot_us']:.2f} us")
+    else:
+        print(format_report(run_metrics(library, args.args)), end="")
+
+
+if __name__ == "__main__":
+    main()
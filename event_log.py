@@ -0,0 +1,211 @@
+import argparse
+import bisect
+import json
+import os
+import struct
+import zlib
+from collections import OrderedDict, namedtuple
+
+# ====================================================================
+# EVENT LOG READER
+# events.log holds one JSON snapshot per line or, with log_compress=zlib,
+# a header, deflated blocks of those lines, a block index and a trailer
+# (COMPRESSED EVENT LOG in sim_engine.py). Snapshots are streamed one
+# block at a time, so memory stays at one block however long the run is,
+# and a seek by time or snapshot number decompresses only the block the
+# index points at. A run cut short has no index: its blocks are found by
+# walking their headers, and its last lines are still in events.log.part.
+#
+#     python event_log.py events.log --time 42
+# ====================================================================
+
+FILE_MAGIC = b"SIMEVLZ1"
+FILE_HEADER = struct.Struct("<8sii")     # magic, codec, block_bytes
+BLOCK_HEADER = struct.Struct("<iiiiii")  # magic, packed_bytes, raw_bytes, count, first_time, last_time
+INDEX_ENTRY = struct.Struct("<qiiii")    # offset, first_time, last_time, count, first_snapshot
+TRAILER = struct.Struct("<qii")          # index_offset, block_count, magic
+BLOCK_MAGIC = 0x314B4C42 # "BLK1"
+INDEX_MAGIC = 0x31584449 # "IDX1"
+CODEC_ZLIB = 1
+STAGE_SUFFIX = ".part"
+BLOCK_CACHE = 4 # Decompressed blocks kept, so seeks near each other reuse them
+
+BlockInfo = namedtuple("BlockInfo", "offset first_time last_time count first_snapshot")
+
+
+def parse_lines(text):
+    """Snapshots in a chunk of events.log text; partial or corrupt lines are skipped."""
+    snapshots = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            try:
+                snapshots.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return snapshots
+
+
+class EventLog:
+    """One events.log, plain or block-compressed."""
+
+    def __init__(self, path):
+        self.path = path
+        self.compressed = False
+        self.indexed = False
+        self.blocks = []
+        self._cache = OrderedDict()
+        self._tail = None
+        with open(path, "rb") as f:
+            head = f.read(FILE_HEADER.size)
+            if len(head) == FILE_HEADER.size and head[:len(FILE_MAGIC)] == FILE_MAGIC:
+                _, codec, self.block_bytes = FILE_HEADER.unpack(head)
+                if codec != CODEC_ZLIB:
+                    raise ValueError(f"{path}: unknown codec {codec}")
+                self.compressed = True
+                index = self._read_index(f)
+                self.indexed = index is not None
+                self.blocks = index if self.indexed else self._scan_blocks(f)
+        self._starts = [b.first_time for b in self.blocks]
+        self._firsts = [b.first_snapshot for b in self.blocks]
+
+    def _read_index(self, f):
+        size = f.seek(0, os.SEEK_END)
+        if size < FILE_HEADER.size + TRAILER.size:
+            return None
+        f.seek(size - TRAILER.size)
+        index_offset, block_count, magic = TRAILER.unpack(f.read(TRAILER.size))
+        if magic != INDEX_MAGIC or index_offset + block_count * INDEX_ENTRY.size + TRAILER.size != size:
+            return None
+        f.seek(index_offset)
+        return [BlockInfo(*entry) for entry in INDEX_ENTRY.iter_unpack(f.read(block_count * INDEX_ENTRY.size))]
+
+    def _scan_blocks(self, f):
+        size = f.seek(0, os.SEEK_END)
+        blocks = []
+        offset, first = FILE_HEADER.size, 0
+        while offset + BLOCK_HEADER.size <= size:
+            f.seek(offset)
+            magic, packed, _, count, first_time, last_time = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+            if magic != BLOCK_MAGIC or offset + BLOCK_HEADER.size + packed > size:
+                break
+            blocks.append(BlockInfo(offset, first_time, last_time, count, first))
+            offset += BLOCK_HEADER.size + packed
+            first += count
+        return blocks
+
+    @property
+    def block_count(self):
+        """Snapshots in the compressed blocks."""
+        return sum(b.count for b in self.blocks)
+
+    @property
+    def tail(self):
+        """Snapshots of a run cut short that only reached events.log.part (none once the log is indexed)."""
+        if self._tail is None:
+            self._tail = list(self._stage_lines()) if self.compressed else []
+        return self._tail
+
+    @property
+    def count(self):
+        """Snapshots in the compressed blocks and the plain tail of a run cut short."""
+        return self.block_count + len(self.tail)
+
+    def _decompress(self, f, block):
+        f.seek(block.offset)
+        packed = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))[1]
+        return zlib.decompress(f.read(packed)).decode("utf-8")
+
+    def read_block(self, k):
+        """Snapshots of block k."""
+        snapshots = self._cache.get(k)
+        if snapshots is None:
+            with open(self.path, "rb") as f:
+                snapshots = parse_lines(self._decompress(f, self.blocks[k]))
+            self._cache[k] = snapshots
+            if len(self._cache) > BLOCK_CACHE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(k)
+        return snapshots
+
+    def _stage_lines(self):
+        stage = self.path + STAGE_SUFFIX
+        if self.indexed or not os.path.exists(stage):
+            return
+        with open(stage, "r", encoding="utf-8") as f:
+            for line in f:
+                yield from parse_lines(line)
+
+    def __iter__(self):
+        """Every snapshot in order, decompressing one block at a time."""
+        if not self.compressed:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    yield from parse_lines(line)
+            return
+        with open(self.path, "rb") as f:
+            for block in self.blocks:
+                yield from parse_lines(self._decompress(f, block))
+        yield from self._stage_lines()
+
+    def snapshot(self, index):
+        """The index-th snapshot of a compressed log, counting the tail of a run cut short."""
+        if not self.compressed or not 0 <= index < self.count:
+            raise IndexError(index)
+        if index >= self.block_count:
+            return self.tail[index - self.block_count]
+        k = bisect.bisect_right(self._firsts, index) - 1
+        return self.read_block(k)[index - self.blocks[k].first_snapshot]
+
+    def snapshot_at(self, time):
+        """The last snapshot whose time is <= time (the first one if time precedes them all)."""
+        if not self.compressed:
+            found = None
+            for snapshot in self:
+                if found is not None and snapshot.get("time", 0) > time:
+                    break
+                found = snapshot
+            return found
+        tail = self.tail
+        if tail and (not self.blocks or tail[0].get("time", 0) <= time):
+            times = [s.get("time", 0) for s in tail]
+            return tail[max(bisect.bisect_right(times, time) - 1, 0)]
+        if not self.blocks:
+            return None
+        k = max(bisect.bisect_right(self._starts, time) - 1, 0)
+        snapshots = self.read_block(k)
+        times = [s.get("time", 0) for s in snapshots]
+        return snapshots[max(bisect.bisect_right(times, time) - 1, 0)]
+
+
+def iter_snapshots(path):
+    """Streams the snapshots of an events.log, plain or compressed."""
+    return iter(EventLog(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect an events.log, plain or block-compressed")
+    parser.add_argument("path", nargs="?", default="events.log")
+    parser.add_argument("--time", type=int, default=None, help="Print the snapshot in effect at this simulated time")
+    parser.add_argument("--decompress", metavar="OUT", default=None, help="Write the snapshots as a plain events.log")
+    args = parser.parse_args()
+
+    log = EventLog(args.path)
+    if args.time is not None:
+        print(json.dumps(log.snapshot_at(args.time)))
+    elif args.decompress:
+        with open(args.decompress, "w", encoding="utf-8") as f:
+            for snapshot in log:
+                f.write(json.dumps(snapshot, separators=(",", ":")) + "\n")
+    elif log.compressed:
+        index = "indexed" if log.indexed else "no index (run cut short)"
+        tail = f" + {len(log.tail)} in {args.path}{STAGE_SUFFIX}" if log.tail else ""
+        print(f"{args.path}: {log.block_count} snapshots in {len(log.blocks)} zlib blocks{tail}, {index}, "
+              f"{os.path.getsize(args.path)} bytes")
+    else:
+        print(f"{args.path}: plain, {sum(1 for _ in log)} snapshots, {os.path.getsize(args.path)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import argparse
+import json
+import math
+import os
+
+import numpy as np
+
+# ====================================================================
+# VECTORIZED SCHEDULING METRICS
+# Works on the per-process results in output.json (every engine mode
+# writes the same core fields), one NumPy column per field, so the report
+# stays instant for very large runs and can be used without the GUI:
+#
+#     python metrics.py output.json --window 5 --json
+#     python metrics.py results/ # columns streamed with export=1
+# ====================================================================
+
+PERCENTILES = (50, 95, 99)
+DEFAULT_WINDOWS = 10 # Throughput windows per run when no width is given
+
+# output.json key -> (column name, default for results written by older engines)
+PROCESS_COLUMNS = {
+    "id": ("id", 0),
+    "burst": ("burst", 0),
+    "arrival": ("arrival", 0),
+    "start": ("start", -1),
+    "completion": ("completion", 0),
+    "turnaroundTime": ("turnaround", 0),
+    "waitingTime": ("waiting", 0),
+    "starvation": ("starvation", 0),
+    "switches": ("switches", 0),
+    "preemptions": ("preemptions", 0),
+    "switchMs": ("switch_ms", 0),
+}
+
+
+def load_results(path="output.json"):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def process_columns(procs):
+    """Turns the list of per-process dicts into one int64 array per field."""
+    n = len(procs)
+    return {
+        column: np.fromiter((p.get(key, default) for p in procs), dtype=np.int64, count=n)
+        for key, (column, default) in PROCESS_COLUMNS.items()
+    }
+
+
+def exported_columns(columns):
+    """Same as process_columns, from a result_columns.ResultColumns (memory-mapped, no per-process dicts)."""
+    n = len(columns)
+    return {
+        column: np.asarray(columns[key], dtype=np.int64) if key in columns else np.full(n, default, dtype=np.int64)
+        for key, (column, default) in PROCESS_COLUMNS.items()
+    }
+
+
+def percentiles(values):
+    if values.size == 0:
+        return {f"p{q}": 0.0 for q in PERCENTILES}
+    return {f"p{q}": float(v) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def jain_index(values):
+    """Jain's fairness index: 1.0 when all values are equal, 1/n when one process gets everything."""
+    if values.size == 0:
+        return 1.0
+    denom = values.size * np.sum(values * values)
+    return float(np.sum(values) ** 2 / denom) if denom > 0 else 1.0
+
+
+def compute_metrics(data, window=None, columns=None):
+    """Summary statistics for one run. Returns plain Python types (JSON-serializable).
+
+    columns, if given, is a result_columns.ResultColumns used instead of data["processes"].
+    """
+    cols = exported_columns(columns) if columns is not None else process_columns(data.get("processes", []))
+    total_time = int(data.get("totalTime", 0))
+    total_burst_time = int(data.get("totalBurstTime", 0))
+
+    done = cols["completion"] > 0
+    started = cols["start"] >= 0
+    turnaround = cols["turnaround"][done]
+    waiting = cols["waiting"][done]
+    response = (cols["start"] - cols["arrival"])[started]
+
+    # Completions per window of simulated time
+    width = window or max(1, math.ceil(total_time / DEFAULT_WINDOWS))
+    edges = np.arange(0, total_time + width, width)
+    if edges.size < 2:
+        edges = np.array([0, width])
+    completions, _ = np.histogram(cols["completion"][done], bins=edges)
+
+    # Fairness over each finished process's service rate (burst / turnaround):
+    # 1.0 means every process was slowed down by the same factor.
+    rates = cols["burst"][done] / np.maximum(turnaround, 1)
+
+    overhead = float(cols["switch_ms"].sum()) / 1000
+
+    def mean(values):
+        return float(values.mean()) if values.size else 0.0
+
+    metrics = {
+        "algorithm": data.get("algorithm", "N/A"),
+        "num_processes": int(cols["id"].size),
+        "completed": int(done.sum()),
+        "total_time": total_time,
+        "cpu_utilization": (total_burst_time / total_time) * 100 if total_time > 0 else 0.0,
+        "turnaround": {"avg": mean(turnaround), **percentiles(turnaround)},
+        "waiting": {"avg": mean(waiting), **percentiles(waiting)},
+        "response": {"avg": mean(response), **percentiles(response)},
+        "throughput": {
+            "overall": float(done.sum()) / total_time if total_time > 0 else 0.0,
+            "window": int(width),
+            "window_start": edges[:-1].tolist(),
+            "completions": completions.tolist(),
+            "peak": float(completions.max()) / width,
+        },
+        "fairness": jain_index(rates),
+        "starvation": {
+            "processes": int(np.count_nonzero(cols["starvation"])),
+            "events": int(cols["starvation"].sum()),
+        },
+        # Switch costs (switch_ms=, cache_ms=) are part of total_time, so they also lower throughput
+        "context_switches": {
+            "switches": int(cols["switches"].sum()),
+            "preemptions": int(cols["preemptions"].sum()),
+            "overhead_seconds": overhead,
+            "overhead_share": overhead / total_time if total_time > 0 else 0.0,
+        },
+    }
+    if "deadlines" in data:
+        metrics["deadlines"] = deadline_metrics(data["deadlines"])
+    return metrics
+
+
+def deadline_metrics(deadlines):
+    """Miss count and lateness distribution from the engine's per-job lateness list."""
+    lateness = np.asarray(deadlines.get("lateness", []), dtype=np.int64)
+    misses = int(np.count_nonzero(lateness > 0))
+    return {
+        "utilization": float(deadlines.get("utilization", 0.0)),
+        "admitted_utilization": float(deadlines.get("admittedUtilization", 0.0)),
+        "bound": float(deadlines.get("bound", 1.0)),
+        "schedulable": bool(deadlines.get("schedulable", False)),
+        "admission": bool(deadlines.get("admission", False)),
+        "rejected": int(deadlines.get("rejected", 0)),
+        "jobs": int(lateness.size),
+        "misses": misses,
+        "miss_ratio": misses / lateness.size if lateness.size else 0.0,
+        "lateness": {
+            "avg": float(lateness.mean()) if lateness.size else 0.0,
+            **percentiles(lateness),
+            "max": int(lateness.max()) if lateness.size else 0,
+        },
+        "tardiness": float(np.maximum(lateness, 0).mean()) if lateness.size else 0.0,
+    }
+
+
+def format_report(m):
+    """Text block used by the GUI report and the command line."""
+    lines = ["--- SCHEDULING METRICS ---"]
+    lines.append(f"{'Metric':<12}{'Avg':>9}" + "".join(f"{'P' + str(q):>9}" for q in PERCENTILES))
+    for label, key in (("Turnaround", "turnaround"), ("Waiting", "waiting"), ("Response", "response")):
+        stats = m[key]
+        lines.append(f"{label:<12}{stats['avg']:>9.2f}" + "".join(f"{stats['p' + str(q)]:>9.2f}" for q in PERCENTILES))
+
+    tp = m["throughput"]
+    lines.append("")
+    lines.append(f"Throughput: {tp['overall']:.3f} proc/s overall, peak {tp['peak']:.3f} proc/s ({tp['window']} s windows)")
+    lines.append("Completions per window: " + " ".join(str(c) for c in tp["completions"]))
+    lines.append(f"Jain's Fairness Index: {m['fairness']:.3f}")
+    lines.append(f"Starvation: {m['starvation']['processes']} process(es) starved, {m['starvation']['events']} episode(s)")
+    cs = m["context_switches"]
+    lines.append(f"Context switches: {cs['switches']} ({cs['preemptions']} preemptions), "
+                 f"overhead {cs['overhead_seconds']:.2f} s ({cs['overhead_share'] * 100:.1f}% of the run)")
+    if "deadlines" in m:
+        dl = m["deadlines"]
+        late = dl["lateness"]
+        lines.append(f"Deadline misses: {dl['misses']}/{dl['jobs']} jobs ({dl['miss_ratio'] * 100:.1f}%), mean tardiness {dl['tardiness']:.2f} s")
+        lines.append(f"Lateness (s): avg {late['avg']:.2f}" + "".join(f", p{q} {late['p' + str(q)]:.2f}" for q in PERCENTILES) + f", max {late['max']}")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduling metrics for a simulation's output.json")
+    parser.add_argument("results", nargs="?", default="output.json", help="output.json, or a results/ directory written with export=1")
+    parser.add_argument("--window", type=int, default=None, help="Throughput window width in simulated seconds")
+    parser.add_argument("--json", action="store_true", help="Print the metrics as JSON")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.results):
+        from result_columns import load_columns
+        columns = load_columns(args.results)
+        metrics = compute_metrics(columns.as_results(), window=args.window, columns=columns)
+    else:
+        metrics = compute_metrics(load_results(args.results), window=args.window)
+    print(json.dumps(metrics, indent=2) if args.json else format_report(metrics), end="\n" if args.json else "")
+
+
+if __name__ == "__main__":
+    main()
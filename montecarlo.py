@@ -0,0 +1,293 @@
+import argparse
+import functools
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from engine_lib import run_output
+from metrics import compute_metrics
+
+# ====================================================================
+# MONTE CARLO BATCH RUNS
+# Workloads are drawn from the seed, so one run's averages are a single
+# sample. A batch reruns one configuration (engine binary + arguments) over
+# consecutive seeds, several engines at a time, and summarizes every metric
+# with a mean, a Student-t confidence interval and its distribution. Seeds
+# are consumed in waves and the batch stops as soon as the target metric's
+# interval is narrower than the requested relative precision. Each run is
+# its own engine process, so the pool only needs threads to wait on them.
+# Given a shared library from engine_lib.py instead of a binary, runs stay
+# in process: no engine start and no output.json per seed.
+#
+#     python montecarlo.py ./semaphore_simulator RR 2 6 1 8 --runs 500 --precision 0.05
+#     python montecarlo.py ./semaphore_simulator RR 2 6 1 8 --algos RR,FCFS,SJF
+#     python montecarlo.py ./semaphore_simulator RR 2 12 1 8 --mode memory=paging --mode "memory=semaphore dispatch=scan"
+#     python montecarlo.py ./semaphore_simulator RR 2 12 1 8 dispatch=scan switch_ms=100 --mode quantum=1 --mode quantum=4
+# ====================================================================
+
+DEFAULT_MAX_RUNS = 500
+DEFAULT_MIN_RUNS = 30   # Below this the normal-theory interval is not trusted for stopping
+DEFAULT_PRECISION = 0.05 # Stop when the CI half-width is within 5% of the mean
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_TARGET = "waiting"
+RUN_TIMEOUT = 60        # Seconds per engine run
+HISTOGRAM_BINS = 10
+WAVE_SIZE = 16          # Seeds between stop-rule checks; fixed so the seed set does not depend on the machine
+T_BISECTIONS = 60       # Halvings of the bracket around a t quantile, down to float precision
+
+# Summary name -> path into compute_metrics() output
+BATCH_METRICS = {
+    "waiting": ("waiting", "avg"),
+    "waiting_p95": ("waiting", "p95"),
+    "turnaround": ("turnaround", "avg"),
+    "response": ("response", "avg"),
+    "throughput": ("throughput", "overall"),
+    "cpu_utilization": ("cpu_utilization",),
+    "fairness": ("fairness",),
+    "context_switches": ("context_switches", "switches"),
+    "switch_overhead": ("context_switches", "overhead_share"),
+    "deadline_miss_ratio": ("deadlines", "miss_ratio"),
+}
+
+
+def run_seed(cmd, seed, timeout=RUN_TIMEOUT):
+    """Runs the engine once with seed=N and no pacing; returns its metrics, or None if the run failed.
+
+    cmd[0] is an engine binary, or a library from engine_lib.build_library() (see engine_lib.run_output).
+    """
+    args = [arg for arg in cmd[1:] if not arg.startswith("seed=")]
+    data = run_output(cmd[0], args + [f"seed={seed}"], timeout=timeout)
+    return compute_metrics(data) if data else None
+
+
+def metric_values(m):
+    """Flattens one run's metrics into {summary name: float}, skipping metrics the run does not have."""
+    values = {}
+    for name, path in BATCH_METRICS.items():
+        node = m
+        for key in path:
+            node = node.get(key) if isinstance(node, dict) else None
+        if node is not None:
+            values[name] = float(node)
+    return values
+
+
+def t_within(t, df):
+    """P(|T| <= t) for Student's t with an integer df (closed form, Abramowitz & Stegun 26.7.3-4)."""
+    theta = math.atan(t / math.sqrt(df))
+    c2 = math.cos(theta) ** 2
+    term = total = 1.0
+    if df % 2:
+        for k in range(1, (df - 1) // 2):
+            term *= 2 * k / (2 * k + 1) * c2
+            total += term
+        return 2 / math.pi * (theta + (math.sin(theta) * math.cos(theta) * total if df > 1 else 0.0))
+    for k in range(1, df // 2):
+        term *= (2 * k - 1) / (2 * k) * c2
+        total += term
+    return math.sin(theta) * total
+
+
+@functools.lru_cache(maxsize=None)
+def t_critical(confidence, df):
+    """Two-sided Student-t quantile: the t with P(|T| <= t) = confidence, found by bisection."""
+    if df <= 0:
+        return float("inf")
+    low, high = 0.0, 1.0
+    while t_within(high, df) < confidence:
+        low, high = high, high * 2
+    for _ in range(T_BISECTIONS):
+        mid = (low + high) / 2
+        if t_within(mid, df) < confidence:
+            low = mid
+        else:
+            high = mid
+    return high
+
+
+def summarize(values, confidence=DEFAULT_CONFIDENCE):
+    """Mean, confidence interval and distribution of one metric over the batch."""
+    x = np.asarray(values, dtype=np.float64)
+    n = x.size
+    mean = float(x.mean())
+    std = float(x.std(ddof=1)) if n > 1 else 0.0
+    half = t_critical(confidence, n - 1) * std / np.sqrt(n) if n > 1 else float("inf")
+    counts, edges = np.histogram(x, bins=HISTOGRAM_BINS)
+    p5, p50, p95 = np.percentile(x, (5, 50, 95))
+    return {
+        "n": int(n),
+        "mean": mean,
+        "std": std,
+        "half_width": float(half),
+        "ci_low": mean - half,
+        "ci_high": mean + half,
+        "min": float(x.min()),
+        "p5": float(p5),
+        "p50": float(p50),
+        "p95": float(p95),
+        "max": float(x.max()),
+        "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+    }
+
+
+def precise_enough(values, precision, confidence):
+    if len(values) < 2:
+        return False
+    s = summarize(values, confidence)
+    return s["half_width"] <= precision * abs(s["mean"])
+
+
+def run_batch(cmd, base_seed=1, max_runs=DEFAULT_MAX_RUNS, min_runs=DEFAULT_MIN_RUNS, precision=DEFAULT_PRECISION,
+              target=DEFAULT_TARGET, confidence=DEFAULT_CONFIDENCE, workers=None, progress=None, wave_size=WAVE_SIZE):
+    """Runs cmd over seeds base_seed, base_seed + 1, ... until the target metric is precise enough or max_runs.
+
+    cmd is the engine command line (binary first); any seed=/realtime= options in it are replaced.
+    Seeds are taken in waves of wave_size, run on 'workers' threads, and the stop rule only looks
+    at whole waves, so the same arguments use the same seeds on any machine and with any number
+    of workers. progress(done, failed) is called after each wave.
+    """
+    workers = workers or os.cpu_count() or 1
+    per_seed = {}                # seed -> metric values (failed runs are absent)
+    failed = 0
+    next_seed = base_seed
+    reached = False
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while next_seed - base_seed < max_runs:
+            wave = range(next_seed, min(next_seed + wave_size, base_seed + max_runs))
+            for seed, m in zip(wave, pool.map(lambda s: run_seed(cmd, s), wave)):
+                if m is None:
+                    failed += 1
+                else:
+                    per_seed[seed] = metric_values(m)
+            next_seed = wave.stop
+            if progress:
+                progress(len(per_seed), failed)
+            target_values = [v[target] for v in per_seed.values() if target in v]
+            if len(target_values) >= min_runs and precise_enough(target_values, precision, confidence):
+                reached = True
+                break
+
+    names = [name for name in BATCH_METRICS if any(name in v for v in per_seed.values())]
+    return {
+        "command": list(cmd[1:]),
+        "seeds": [base_seed, next_seed - 1],
+        "runs": len(per_seed),
+        "failed": failed,
+        "confidence": confidence,
+        "target": {"metric": target, "precision": precision, "reached": reached},
+        "metrics": {name: summarize([v[name] for v in per_seed.values() if name in v], confidence) for name in names},
+        "per_seed": per_seed,
+    }
+
+
+def variant_command(cmd, variant):
+    """cmd changed by a variant: an algorithm name and/or space-separated KEY=VALUE options.
+
+    "MLFQ" swaps the algorithm; "memory=semaphore dispatch=scan" replaces (or adds) those options.
+    """
+    cmd = list(cmd)
+    for token in variant.split():
+        if "=" not in token:
+            cmd[1] = token
+            continue
+        key = token.split("=", 1)[0] + "="
+        cmd = [a for i, a in enumerate(cmd) if i < 2 or not a.startswith(key)] + [token]
+    return cmd
+
+
+def compare_batches(cmd, variants, confidence=DEFAULT_CONFIDENCE, **kwargs):
+    """Batches of the same configuration under each variant (see variant_command), on the same
+    seeds (common random numbers): algorithms, memory modules or any other engine mode.
+
+    Besides each batch, returns the paired difference of the target metric against the first
+    variant: pairing by seed removes the workload-to-workload variance from the comparison.
+    """
+    batches = {v: run_batch(variant_command(cmd, v), confidence=confidence, **kwargs) for v in variants}
+    base = batches[variants[0]]
+    target = base["target"]["metric"]
+    diffs = {}
+    for variant in variants[1:]:
+        other = batches[variant]["per_seed"]
+        paired = [other[s][target] - v[target] for s, v in base["per_seed"].items()
+                  if s in other and target in v and target in other[s]]
+        if len(paired) > 1:
+            diffs[variant] = summarize(paired, confidence)
+    return {"baseline": variants[0], "metric": target, "batches": batches, "differences": diffs}
+
+
+def format_batch(b):
+    """Text block used by the GUI report and the command line."""
+    target = b["target"]
+    level = int(round(b["confidence"] * 100))
+    lines = [f"--- MONTE CARLO BATCH ({b['runs']} runs, seeds {b['seeds'][0]}-{b['seeds'][1]}, {b['failed']} failed) ---"]
+    status = "reached" if target["reached"] else "not reached"
+    lines.append(f"Stop rule: {target['metric']} within ±{target['precision'] * 100:.1f}% at {level}% confidence ({status})")
+    lines.append(f"{'Metric':<20}{'Mean':>9}{f'{level}% CI':>20}{'Std':>9}{'P5':>9}{'P50':>9}{'P95':>9}")
+    for name, s in b["metrics"].items():
+        ci = f"[{s['ci_low']:.3f}, {s['ci_high']:.3f}]"
+        lines.append(f"{name:<20}{s['mean']:>9.3f}{ci:>20}{s['std']:>9.3f}{s['p5']:>9.3f}{s['p50']:>9.3f}{s['p95']:>9.3f}")
+    if target["metric"] in b["metrics"]:
+        hist = b["metrics"][target["metric"]]["histogram"]
+        lines.append(f"{target['metric']} distribution ({hist['edges'][0]:.2f} .. {hist['edges'][-1]:.2f}): "
+                     + " ".join(str(c) for c in hist["counts"]))
+    return "\n".join(lines) + "\n"
+
+
+def format_comparison(c):
+    level = int(round(next(iter(c["batches"].values()))["confidence"] * 100))
+    width = max(8, max(len(v) for v in c["batches"]) + 2)
+    lines = [f"--- POLICY COMPARISON ({c['metric']}, paired by seed against {c['baseline']}) ---"]
+    lines.append(f"{'Policy':<{width}}{'Runs':>6}{'Mean':>9}{f'{level}% CI':>20}{'Diff':>9}{f'Diff {level}% CI':>22}{'':>4}")
+    for algo, b in c["batches"].items():
+        s = b["metrics"].get(c["metric"])
+        if s is None:
+            continue
+        ci = f"[{s['ci_low']:.3f}, {s['ci_high']:.3f}]"
+        line = f"{algo:<{width}}{b['runs']:>6}{s['mean']:>9.3f}{ci:>20}"
+        d = c["differences"].get(algo)
+        if d:
+            # An interval that excludes 0 means the policies really differ on this metric
+            significant = "*" if d["ci_low"] > 0 or d["ci_high"] < 0 else ""
+            diff_ci = f"[{d['ci_low']:+.3f}, {d['ci_high']:+.3f}]"
+            line += f"{d['mean']:>+9.3f}{diff_ci:>22}{significant:>4}"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one simulator configuration over many seeds and report confidence intervals")
+    parser.add_argument("engine", nargs="+", help="Engine binary (or shared library) followed by its arguments and KEY=VALUE options")
+    parser.add_argument("--runs", type=int, default=DEFAULT_MAX_RUNS, help="Maximum number of seeds")
+    parser.add_argument("--min-runs", type=int, default=DEFAULT_MIN_RUNS)
+    parser.add_argument("--precision", type=float, default=DEFAULT_PRECISION, help="Target relative CI half-width")
+    parser.add_argument("--metric", default=DEFAULT_TARGET, choices=sorted(BATCH_METRICS), help="Metric the stop rule watches")
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE)
+    parser.add_argument("--seed", type=int, default=1, help="First seed")
+    parser.add_argument("--workers", type=int, default=None, help="Engine runs in parallel (default: CPU count)")
+    parser.add_argument("--algos", default=None, help="Comma-separated algorithms to compare on the same seeds")
+    parser.add_argument("--mode", action="append", default=[],
+                        help="A variant to compare on the same seeds: algorithm and/or KEY=VALUE options in one "
+                             "quoted string (repeatable; runs after the --algos variants)")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_intermixed_args()
+    engine = args.engine
+    if len(engine) < 2:
+        parser.error("expected the engine binary followed by its arguments")
+
+    kwargs = dict(base_seed=args.seed, max_runs=args.runs, min_runs=args.min_runs, precision=args.precision,
+                  target=args.metric, confidence=args.confidence, workers=args.workers)
+    variants = (args.algos.split(",") if args.algos else []) + args.mode
+    if variants:
+        result = compare_batches(engine, variants, **kwargs)
+        text = "".join(format_batch(b) for b in result["batches"].values()) + format_comparison(result)
+    else:
+        result = run_batch(engine, **kwargs)
+        text = format_batch(result)
+    print(json.dumps(result, indent=2) if args.json else text, end="\n" if args.json else "")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import csv
+import json
+import os
+
+import numpy as np
+
+# ====================================================================
+# COLUMNAR RESULTS LOADER
+# Reads the results/ directory an engine writes with export=1: one .npy
+# file per per-process column, timeline.npy and meta.json. The arrays are
+# memory-mapped, so opening a report costs the same for 10 processes or
+# 100k and only the columns actually touched are paged in. Works on a run
+# that is still going (finished rows are filled in, the rest read 0).
+#
+#     python result_columns.py results --npz run.npz
+# ====================================================================
+
+DEFAULT_DIR = "results"
+
+
+class ResultColumns:
+    """Per-process result columns of one run, keyed by output.json field name."""
+
+    def __init__(self, path=DEFAULT_DIR, mmap=True):
+        self.path = path
+        mode = "r" if mmap else None
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {} # Run not finished yet
+        names = self.meta.get("columns") or sorted(
+            name[:-4] for name in os.listdir(path) if name.endswith(".npy") and name != "timeline.npy")
+        self.columns = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mode) for name in names}
+        self.timeline = np.load(os.path.join(path, "timeline.npy"), mmap_mode=mode)
+
+    @classmethod
+    def from_arrays(cls, columns, meta, timeline):
+        """Columns already in memory (e.g. engine_lib.Engine.results()), no results/ directory."""
+        self = cls.__new__(cls)
+        self.path = None
+        self.meta = dict(meta)
+        self.columns = dict(columns)
+        self.timeline = np.asarray(timeline)
+        return self
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def as_results(self):
+        """output.json-shaped run-level fields (no per-process list) for compute_metrics(..., columns=...)."""
+        return {key: self.meta[key] for key in ("numProcesses", "totalTime", "totalBurstTime", "algorithm", "seed") if key in self.meta}
+
+    def to_npz(self, out_path):
+        """Packs every column and the timeline into one (uncompressed) .npz archive."""
+        np.savez(out_path, timeline=self.timeline, **self.columns)
+
+
+def load_columns(path=DEFAULT_DIR, mmap=True):
+    return ResultColumns(path, mmap=mmap)
+
+
+def read_csv(path=os.path.join(DEFAULT_DIR, "results.csv")):
+    """The streamed CSV as a list of dicts (completion order), for tools that do not use NumPy."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or pack the columnar results of a simulation run")
+    parser.add_argument("path", nargs="?", default=DEFAULT_DIR)
+    parser.add_argument("--npz", default=None, help="Write all columns and the timeline to this .npz file")
+    args = parser.parse_args()
+
+    cols = load_columns(args.path)
+    print(f"{len(cols)} processes, {cols.timeline.size} timeline slices, columns: {', '.join(cols.columns)}")
+    if args.npz:
+        cols.to_npz(args.npz)
+        print(f"Wrote {args.npz}")
+
+
+if __name__ == "__main__":
+    main()
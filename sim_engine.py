@@ -0,0 +1,3689 @@
+# ====================================================================
+# EMBEDDED C CODE (one engine, pluggable scheduler and memory modules)
+# Shared by main.py and phase3.py, which are presets of the same engine.
+# ====================================================================
+
+C_SOURCE_CODE = r"""
+#include <stdio.h>
+#include <stdlib.h>
+#include <windows.h>
+#include <time.h>
+#include <string.h>
+#include <stdarg.h>
+#ifdef SIM_ZLIB
+#include <zlib.h>
+#endif
+
+// Dynamic Settings (initialized from command-line arguments)
+int NUM_PROCESSES = 5; 
+int TOTAL_FRAMES = 5;       // Now represents total memory frames
+int PAGE_SIZE = 1;          // Memory units per frame (process sizes are drawn in units)
+int QUANTUM_SECONDS = 2;   
+
+// CONSTANTS
+#define MAX_BURST_TIME 5
+#define MIN_BURST_TIME 3
+#define MAX_MEM_REQ 4      // Max frames needed by process
+#define MIN_MEM_REQ 1
+#define MAX_PRIORITY 5     // Lower number is higher priority (1-5)
+#define MIN_PRIORITY 1
+#define STARVATION_THRESHOLD 10
+#define MAX_TIMELINE_SIZE 1000 
+#define MAX_PAGES 50       // Safety limit for page/frame table
+#define WAIT_HIST_BUCKETS 8 // log2 buckets (s): [0,1) [1,2) [2,4) ... [64,inf)
+#define MAX_MLFQ_LEVELS 8  // One bit per level in the MLFQ bitmap
+
+#define WAITING 0
+#define RUNNING 1
+#define FINISHED 2
+
+// Process structure
+typedef struct {
+    int id;
+    int priority;         // 1 (Highest) to MAX_PRIORITY (Lowest)
+    int burst_time;       // Total time needed
+    int remaining_time;   // Time left
+    int mem_needed;       // Current frames requested
+    int max_mem;          // Max frames process will EVER need (Banker's)
+    int mem_allocated;    // Current frames allocated
+    int page_table[MAX_PAGES]; // Stores frame IDs for this process
+    int page_table_count; 
+    int mem_units;        // Actual footprint in memory units (<= mem_needed * PAGE_SIZE)
+    int block_slot;       // Buddy block start (BUDDY_MIN slots), -1 when none is held
+    long frag_failed_at;  // Partitions moved when placement last failed on fragmentation, -1 if not waiting
+    // Demand paging (page_table is indexed by virtual page: frame ID, 0 = not resident)
+    int vpages;           // Pages in the address space
+    unsigned int ref_state; // Reference-string generator state
+    int locality;         // First page of the current locality
+    int last_ref[MAX_PAGES]; // Process reference count at each page's last use
+    long refs, faults;
+    long ws_sum;          // Working-set size summed over slices (average = ws_sum / ws_samples)
+    int ws_samples, ws_last, ws_max;
+    int suspended;        // Swapped out by load control while memory is overcommitted
+    int suspensions;
+    long tlb_hits, tlb_misses;
+    int state;
+    int arrival_time;
+    int start_time;
+    int completion_time;
+    int waiting_time;     // Summed over its jobs (see complete_job)
+    int turnaround_time;
+    int idle_cycles;
+    int starvation_events; // Times the process entered STARVATION DANGER
+    int frames_wait;      // Denied frames; the priority scan skips it until frames are released
+    int dl_preempts;      // Times chosen as a deadlock victim (counted in the victim cost)
+    char status[50];
+    // CFS accounting
+    int weight;           // Load weight derived from priority
+    long long vruntime;   // Weighted run time (ms scaled to NICE_0_WEIGHT)
+    // Run-queue policies
+    int level;            // MLFQ queue level (0 = highest)
+    double tau;           // Predicted next CPU burst (SJF/SRTF with sjf_alpha)
+    // Deadlines / periodic jobs
+    int release_time;     // Release of the current job (arrival_time for the first)
+    int rel_deadline;     // Relative deadline, also the period (0 = none)
+    int abs_deadline;     // Deadline of the current job
+    int jobs_total;
+    int jobs_done;
+    int deadline_misses;
+    int admitted;         // 0 = rejected by EDF admission control
+    // Context switches (see CONTEXT SWITCHES)
+    int switches;         // Times switched onto the CPU
+    int preemptions;      // Times switched off the CPU with work left
+    long switch_ms;       // Switch and cache refill cost of its switches
+    long last_switch;     // switch_seq when it last got the CPU, -1 before its first dispatch
+    // Contention instrumentation
+    int wait_since;       // Time the process last became ready to run
+    int wait_hist[WAIT_HIST_BUCKETS]; // Ready -> dispatched wait times
+    int blocked_cpu;      // Last try-acquire of cpu_semaphore failed
+    int blocked_mutex;    // Last try-lock of mem_mutex found it owned
+    int blocked_frames;   // Last frame request was denied (Banker/No Frames)
+    int mem_held_since;   // Simulated time frames were granted
+    LONGLONG mem_held_us; // Wall-clock time frames were granted
+} ProcessInfo;
+
+// Per-semaphore contention counters (exported in every snapshot)
+typedef struct {
+    const char *name;
+    long attempts;        // Try-acquire calls made on behalf of a process
+    long failures;        // Try-acquires that returned without the resource
+    long acquired;        // Units handed out
+    long releases;        // Completed holds (hold_total is summed over these)
+    long hold_total;      // Simulated seconds held, summed over releases
+    int hold_max;         // Longest single hold (simulated seconds)
+    LONGLONG hold_us;     // Wall-clock microseconds held, summed over releases
+    int waiting;          // Processes whose last attempt failed (queue length)
+} SemStats;
+
+ProcessInfo *processes; 
+int current_time = 0;
+int time_total_burst = 0; 
+int timeline[MAX_TIMELINE_SIZE];
+int timeCount = 0;
+int memory_frames[MAX_PAGES]; // 0: Free, >0: PID occupying the frame
+
+// Dynamic Settings
+char ALGORITHM[10]; 
+
+// Scheduler module (from ALGORITHM; dispatch=scan picks the table scan for RR/FCFS)
+#define POLICY_PRIORITY 0   // RR / FCFS: highest (aged) priority first, ties by arrival
+#define POLICY_SCAN 1       // RR / FCFS: every pass scans all processes in table order, priorities unused
+#define POLICY_CFS 2        // Leftmost vruntime (see CFS RUN QUEUE)
+#define POLICY_MLFQ 3       // This and the policies below are run-queue driven (see RUN QUEUES)
+#define POLICY_SJF 4        // Min-heap on remaining (or predicted) burst, runs to completion
+#define POLICY_SRTF 5       // Same heap, preempted whenever a new process arrives
+#define POLICY_EDF 6        // Same heap keyed on absolute deadline, with admission control
+int POLICY = POLICY_PRIORITY;
+int SCAN_DISPATCH = 0;      // dispatch=scan
+
+// Workload settings (optional KEY=VALUE arguments)
+int ARRIVAL_GAP = 0;        // Max seconds between consecutive arrivals (0 = all arrive at t=0)
+
+// SJF/SRTF burst prediction: tau = alpha * observed + (1 - alpha) * tau
+double SJF_ALPHA = 0;       // 0 = key on the true remaining time
+double SJF_TAU0 = 4;        // Initial prediction (s)
+
+// Deadlines and periodic tasks (implicit deadlines: period = relative deadline)
+int DEADLINE_SLACK = 0;     // Relative deadline = burst + rand() % (slack + 1); 0 = no deadlines
+int RT_JOBS = 1;            // Jobs released per process, one period apart
+int RT_ADMIT = 1;           // EDF admission control on/off
+double RT_BOUND = 1.0;      // Utilization bound for admission (EDF is exact at 1.0)
+
+// MLFQ settings (optional KEY=VALUE arguments)
+int MLFQ_LEVELS = 3;
+int MLFQ_QUANTA[MAX_MLFQ_LEVELS];  // Per-level quantum; defaults to QUANTUM_SECONDS * 2^level
+int MLFQ_BOOST_PERIOD = 20;        // Simulated seconds between priority boosts (0 = never)
+
+// Context-switch cost (optional KEY=VALUE arguments, see CONTEXT SWITCHES)
+int SWITCH_MS = 0;          // Saving and restoring state plus the scheduler's own run, per switch
+int CACHE_MS = 0;           // Refilling a completely cold cache
+int CACHE_PROCS = 2;        // Slices of other processes that leave a process's cache completely cold
+
+// Priority aging (optional KEY=VALUE arguments)
+#define AGING_NONE 0
+#define AGING_LINEAR 1      // One level per AGING_INTERVAL waited
+#define AGING_EXP 2         // Boost doubles every AGING_INTERVAL waited
+#define AGING_CAPPED 3      // Linear, but never more than AGING_CAP levels
+int AGING = AGING_NONE;
+int AGING_INTERVAL = 5;     // Simulated seconds of waiting per aging step
+int AGING_CAP = 2;
+long aged_dispatches = 0;   // Dispatches won only because of aging
+
+// Memory model (optional KEY=VALUE arguments)
+#define MEM_PAGING 0        // First-fit over single frames
+#define MEM_BUDDY 1         // Contiguous power-of-two blocks (buddy system)
+#define MEM_CONTIGUOUS 2    // mem_needed adjacent frames (variable partitions)
+#define MEM_DEMAND 3        // Pages faulted in on reference, evicted by REPLACEMENT
+#define MEM_SEMAPHORE 4     // Counting semaphore of TOTAL_FRAMES units, taken all or nothing
+int MEMORY_MODEL = MEM_PAGING;
+int BUDDY_MIN = 1;          // Smallest buddy block in memory units
+#define FIT_BEST 0          // Smallest hole that fits
+#define FIT_WORST 1         // Largest hole
+#define FIT_NEXT 2          // First fit, resuming after the last placement
+int FIT_POLICY = FIT_BEST;
+int COMPACTION = 0;         // 1 = relocate partitions online to merge holes (memory=contiguous)
+int COMPACT_THRESHOLD = 30; // External fragmentation (%) that starts a compaction run
+int COMPACT_STEP = 2;       // Frames relocated per step (at least one whole partition)
+int COPY_MS = 100;          // Modeled cost of copying one frame
+#define REPL_FIFO 0
+#define REPL_LRU 1
+#define REPL_CLOCK 2
+#define REPL_ARC 3          // Adaptive Replacement Cache (recency + frequency lists)
+int REPLACEMENT = REPL_LRU;
+int VPAGES = 8;             // Largest virtual address space, in pages
+int REFS_PER_SEC = 20;      // Page references per simulated second of CPU
+int FAULT_MS = 50;          // Service time of one page fault
+int WS_WINDOW = 20;         // Working-set window, in references
+
+// TLB in front of page_table lookups (translations are issued under memory=demand)
+#define MAX_TLB 256
+#define TLB_LRU 0
+#define TLB_FIFO 1
+#define TLB_RANDOM 2
+int TLB_ENTRIES = 0;        // 0 = no TLB
+int TLB_WAYS = 4;           // Entries per set (TLB_ENTRIES = fully associative)
+int TLB_REPL = TLB_LRU;
+int TLB_ASID = 0;           // 1 = entries tagged by process; 0 = flush on every context switch
+int TLB_NS = 1;             // TLB lookup time
+int MEM_NS = 100;           // One memory access; a TLB miss adds a page-table access
+
+// Deadlock handling (optional KEY=VALUE arguments)
+#define DL_AVOID 0          // Banker's safety check on every request
+#define DL_DETECT 1         // Grant what is free, detect deadlocks and preempt a victim's frames
+int DEADLOCK_MODE = DL_AVOID;
+int DETECT_INTERVAL = 5;    // Simulated seconds between detection passes while some process can run
+int SAFETY_CACHE = 1;       // Memoize Banker's verdicts per allocation state (safety_cache=0 re-runs every check)
+
+unsigned int SEED = 0;      // 0 = seed from the clock
+int REALTIME = 1;           // 0 skips the Sleep() pacing (headless baseline runs)
+
+// Snapshot sampling (snapshots=...): which snapshots reach events.log, the ring and the library callback
+#define SNAP_ALL 0          // Every one, including the unchanged states of busy-wait retries
+#define SNAP_CHANGE 1       // Only when the state differs from the last snapshot logged
+#define SNAP_TICKS 2        // At most one changed state per snapshot_every simulated seconds
+#define SNAP_EVENTS 3       // Only dispatches and slice ends (preemptions and completions)
+int SNAPSHOT_POLICY = SNAP_CHANGE;
+int SNAPSHOT_EVERY = 1;
+int LOG_COMPRESS = 0;       // log_compress=zlib: block-compressed events.log (needs a -DSIM_ZLIB -lz build)
+int LOG_BLOCK_KB = 64;      // Plain JSON per compressed block
+
+// Synchronization Objects 
+HANDLE cpu_semaphore; 
+HANDLE mem_mutex; // Using a Mutex for memory array access and safety check
+HANDLE mem_semaphore = NULL; // memory=semaphore only
+
+SemStats cpu_stats = {"cpu"};
+SemStats mutex_stats = {"mem_mutex"};
+SemStats frame_stats = {"frames"}; // Banker-checked frame grants
+int cpu_held_since = 0;
+LONGLONG cpu_held_us = 0;
+LONGLONG mutex_held_us = 0;
+
+// ====================================================================
+// CONTENTION INSTRUMENTATION
+// ====================================================================
+
+LONGLONG now_us() {
+    LARGE_INTEGER freq, count;
+    QueryPerformanceFrequency(&freq);
+    QueryPerformanceCounter(&count);
+    return (count.QuadPart / freq.QuadPart) * 1000000 + (count.QuadPart % freq.QuadPart) * 1000000 / freq.QuadPart;
+}
+
+LONGLONG now_ns() {
+    LARGE_INTEGER freq, count;
+    QueryPerformanceFrequency(&freq);
+    QueryPerformanceCounter(&count);
+    return (count.QuadPart / freq.QuadPart) * 1000000000 + (count.QuadPart % freq.QuadPart) * 1000000000 / freq.QuadPart;
+}
+
+// Records one try-acquire and keeps the semaphore's queue length in sync
+void note_attempt(SemStats *s, int *blocked, int ok) {
+    s->attempts++;
+    if (ok) {
+        if (*blocked) { *blocked = 0; s->waiting--; }
+    } else {
+        s->failures++;
+        if (!*blocked) { *blocked = 1; s->waiting++; }
+    }
+}
+
+void note_release(SemStats *s, int held_since, LONGLONG held_us) {
+    int hold = current_time - held_since;
+    s->releases++;
+    s->hold_total += hold;
+    if (hold > s->hold_max) s->hold_max = hold;
+    s->hold_us += now_us() - held_us;
+}
+
+void record_wait(int pid, int waited) {
+    int b = 0;
+    while (b < WAIT_HIST_BUCKETS - 1 && waited >= (1 << b)) b++;
+    processes[pid].wait_hist[b]++;
+}
+
+void logSemStats(FILE *f, SemStats *s) {
+    fprintf(f, "\"%s\":{\"attempts\":%ld,\"failures\":%ld,\"acquired\":%ld,\"releases\":%ld,\"hold_total\":%ld,\"hold_max\":%d,\"hold_us\":%lld,\"waiting\":%d}",
+        s->name, s->attempts, s->failures, s->acquired, s->releases, s->hold_total, s->hold_max, (long long)s->hold_us, s->waiting);
+}
+
+void logWaitHist(FILE *f, int pid) {
+    fprintf(f, "[");
+    for (int b = 0; b < WAIT_HIST_BUCKETS; b++) {
+        fprintf(f, "%d", processes[pid].wait_hist[b]);
+        if (b < WAIT_HIST_BUCKETS - 1) fprintf(f, ",");
+    }
+    fprintf(f, "]");
+}
+
+// ====================================================================
+// SHARED-MEMORY SNAPSHOT RING (live monitor, see snapshot_ring.py)
+// ====================================================================
+
+#define RING_NAME "Local\\SemaphoreSimRing"
+#define RING_MAGIC 0x474E5253      // "SRNG"
+#define RING_VERSION 1
+#define RING_SLOTS 64
+#define RING_SLOT_BYTES 8192
+#define RING_HEADER_BYTES 1024
+#define RING_SCALARS 8             // time, cpu_busy, mem_max (frames), mem_available, timeline_len, 3 reserved
+#define SYNC_FIELDS 7              // attempts, failures, acquired, releases, hold_total, hold_max, waiting
+#define STR_(x) #x
+#define STR(x) STR_(x)
+#define PROC_FIELDS (8 + WAIT_HIST_BUCKETS)
+#define PROC_FIELD_NAMES "id,prio,burst,remaining,mem_needed,max_mem,mem_allocated,status,wait_hist:" STR(WAIT_HIST_BUCKETS)
+#define SYNC_NAMES "cpu,mem_mutex,frames"
+#define SYNC_COUNT 3
+
+typedef struct {
+    unsigned int magic;            // Written last, so a reader never sees a half-built header
+    unsigned int version;
+    unsigned int slot_count;
+    unsigned int slot_bytes;
+    unsigned int num_processes;
+    unsigned int proc_fields;
+    unsigned int sync_count;
+    unsigned int timeline_cap;
+    volatile long long write_seq;  // Sequence number of the newest complete slot (1-based)
+    volatile int finished;         // Set once the scheduler has returned
+    int reserved[5];
+    char proc_field_names[256];    // Comma-separated; "name:N" marks an N-wide array
+    char sync_names[256];          // Comma-separated, in slot order
+    char status_names[448];        // '|'-separated; process "status" holds an index into this list
+} RingHeader;
+
+const char *STATUS_NAMES[] = {"Waiting (CPU)", "Waiting (Memory/Banker)", "Waiting (Banker Denied)", "Waiting (No Free Frames)",
+                              "Waiting (No Free Block)", "Waiting (Page Fault)", "Suspended (Thrashing)", "Preempted (Deadlock)", "Critical Section", "Running", "Completed", "STARVATION DANGER",
+                              "Waiting (Memory)", "Rejected"};
+#define STATUS_COUNT (int)(sizeof(STATUS_NAMES) / sizeof(STATUS_NAMES[0]))
+
+HANDLE ring_handle = NULL;
+unsigned char *ring = NULL;
+long long ring_seq = 0;
+
+int status_code(const char *status) {
+    for (int k = 0; k < STATUS_COUNT; k++) {
+        if (strcmp(status, STATUS_NAMES[k]) == 0) return k;
+    }
+    return -1;
+}
+
+// Words in one snapshot slot (after its sequence number)
+int slot_words() {
+    return RING_SCALARS + SYNC_COUNT * SYNC_FIELDS + NUM_PROCESSES * PROC_FIELDS + MAX_TIMELINE_SIZE;
+}
+
+void fill_ring_header(RingHeader *h);
+
+void ringOpen() {
+    int slot_needed = 8 + slot_words() * (int)sizeof(int);
+    if (slot_needed > RING_SLOT_BYTES) return; // Live monitor unavailable; events.log still works
+
+    ring_handle = CreateFileMappingA(INVALID_HANDLE_VALUE, NULL, PAGE_READWRITE, 0, RING_HEADER_BYTES + RING_SLOTS * RING_SLOT_BYTES, RING_NAME);
+    if (ring_handle == NULL) return;
+    ring = (unsigned char *)MapViewOfFile(ring_handle, FILE_MAP_ALL_ACCESS, 0, 0, 0);
+    if (ring == NULL) {
+        CloseHandle(ring_handle);
+        ring_handle = NULL;
+        return;
+    }
+
+    RingHeader *h = (RingHeader *)ring;
+    h->magic = 0;
+    MemoryBarrier();
+    fill_ring_header(h);
+    MemoryBarrier();
+    h->magic = RING_MAGIC;
+}
+
+// Everything but the magic; sim_header() hands the same layout to in-process readers
+void fill_ring_header(RingHeader *h) {
+    memset(h, 0, RING_HEADER_BYTES);
+    h->version = RING_VERSION;
+    h->slot_count = RING_SLOTS;
+    h->slot_bytes = RING_SLOT_BYTES;
+    h->num_processes = NUM_PROCESSES;
+    h->proc_fields = PROC_FIELDS;
+    h->sync_count = SYNC_COUNT;
+    h->timeline_cap = MAX_TIMELINE_SIZE;
+    strcpy(h->proc_field_names, PROC_FIELD_NAMES);
+    strcpy(h->sync_names, SYNC_NAMES);
+    for (int k = 0; k < STATUS_COUNT; k++) {
+        if (k > 0) strcat(h->status_names, "|");
+        strcat(h->status_names, STATUS_NAMES[k]);
+    }
+}
+
+int ringPutSync(int *w, int n, SemStats *s) {
+    w[n++] = (int)s->attempts;
+    w[n++] = (int)s->failures;
+    w[n++] = (int)s->acquired;
+    w[n++] = (int)s->releases;
+    w[n++] = (int)s->hold_total;
+    w[n++] = s->hold_max;
+    w[n++] = s->waiting;
+    return n;
+}
+
+int fill_slot(int *w, int cpu_busy, int available_frames);
+
+// Overwrites the oldest slot and never waits on readers: a slow reader just skips stale frames
+void ringPublish(int cpu_busy, int available_frames) {
+    if (!ring) return;
+    ring_seq++;
+    unsigned char *slot = ring + RING_HEADER_BYTES + ((ring_seq - 1) % RING_SLOTS) * RING_SLOT_BYTES;
+    volatile long long *slot_seq = (volatile long long *)slot;
+    int *w = (int *)(slot + 8);
+
+    *slot_seq = 0; // Readers treat a sequence mismatch as "being rewritten"
+    MemoryBarrier();
+    fill_slot(w, cpu_busy, available_frames);
+    MemoryBarrier();
+    *slot_seq = ring_seq;
+    ((RingHeader *)ring)->write_seq = ring_seq;
+}
+
+// One snapshot as slot words; returns how many were written
+int fill_slot(int *w, int cpu_busy, int available_frames) {
+    w[0] = current_time;
+    w[1] = cpu_busy;
+    w[2] = TOTAL_FRAMES;
+    w[3] = available_frames;
+    w[4] = timeCount;
+    int n = RING_SCALARS;
+    n = ringPutSync(w, n, &cpu_stats);
+    n = ringPutSync(w, n, &mutex_stats);
+    n = ringPutSync(w, n, &frame_stats);
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        w[n++] = processes[i].id;
+        w[n++] = processes[i].priority;
+        w[n++] = processes[i].burst_time;
+        w[n++] = processes[i].remaining_time;
+        w[n++] = processes[i].mem_needed;
+        w[n++] = processes[i].max_mem;
+        w[n++] = processes[i].mem_allocated;
+        w[n++] = status_code(processes[i].status);
+        for (int b = 0; b < WAIT_HIST_BUCKETS; b++) w[n++] = processes[i].wait_hist[b];
+    }
+    memcpy(w + n, timeline, timeCount * sizeof(int));
+    return n + timeCount;
+}
+
+void ringClose() {
+    if (!ring) return;
+    ((RingHeader *)ring)->finished = 1;
+    UnmapViewOfFile(ring);
+    CloseHandle(ring_handle);
+    ring = NULL;
+}
+
+// ====================================================================
+// BANKER'S ALGORITHM (Safety Check)
+// ====================================================================
+
+// Checks if allocating 'request' frames to 'pid' is safe
+int check_safety(int pid, int request) {
+    int i, j;
+    int available[MAX_PAGES];
+    int work[MAX_PAGES];
+    int finish[MAX_PAGES];
+    int allocation[MAX_PAGES];
+    int need[MAX_PAGES];
+    int num_proc = NUM_PROCESSES;
+    int num_res = 1; // Only memory frames are considered
+
+    // 1. Calculate current available frames
+    int free_frames = 0;
+    if (MEMORY_MODEL == MEM_BUDDY) {
+        // Claims stay in frames; whether a contiguous block exists is the buddy allocator's call
+        free_frames = TOTAL_FRAMES;
+        for (i = 0; i < num_proc; i++) free_frames -= processes[i].mem_allocated;
+    } else for(i=0; i < TOTAL_FRAMES; i++) {
+        if (memory_frames[i] == 0) {
+            free_frames++;
+        }
+    }
+    available[0] = free_frames - request; // Tentative available after allocation
+
+    // 2. Initialize Work and Finish
+    work[0] = available[0];
+    for (i = 0; i < num_proc; i++) {
+        finish[i] = 0;
+    }
+
+    // 3. Initialize Allocation and Need (tentative state)
+    for (i = 0; i < num_proc; i++) {
+        // Tentative Allocation: current + request (for the requesting process)
+        allocation[i] = processes[i].mem_allocated;
+        if (processes[i].id == pid) {
+            allocation[i] += request;
+        }
+        
+        // Need
+        need[i] = processes[i].max_mem - allocation[i];
+    }
+    
+    // Safety check loop
+    int safe_count = 0;
+    int found;
+    do {
+        found = 0;
+        for (i = 0; i < num_proc; i++) {
+            if (processes[i].state == FINISHED || processes[i].remaining_time <= 0) {
+                 finish[i] = 1; // Finished processes are always considered done
+                 continue;
+            }
+            if (finish[i] == 0 && need[i] <= work[0]) {
+                work[0] += allocation[i];
+                finish[i] = 1;
+                found = 1;
+                safe_count++;
+            }
+        }
+    } while (found);
+
+    // 4. Check if all non-finished processes can finish
+    for (i = 0; i < num_proc; i++) {
+        if (processes[i].state != FINISHED && processes[i].remaining_time > 0 && finish[i] == 0) {
+            return 0; // Unsafe state
+        }
+    }
+    return 1; // Safe state
+}
+
+// ====================================================================
+// ALLOCATION STATE HASH AND BANKER'S VERDICT CACHE
+// check_safety only reads each process's frames held and whether it has
+// finished (free frames follow from the holdings), so its verdict is a
+// function of that state plus the request. The state is hashed Zobrist-style:
+// every (process, frames held) pair and every finished process has a random
+// 64-bit key, and the hash is the XOR of the keys in force, updated in O(1)
+// whenever a holding changes. A denied process retrying against an unchanged
+// state then hits the cache instead of running another safety pass; any
+// allocate/release moves the hash, so stale verdicts can never match.
+// Demand paging never asks Banker's and keeps its own residency counts.
+// ====================================================================
+
+#define SAFETY_CACHE_SIZE 256 // Direct-mapped verdict slots (power of two)
+#define ALLOC_FINISHED 0xFFFF // Key slot for "process has finished"
+
+typedef struct {
+    ULONGLONG hash;         // alloc_hash the verdict was computed under
+    int owner;              // Requesting pid + 1 (0 = empty slot)
+    int request;
+    int safe;
+} SafetyVerdict;
+
+SafetyVerdict safety_cache[SAFETY_CACHE_SIZE];
+ULONGLONG alloc_hash = 0;   // 0 = nothing held, nothing finished
+long alloc_version = 0;     // Bumped whenever frames change hands (deadlock detection skips unchanged graphs)
+long safety_checks = 0, safety_cache_hits = 0;
+LONGLONG safety_ns = 0;
+
+// splitmix64 finalizer: a fixed pseudo-random key per (pid, frames) without a table
+ULONGLONG alloc_key(int pid, int frames) {
+    if (frames == 0) return 0; // Holding nothing contributes nothing, so the initial hash is 0
+    ULONGLONG z = ((ULONGLONG)(pid + 1) << 32) | (unsigned int)frames;
+    z += 0x9E3779B97F4A7C15ULL;
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL;
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL;
+    return z ^ (z >> 31);
+}
+
+// The only way allocators change a holding, so the hash and version stay in step
+void set_allocated(int pid, int frames) {
+    int held = processes[pid].mem_allocated;
+    if (frames == held) return;
+    alloc_hash ^= alloc_key(pid, held) ^ alloc_key(pid, frames);
+    processes[pid].mem_allocated = frames;
+    alloc_version++;
+}
+
+void mark_finished(int pid) {
+    processes[pid].state = FINISHED;
+    alloc_hash ^= alloc_key(pid, ALLOC_FINISHED);
+}
+
+// check_safety behind the verdict cache, with its cost recorded for the avoidance vs detection comparison
+int banker_check(int pid, int request) {
+    LONGLONG t0 = now_ns();
+    SafetyVerdict *slot = &safety_cache[(alloc_hash ^ ((ULONGLONG)pid << 8) ^ (ULONGLONG)request) & (SAFETY_CACHE_SIZE - 1)];
+    int safe;
+    if (SAFETY_CACHE && slot->owner == pid + 1 && slot->request == request && slot->hash == alloc_hash) {
+        safe = slot->safe;
+        safety_cache_hits++;
+    } else {
+        safe = check_safety(processes[pid].id, request);
+        if (SAFETY_CACHE) {
+            slot->hash = alloc_hash;
+            slot->owner = pid + 1;
+            slot->request = request;
+            slot->safe = safe;
+        }
+    }
+    safety_ns += now_ns() - t0;
+    safety_checks++;
+    return safe;
+}
+
+// ====================================================================
+// BUDDY ALLOCATOR (memory=buddy)
+// Memory is TOTAL_FRAMES * PAGE_SIZE units, split into slots of BUDDY_MIN
+// units. Free blocks of 2^order slots sit on one list per order; a block's
+// buddy is its slot index with bit 'order' flipped, so an allocation splits
+// and a free coalesces at most BUDDY_MAX_ORDER times: O(log M) each.
+// ====================================================================
+
+#define BUDDY_MAX_ORDER 30
+#define BUDDY_MAX_SLOTS (1 << 24) // BUDDY_MIN grows until memory fits in this many slots
+
+int buddy_slots = 0;
+int buddy_top_order = 0;                  // Largest block order present after init
+int buddy_free_head[BUDDY_MAX_ORDER + 1]; // First free block of each order, -1 if none
+int *buddy_next = NULL;                   // Free-list links, valid for free block heads only
+int *buddy_prev = NULL;
+signed char *buddy_order = NULL;          // Order of the block starting at a slot, -1 otherwise
+char *buddy_free = NULL;                  // 1 if the block starting at a slot is free
+long long buddy_free_slots = 0;
+long buddy_allocs = 0, buddy_failures = 0, buddy_frag_failures = 0, buddy_splits = 0, buddy_merges = 0;
+
+// Internal fragmentation of every grant, tallied for both models so one run compares them
+long long frag_requested = 0;     // Units processes actually asked for
+long long frag_paging_held = 0;   // Units the same grants occupy as whole frames
+long long frag_buddy_held = 0;    // Units the same grants occupy as power-of-two blocks
+
+void buddy_push(int slot, int order) {
+    buddy_order[slot] = (signed char)order;
+    buddy_free[slot] = 1;
+    buddy_prev[slot] = -1;
+    buddy_next[slot] = buddy_free_head[order];
+    if (buddy_free_head[order] != -1) buddy_prev[buddy_free_head[order]] = slot;
+    buddy_free_head[order] = slot;
+    buddy_free_slots += 1LL << order;
+}
+
+void buddy_unlink(int slot) {
+    int order = buddy_order[slot];
+    if (buddy_prev[slot] != -1) buddy_next[buddy_prev[slot]] = buddy_next[slot];
+    else buddy_free_head[order] = buddy_next[slot];
+    if (buddy_next[slot] != -1) buddy_prev[buddy_next[slot]] = buddy_prev[slot];
+    buddy_free[slot] = 0;
+    buddy_free_slots -= 1LL << order;
+}
+
+// Smallest order whose block holds 'units' memory units
+int buddy_order_for(int units) {
+    int slots = (units + BUDDY_MIN - 1) / BUDDY_MIN;
+    int order = 0;
+    while ((1 << order) < slots) order++;
+    return order;
+}
+
+long long buddy_block_units(int units) {
+    return (long long)BUDDY_MIN << buddy_order_for(units);
+}
+
+int buddy_init() {
+    long long units = (long long)TOTAL_FRAMES * PAGE_SIZE;
+    while (units / BUDDY_MIN > BUDDY_MAX_SLOTS) BUDDY_MIN *= 2;
+    buddy_slots = (int)(units / BUDDY_MIN);
+    buddy_next = (int *)malloc(buddy_slots * sizeof(int));
+    buddy_prev = (int *)malloc(buddy_slots * sizeof(int));
+    buddy_order = (signed char *)malloc(buddy_slots);
+    buddy_free = (char *)calloc(buddy_slots, 1);
+    if (!buddy_next || !buddy_prev || !buddy_order || !buddy_free) return 0;
+    memset(buddy_order, -1, buddy_slots);
+    for (int o = 0; o <= BUDDY_MAX_ORDER; o++) buddy_free_head[o] = -1;
+
+    // Memory need not be a power of two: cover it with the largest aligned blocks that fit
+    for (int slot = 0; slot < buddy_slots; ) {
+        int order = BUDDY_MAX_ORDER;
+        while (order > 0 && ((slot & ((1 << order) - 1)) || slot + (1 << order) > buddy_slots)) order--;
+        buddy_push(slot, order);
+        if (order > buddy_top_order) buddy_top_order = order;
+        slot += 1 << order;
+    }
+    return 1;
+}
+
+void buddy_destroy() {
+    free(buddy_next);
+    free(buddy_prev);
+    free(buddy_order);
+    free(buddy_free);
+}
+
+// Returns the first slot of a block holding 'units', or -1
+int buddy_alloc(int units) {
+    int want = buddy_order_for(units);
+    int order = want;
+    while (order <= buddy_top_order && buddy_free_head[order] == -1) order++;
+    if (order > buddy_top_order) {
+        buddy_failures++;
+        // Enough free memory overall, just not in one block
+        if (buddy_free_slots >= (1LL << want)) buddy_frag_failures++;
+        return -1;
+    }
+    int slot = buddy_free_head[order];
+    buddy_unlink(slot);
+    while (order > want) {
+        order--;
+        buddy_push(slot + (1 << order), order); // Upper half goes back as a free buddy
+        buddy_splits++;
+    }
+    buddy_order[slot] = (signed char)want;
+    buddy_allocs++;
+    return slot;
+}
+
+void buddy_release(int slot) {
+    int order = buddy_order[slot];
+    while (order < buddy_top_order) {
+        int buddy = slot ^ (1 << order);
+        if (buddy + (1 << order) > buddy_slots || !buddy_free[buddy] || buddy_order[buddy] != order) break;
+        buddy_unlink(buddy);
+        buddy_order[slot > buddy ? slot : buddy] = -1;
+        if (buddy < slot) slot = buddy;
+        order++;
+        buddy_merges++;
+    }
+    buddy_push(slot, order);
+}
+
+// ====================================================================
+// VARIABLE-PARTITION ALLOCATOR (memory=contiguous)
+// Each process takes mem_needed adjacent frames. Every free hole is a node
+// of an AVL tree ordered by (size, start), for O(log H) best/worst-fit
+// lookups, and of an address-ordered list, for next-fit and for merging a
+// freed partition with the holes on either side.
+// ====================================================================
+
+int hole_start[MAX_PAGES], hole_size[MAX_PAGES];
+int hole_left[MAX_PAGES], hole_right[MAX_PAGES], hole_height[MAX_PAGES];
+int hole_prev[MAX_PAGES], hole_next[MAX_PAGES]; // Address order
+int hole_root = -1, hole_head = -1;
+int hole_pool[MAX_PAGES], hole_pool_count = 0;  // Unused node ids
+int hole_count = 0;
+int hole_free_frames = 0;   // Frames in all holes, kept by part_alloc/part_release
+int next_fit_rover = -1;    // Hole where the next next-fit search starts
+
+long part_allocs = 0, part_failures = 0, part_frag_failures = 0;
+long part_probes = 0;       // Tree nodes / list holes examined by placement
+LONGLONG part_alloc_ns = 0; // Wall-clock time spent placing partitions
+double ext_frag_sum = 0, ext_frag_max = 0;
+long ext_frag_samples = 0;
+
+int hole_less(int a, int b) {
+    if (hole_size[a] != hole_size[b]) return hole_size[a] < hole_size[b];
+    return hole_start[a] < hole_start[b];
+}
+
+int hole_h(int n) { return n < 0 ? 0 : hole_height[n]; }
+
+void hole_fix(int n) {
+    int hl = hole_h(hole_left[n]), hr = hole_h(hole_right[n]);
+    hole_height[n] = 1 + (hl > hr ? hl : hr);
+}
+
+int hole_rotate_right(int n) {
+    int l = hole_left[n];
+    hole_left[n] = hole_right[l];
+    hole_right[l] = n;
+    hole_fix(n);
+    hole_fix(l);
+    return l;
+}
+
+int hole_rotate_left(int n) {
+    int r = hole_right[n];
+    hole_right[n] = hole_left[r];
+    hole_left[r] = n;
+    hole_fix(n);
+    hole_fix(r);
+    return r;
+}
+
+int hole_balance(int n) {
+    hole_fix(n);
+    int diff = hole_h(hole_left[n]) - hole_h(hole_right[n]);
+    if (diff > 1) {
+        if (hole_h(hole_left[hole_left[n]]) < hole_h(hole_right[hole_left[n]])) hole_left[n] = hole_rotate_left(hole_left[n]);
+        return hole_rotate_right(n);
+    }
+    if (diff < -1) {
+        if (hole_h(hole_right[hole_right[n]]) < hole_h(hole_left[hole_right[n]])) hole_right[n] = hole_rotate_right(hole_right[n]);
+        return hole_rotate_left(n);
+    }
+    return n;
+}
+
+int hole_insert_at(int n, int id) {
+    if (n < 0) {
+        hole_left[id] = hole_right[id] = -1;
+        hole_height[id] = 1;
+        return id;
+    }
+    if (hole_less(id, n)) hole_left[n] = hole_insert_at(hole_left[n], id);
+    else hole_right[n] = hole_insert_at(hole_right[n], id);
+    return hole_balance(n);
+}
+
+// Unlinks the leftmost node of the subtree into *min
+int hole_remove_min(int n, int *min) {
+    if (hole_left[n] < 0) {
+        *min = n;
+        return hole_right[n];
+    }
+    hole_left[n] = hole_remove_min(hole_left[n], min);
+    return hole_balance(n);
+}
+
+int hole_remove_at(int n, int id) {
+    if (n < 0) return -1;
+    if (n == id) {
+        if (hole_left[n] < 0) return hole_right[n];
+        if (hole_right[n] < 0) return hole_left[n];
+        int succ;
+        int right = hole_remove_min(hole_right[n], &succ);
+        hole_left[succ] = hole_left[n];
+        hole_right[succ] = right;
+        return hole_balance(succ);
+    }
+    if (hole_less(id, n)) hole_left[n] = hole_remove_at(hole_left[n], id);
+    else hole_right[n] = hole_remove_at(hole_right[n], id);
+    return hole_balance(n);
+}
+
+// New hole linked after 'prev' in address order (prev = -1: at the head)
+void hole_add(int start, int size, int prev) {
+    int id = hole_pool[--hole_pool_count];
+    hole_start[id] = start;
+    hole_size[id] = size;
+    hole_prev[id] = prev;
+    hole_next[id] = (prev < 0) ? hole_head : hole_next[prev];
+    if (hole_next[id] >= 0) hole_prev[hole_next[id]] = id;
+    if (prev < 0) hole_head = id; else hole_next[prev] = id;
+    hole_root = hole_insert_at(hole_root, id);
+    hole_count++;
+}
+
+void hole_drop(int id) {
+    hole_root = hole_remove_at(hole_root, id);
+    if (hole_prev[id] >= 0) hole_next[hole_prev[id]] = hole_next[id]; else hole_head = hole_next[id];
+    if (hole_next[id] >= 0) hole_prev[hole_next[id]] = hole_prev[id];
+    if (next_fit_rover == id) next_fit_rover = hole_next[id];
+    hole_pool[hole_pool_count++] = id;
+    hole_count--;
+}
+
+void hole_init() {
+    hole_root = hole_head = next_fit_rover = -1;
+    hole_count = 0;
+    for (hole_pool_count = 0; hole_pool_count < MAX_PAGES; hole_pool_count++) hole_pool[hole_pool_count] = MAX_PAGES - 1 - hole_pool_count;
+    hole_add(0, TOTAL_FRAMES, -1);
+    hole_free_frames = TOTAL_FRAMES;
+}
+
+int largest_hole() {
+    int n = hole_root;
+    if (n < 0) return 0;
+    while (hole_right[n] >= 0) n = hole_right[n];
+    return hole_size[n];
+}
+
+// External fragmentation: share of free memory outside the largest hole
+double external_fragmentation() {
+    return hole_free_frames > 0 ? 1.0 - (double)largest_hole() / hole_free_frames : 0.0;
+}
+
+int find_hole(int frames) {
+    int n, found = -1;
+    switch (FIT_POLICY) {
+        case FIT_WORST:
+            for (n = hole_root; n >= 0; n = hole_right[n]) { found = n; part_probes++; }
+            return (found >= 0 && hole_size[found] >= frames) ? found : -1;
+        case FIT_NEXT:
+            n = (next_fit_rover >= 0) ? next_fit_rover : hole_head;
+            for (int seen = 0; seen < hole_count; seen++) {
+                part_probes++;
+                if (hole_size[n] >= frames) return n;
+                n = (hole_next[n] >= 0) ? hole_next[n] : hole_head;
+            }
+            return -1;
+        default:
+            // Leftmost hole with size >= frames: the tightest fit, lowest address among equals
+            for (n = hole_root; n >= 0; ) {
+                part_probes++;
+                if (hole_size[n] >= frames) { found = n; n = hole_left[n]; }
+                else n = hole_right[n];
+            }
+            return found;
+    }
+}
+
+// Returns the first frame (0-based) of 'frames' adjacent free frames, or -1
+int part_alloc(int frames) {
+    LONGLONG t0 = now_ns();
+    double frag = external_fragmentation();
+    ext_frag_sum += frag;
+    ext_frag_samples++;
+    if (frag > ext_frag_max) ext_frag_max = frag;
+
+    int id = find_hole(frames);
+    if (id < 0) {
+        part_failures++;
+        if (hole_free_frames >= frames) part_frag_failures++; // Enough free frames, none adjacent
+        part_alloc_ns += now_ns() - t0;
+        return -1;
+    }
+    int start = hole_start[id];
+    if (hole_size[id] == frames) {
+        next_fit_rover = hole_next[id];
+        hole_drop(id);
+    } else {
+        // Carve from the low end; the rest stays a hole at the same list position
+        hole_root = hole_remove_at(hole_root, id);
+        hole_start[id] += frames;
+        hole_size[id] -= frames;
+        hole_root = hole_insert_at(hole_root, id);
+        next_fit_rover = id;
+    }
+    hole_free_frames -= frames;
+    part_allocs++;
+    part_alloc_ns += now_ns() - t0;
+    return start;
+}
+
+void part_release(int start, int frames) {
+    hole_free_frames += frames;
+    int prev = -1, next = hole_head;
+    while (next >= 0 && hole_start[next] < start) {
+        prev = next;
+        next = hole_next[next];
+    }
+    if (prev >= 0 && hole_start[prev] + hole_size[prev] == start) {
+        start = hole_start[prev];
+        frames += hole_size[prev];
+        int before = hole_prev[prev];
+        hole_drop(prev);
+        prev = before;
+    }
+    if (next >= 0 && start + frames == hole_start[next]) {
+        frames += hole_size[next];
+        hole_drop(next);
+    }
+    hole_add(start, frames, prev);
+}
+
+// Free frames as shown in snapshots: in buddy mode, unused block space counts as used
+int free_frame_count() {
+    if (MEMORY_MODEL == MEM_BUDDY) return (int)(buddy_free_slots * BUDDY_MIN / PAGE_SIZE);
+    int allocated_frames = 0;
+    if (MEMORY_MODEL == MEM_SEMAPHORE) {
+        // The semaphore counts units; nothing is placed in memory_frames
+        for (int i = 0; i < NUM_PROCESSES; i++) allocated_frames += processes[i].mem_allocated;
+    } else for (int i = 0; i < TOTAL_FRAMES; i++) {
+        if (memory_frames[i] != 0) allocated_frames++;
+    }
+    return TOTAL_FRAMES - allocated_frames;
+}
+
+// ====================================================================
+// COMPRESSED EVENT LOG (log_compress=zlib, read by event_log.py)
+// Snapshot lines are staged in events.log.part; once log_block KB have
+// accumulated they are deflated into one block appended to events.log.
+// Every block header carries its snapshot count and time range, and the
+// run ends with a block index and a trailer pointing at it, so a reader
+// reaches any time by decompressing a single block. A log cut short has
+// no trailer but its blocks can still be walked header to header.
+// ====================================================================
+
+#define LOG_STAGE_FILE "events.log.part"
+#define LOG_CODEC_ZLIB 1
+#define LOG_BLOCK_MAGIC 0x314B4C42 // "BLK1"
+#define LOG_INDEX_MAGIC 0x31584449 // "IDX1"
+
+typedef struct {
+    char magic[8];          // "SIMEVLZ1"
+    int codec;
+    int block_bytes;
+} LogFileHeader;
+
+typedef struct {
+    int magic;
+    int packed_bytes;       // Compressed data following the header
+    int raw_bytes;
+    int count;              // Snapshots in the block
+    int first_time;
+    int last_time;
+} LogBlockHeader;
+
+typedef struct {
+    long long offset;       // Of the block header
+    int first_time;
+    int last_time;
+    int count;
+    int first_snapshot;
+} LogIndexEntry;
+
+typedef struct {
+    long long index_offset;
+    int block_count;
+    int magic;
+} LogTrailer;
+
+LogIndexEntry *log_index = NULL;
+int log_blocks = 0, log_index_cap = 0;
+long long log_offset = 0;   // Bytes in events.log so far
+int log_snapshots = 0;      // Snapshots in finished blocks
+int stage_count = 0, stage_first = 0, stage_last = 0;
+long stage_bytes = 0;
+int log_broken = 0;         // A block could not be written: the rest of the run stays in events.log.part
+int log_unindexed = 0;      // The block index could not grow: no trailer
+
+void log_open() {
+    FILE *f = fopen("events.log", "wb");
+    if (!f) return;
+    if (LOG_COMPRESS) {
+        LogFileHeader h;
+        memcpy(h.magic, "SIMEVLZ1", 8);
+        h.codec = LOG_CODEC_ZLIB;
+        h.block_bytes = LOG_BLOCK_KB * 1024;
+        fwrite(&h, sizeof(h), 1, f);
+        log_offset = sizeof(h);
+        remove(LOG_STAGE_FILE);
+    }
+    fclose(f);
+}
+
+// Deflates the staged lines into the next block of events.log. Until a block is safely written its
+// lines stay staged; after a failure every later line does too (log_broken), and readers find them there
+void log_flush_block() {
+#ifdef SIM_ZLIB
+    if (stage_count == 0 || log_broken) return;
+    FILE *stage = fopen(LOG_STAGE_FILE, "rb");
+    char *raw = (char *)malloc(stage_bytes);
+    uLongf packed_bytes = compressBound(stage_bytes);
+    Bytef *packed = (Bytef *)malloc(packed_bytes);
+    size_t raw_bytes = (stage && raw) ? fread(raw, 1, stage_bytes, stage) : 0;
+    if (stage) fclose(stage);
+
+    FILE *f = NULL;
+    int ok = packed && raw_bytes == (size_t)stage_bytes
+             && compress2(packed, &packed_bytes, (Bytef *)raw, raw_bytes, Z_DEFAULT_COMPRESSION) == Z_OK
+             && (f = fopen("events.log", "ab")) != NULL;
+    if (ok) {
+        LogBlockHeader h = {LOG_BLOCK_MAGIC, (int)packed_bytes, (int)raw_bytes, stage_count, stage_first, stage_last};
+        ok = fwrite(&h, sizeof(h), 1, f) == 1 && fwrite(packed, 1, packed_bytes, f) == packed_bytes;
+        if (fclose(f) != 0) ok = 0;
+    }
+    free(raw);
+    free(packed);
+    if (!ok) {
+        log_broken = 1;
+        return;
+    }
+
+    if (log_blocks == log_index_cap && !log_unindexed) {
+        int cap = log_index_cap ? 2 * log_index_cap : 64;
+        LogIndexEntry *grown = (LogIndexEntry *)realloc(log_index, cap * sizeof(LogIndexEntry));
+        if (grown) {
+            log_index = grown;
+            log_index_cap = cap;
+        } else log_unindexed = 1;
+    }
+    if (!log_unindexed) {
+        LogIndexEntry e = {log_offset, stage_first, stage_last, stage_count, log_snapshots};
+        log_index[log_blocks++] = e;
+    }
+    log_offset += sizeof(LogBlockHeader) + packed_bytes;
+    log_snapshots += stage_count;
+
+    stage = fopen(LOG_STAGE_FILE, "w");
+    if (stage) fclose(stage);
+    stage_count = 0;
+    stage_bytes = 0;
+#endif
+}
+
+// Called after each staged snapshot line of `bytes` bytes
+void log_stage_note(long bytes) {
+    if (stage_count == 0) stage_first = current_time;
+    stage_last = current_time;
+    stage_count++;
+    stage_bytes += bytes;
+    if (stage_bytes >= (long)LOG_BLOCK_KB * 1024) log_flush_block();
+}
+
+// Last block, then the index and the trailer. Without them a reader walks the block headers: after a
+// failed block, which also leaves events.log.part in place, or when the index could not grow
+void log_close() {
+    if (!LOG_COMPRESS) return;
+    log_flush_block();
+    if (log_broken) {
+        free(log_index);
+        log_index = NULL;
+        return;
+    }
+    FILE *f = log_unindexed ? NULL : fopen("events.log", "ab");
+    if (f) {
+        if (log_blocks > 0) fwrite(log_index, sizeof(LogIndexEntry), log_blocks, f);
+        LogTrailer t = {log_offset, log_blocks, LOG_INDEX_MAGIC};
+        fwrite(&t, sizeof(t), 1, f);
+        fclose(f);
+    }
+    remove(LOG_STAGE_FILE);
+    free(log_index);
+    log_index = NULL;
+}
+
+// ====================================================================
+// LOGGING FUNCTIONS
+// ====================================================================
+
+int LOG_FILES = 1;      // 0 in the in-process library: no events.log and no shared-memory ring
+
+// Called with the slot words of every snapshot (sim_set_callback in the library)
+typedef void (*SnapshotCallback)(const int *words, int count);
+SnapshotCallback snapshot_callback = NULL;
+int *callback_words = NULL;
+
+// What a logSnapshot call records, for the sampling policy
+#define SNAP_STATE 0        // A waiting, denial or starvation state
+#define SNAP_EVENT 1        // A scheduling event (logEvent)
+#define SNAP_FORCE 2        // The first and the last state of the run
+
+int *snap_words = NULL;     // Candidate snapshot, then the last one logged, as slot words
+int *snap_kept = NULL;
+int snap_kept_count = -1;   // -1 until the first snapshot is logged
+int snap_next_time = 0;     // snapshots=ticks: earliest time of the next snapshot
+long snapshots_taken = 0, snapshots_logged = 0;
+
+// Check CPU status non-blockingly for logging
+int cpu_busy() {
+    DWORD result = WaitForSingleObject(cpu_semaphore, 0); 
+    if (result == WAIT_OBJECT_0) {
+        ReleaseSemaphore(cpu_semaphore, 1, NULL); 
+    }
+    return result != WAIT_OBJECT_0;
+}
+
+void logSnapshotJSON(int busy, int available_frames) {
+    FILE *f = fopen(LOG_COMPRESS ? LOG_STAGE_FILE : "events.log", "a");
+    if (!f) return;
+    long start = ftell(f);
+
+    fprintf(f, "{");
+    fprintf(f, "\"time\": %d,", current_time);
+    
+    char* cpu_status = busy ? "Busy" : "Available";
+
+    fprintf(f, "\"resources\":{");
+    fprintf(f, "\"cpu_status\":\"%s\",", cpu_status);
+    fprintf(f, "\"mem_max\": %d,", TOTAL_FRAMES);
+    fprintf(f, "\"mem_available\":%d", available_frames);
+    fprintf(f, "},");
+
+    fprintf(f, "\"sync\":{");
+    logSemStats(f, &cpu_stats);
+    fprintf(f, ",");
+    logSemStats(f, &mutex_stats);
+    fprintf(f, ",");
+    logSemStats(f, &frame_stats);
+    fprintf(f, "},");
+
+    fprintf(f, "\"processes\":[");
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        fprintf(f,
+            "{\"id\":%d,\"prio\":%d,\"burst\":%d,\"remaining\":%d,\"mem_needed\":%d,\"max_mem\":%d,\"mem_allocated\":%d,\"status\":\"%s\",\"wait_hist\":",
+            processes[i].id,
+            processes[i].priority,
+            processes[i].burst_time,
+            processes[i].remaining_time,
+            processes[i].mem_needed,
+            processes[i].max_mem,
+            processes[i].mem_allocated,
+            processes[i].status
+        );
+        logWaitHist(f, i);
+        fprintf(f, "}");
+        if (i < NUM_PROCESSES - 1) fprintf(f, ",");
+    }
+    fprintf(f, "],");
+    
+    fprintf(f, "\"timeline\":[");
+    for (int k = 0; k < timeCount; k++) {
+        fprintf(f, "\"P%d\"", timeline[k]);
+        if (k < timeCount - 1) fprintf(f, ",");
+    }
+    fprintf(f, "]");
+    fprintf(f, "}\n");
+    fflush(f);
+    long bytes = ftell(f) - start;
+    fclose(f);
+    if (LOG_COMPRESS) log_stage_note(bytes);
+}
+
+// Whether the sampling policy keeps this snapshot
+int snapshot_wanted(int kind, int busy, int available_frames) {
+    if (SNAPSHOT_POLICY == SNAP_ALL) return 1;
+    if (SNAPSHOT_POLICY == SNAP_EVENTS && kind == SNAP_STATE) return 0;
+    if (SNAPSHOT_POLICY == SNAP_TICKS && kind != SNAP_FORCE && current_time < snap_next_time) return 0;
+
+    int words = slot_words();
+    if (!snap_words) {
+        snap_words = (int *)calloc(2 * (size_t)words, sizeof(int));
+        if (!snap_words) return 1;
+        snap_kept = snap_words + words;
+    }
+    int count = fill_slot(snap_words, busy, available_frames);
+    // Semaphore statistics move on every retry, so they are not a change of state:
+    // the next snapshot logged carries their totals
+    int sync_end = RING_SCALARS + SYNC_COUNT * SYNC_FIELDS;
+    if (count == snap_kept_count && memcmp(snap_words, snap_kept, RING_SCALARS * sizeof(int)) == 0 &&
+        memcmp(snap_words + sync_end, snap_kept + sync_end, (count - sync_end) * sizeof(int)) == 0) {
+        return 0;
+    }
+    memcpy(snap_kept, snap_words, count * sizeof(int));
+    snap_kept_count = count;
+    snap_next_time = (current_time / SNAPSHOT_EVERY + 1) * SNAPSHOT_EVERY;
+    return 1;
+}
+
+void logSnapshotKind(int kind) {
+    int busy = cpu_busy();
+    int available_frames = free_frame_count();
+    snapshots_taken++;
+    if (!snapshot_wanted(kind, busy, available_frames)) return;
+    snapshots_logged++;
+    if (LOG_FILES) logSnapshotJSON(busy, available_frames);
+    ringPublish(busy, available_frames);
+    if (snapshot_callback) {
+        if (!callback_words) callback_words = (int *)malloc(slot_words() * sizeof(int));
+        if (callback_words) snapshot_callback(callback_words, fill_slot(callback_words, busy, available_frames));
+    }
+}
+
+void logSnapshot() {
+    logSnapshotKind(SNAP_STATE);
+}
+
+void logEvent() {
+    logSnapshotKind(SNAP_EVENT);
+}
+
+void updateStatus(int i, int is_critical) {
+    if (processes[i].state == FINISHED) strcpy(processes[i].status, "Completed");
+    else if (processes[i].state == RUNNING) {
+        if (is_critical) strcpy(processes[i].status, "Critical Section");
+        else strcpy(processes[i].status, "Running");
+    }
+    else {
+        // Advanced status: Check for memory waiting first
+        if (processes[i].idle_cycles > STARVATION_THRESHOLD) {
+            if (strcmp(processes[i].status, "STARVATION DANGER") != 0) processes[i].starvation_events++;
+            strcpy(processes[i].status, "STARVATION DANGER");
+        }
+        else if (MEMORY_MODEL != MEM_DEMAND && processes[i].mem_allocated < processes[i].mem_needed) {
+            strcpy(processes[i].status, MEMORY_MODEL == MEM_SEMAPHORE ? "Waiting (Memory)" : "Waiting (Memory/Banker)");
+        }
+        else strcpy(processes[i].status, "Waiting (CPU)"); 
+    }
+}
+
+// Paces the simulation in wall-clock time unless realtime=0
+void sim_sleep(int ms) {
+    if (REALTIME) Sleep(ms);
+}
+
+// Earliest job release among unfinished processes that are not ready yet (-1 if none)
+int next_arrival_time() {
+    int next = -1;
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        if (processes[i].state != FINISHED && processes[i].release_time > current_time && (next == -1 || processes[i].release_time < next)) {
+            next = processes[i].release_time;
+        }
+    }
+    return next;
+}
+
+// ====================================================================
+// DEADLINES (EDF admission control and lateness accounting)
+// ====================================================================
+
+int *lateness;          // Completion - deadline of every finished job, in completion order
+int lateness_count = 0;
+double rt_utilization = 0;  // Sum of burst / period over all tasks
+double rt_admitted_util = 0;
+int rt_rejected = 0;
+
+// Utilization-bound admission in arrival order: a task is admitted only if it keeps sum(C/T) <= RT_BOUND
+void admit_tasks() {
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        if (processes[i].rel_deadline <= 0) continue;
+        double u = (double)processes[i].burst_time / processes[i].rel_deadline;
+        rt_utilization += u;
+        if (POLICY == POLICY_EDF && RT_ADMIT && rt_admitted_util + u > RT_BOUND + 1e-9) {
+            processes[i].admitted = 0;
+            mark_finished(i);
+            strcpy(processes[i].status, "Rejected");
+            rt_rejected++;
+        } else {
+            rt_admitted_util += u;
+        }
+    }
+}
+
+// Records the finished job's waiting time and lateness; returns 1 when the process has no jobs left
+int complete_job(int i) {
+    // Time ready but not running, from this job's release; a periodic task parked between releases is not waiting
+    processes[i].waiting_time += current_time - processes[i].release_time - processes[i].burst_time;
+    if (processes[i].rel_deadline > 0) {
+        int late = current_time - processes[i].abs_deadline;
+        lateness[lateness_count++] = late;
+        if (late > 0) processes[i].deadline_misses++;
+    }
+    processes[i].jobs_done++;
+    if (processes[i].jobs_done >= processes[i].jobs_total) return 1;
+
+    // Next job of a periodic task, released one period after the previous one
+    processes[i].release_time += processes[i].rel_deadline;
+    processes[i].abs_deadline = processes[i].release_time + processes[i].rel_deadline;
+    processes[i].remaining_time = processes[i].burst_time;
+    processes[i].wait_since = (processes[i].release_time > current_time) ? processes[i].release_time : current_time;
+    return 0;
+}
+
+// ====================================================================
+// PRIORITY AGING
+// Effective priority = base priority minus a boost earned by waiting
+// since the process last became ready (lower number = higher priority).
+// ====================================================================
+
+int aging_boost(int waited) {
+    int steps = waited / AGING_INTERVAL;
+    switch (AGING) {
+        case AGING_LINEAR: return steps;
+        case AGING_EXP: return (steps >= 8) ? MAX_PRIORITY : (1 << steps) - 1;
+        case AGING_CAPPED: return (steps > AGING_CAP) ? AGING_CAP : steps;
+        default: return 0;
+    }
+}
+
+int effective_priority(int i) {
+    int prio = processes[i].priority - aging_boost(current_time - processes[i].wait_since);
+    return prio < 0 ? 0 : prio; // 0 ranks an aged process above any fresh one
+}
+
+// Lets every frame-blocked (or suspended) process compete again; returns how many were waiting
+int clear_frames_wait() {
+    int cleared = 0;
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        if (processes[i].frames_wait) {
+            processes[i].frames_wait = 0;
+            if (processes[i].suspended) {
+                processes[i].suspended = 0;
+                strcpy(processes[i].status, "Waiting (CPU)");
+            }
+            cleared++;
+        }
+    }
+    return cleared;
+}
+
+// ====================================================================
+// PAGING/MEMORY MANAGEMENT
+// ====================================================================
+
+// Finds the first 'count' free frames and marks them for 'pid'
+// (takes as many as are free even when that is fewer than 'count')
+int allocate_frames(int pid, int count) {
+    int allocated_count = 0;
+    for (int i = 0; i < TOTAL_FRAMES && allocated_count < count; i++) {
+        if (memory_frames[i] == 0) {
+            memory_frames[i] = processes[pid].id;
+            processes[pid].page_table[processes[pid].page_table_count++] = i + 1; // Store frame ID (1-based)
+            allocated_count++;
+        }
+    }
+    set_allocated(pid, processes[pid].mem_allocated + allocated_count);
+    return allocated_count == count;
+}
+
+// Places the whole process in one buddy block; mem_allocated is still counted in frames
+int allocate_block(int pid) {
+    int slot = buddy_alloc(processes[pid].mem_units);
+    if (slot < 0) return 0;
+    processes[pid].block_slot = slot;
+    set_allocated(pid, processes[pid].mem_needed);
+    return 1;
+}
+
+long compact_moves = 0;     // Partitions relocated so far (see ONLINE COMPACTION)
+long failures_avoided = 0;
+int compact_pending = 0;    // A placement failed with enough free frames
+
+// Places the process in 'count' adjacent frames chosen by FIT_POLICY
+int allocate_partition(int pid, int count) {
+    long frag_failures = part_frag_failures;
+    int start = part_alloc(count);
+    if (start < 0) {
+        if (part_frag_failures > frag_failures) {
+            compact_pending = 1;
+            if (processes[pid].frag_failed_at < 0) processes[pid].frag_failed_at = compact_moves;
+        }
+        return 0;
+    }
+    // Fits now only because partitions were moved since its fragmentation failure
+    if (processes[pid].frag_failed_at >= 0 && compact_moves > processes[pid].frag_failed_at) failures_avoided++;
+    processes[pid].frag_failed_at = -1;
+    for (int k = 0; k < count; k++) {
+        memory_frames[start + k] = processes[pid].id;
+        processes[pid].page_table[processes[pid].page_table_count++] = start + k + 1; // Frame ID (1-based)
+    }
+    set_allocated(pid, processes[pid].mem_allocated + count);
+    return 1;
+}
+
+// Takes 'count' units from the counting semaphore one at a time, handing them all back if one is missing
+int allocate_units(int pid, int count) {
+    for (int j = 0; j < count; j++) {
+        if (WaitForSingleObject(mem_semaphore, 0) != WAIT_OBJECT_0) {
+            if (j > 0) ReleaseSemaphore(mem_semaphore, j, NULL);
+            return 0;
+        }
+    }
+    set_allocated(pid, processes[pid].mem_allocated + count);
+    return 1;
+}
+
+void demand_release(int pid, int forget_history);
+
+// Releases all frames held by 'pid'
+void release_frames(int pid) {
+    if (MEMORY_MODEL == MEM_SEMAPHORE && processes[pid].mem_allocated > 0) {
+        ReleaseSemaphore(mem_semaphore, processes[pid].mem_allocated, NULL);
+    }
+    if (MEMORY_MODEL == MEM_DEMAND) demand_release(pid, 1);
+    if (MEMORY_MODEL == MEM_CONTIGUOUS && processes[pid].page_table_count > 0) {
+        part_release(processes[pid].page_table[0] - 1, processes[pid].page_table_count);
+    }
+    if (processes[pid].block_slot >= 0) {
+        buddy_release(processes[pid].block_slot);
+        processes[pid].block_slot = -1;
+    }
+    for (int i = 0; i < TOTAL_FRAMES; i++) {
+        if (memory_frames[i] == processes[pid].id) {
+            memory_frames[i] = 0; // Release frame
+        }
+    }
+    if (MEMORY_MODEL == MEM_DEMAND) processes[pid].mem_allocated = 0; // Residency count, not a grant
+    else set_allocated(pid, 0);
+    processes[pid].page_table_count = 0;
+}
+
+// ====================================================================
+// SYNCHRONIZATION AND BANKER-INTEGRATED ACQUISITION
+// ====================================================================
+
+int acquire_cpu(int pid) {
+    DWORD result = WaitForSingleObject(cpu_semaphore, 0);
+    int ok = (result == WAIT_OBJECT_0);
+    note_attempt(&cpu_stats, &processes[pid].blocked_cpu, ok);
+    if (ok) {
+        cpu_stats.acquired++;
+        cpu_held_since = current_time;
+        cpu_held_us = now_us();
+        record_wait(pid, current_time - processes[pid].wait_since);
+    }
+    return ok;
+}
+
+void release_cpu(int pid) {
+    note_release(&cpu_stats, cpu_held_since, cpu_held_us);
+    processes[pid].wait_since = current_time;
+    ReleaseSemaphore(cpu_semaphore, 1, NULL);
+}
+
+// Try-lock first so contention on mem_mutex is counted, then block as before
+void lock_mem_mutex(int pid) {
+    DWORD result = WaitForSingleObject(mem_mutex, 0);
+    note_attempt(&mutex_stats, &processes[pid].blocked_mutex, result == WAIT_OBJECT_0);
+    if (result != WAIT_OBJECT_0) WaitForSingleObject(mem_mutex, INFINITE);
+    mutex_stats.acquired++;
+    mutex_held_us = now_us();
+}
+
+void unlock_mem_mutex() {
+    note_release(&mutex_stats, current_time, mutex_held_us);
+    ReleaseMutex(mem_mutex);
+}
+
+int acquire_memory(int pid) {
+    int needed = processes[pid].mem_needed - processes[pid].mem_allocated;
+
+    if (needed <= 0) return 1;
+
+    lock_mem_mutex(pid);
+    int held = processes[pid].mem_allocated;
+
+    // 1. BANKER'S ALGORITHM CHECK: Is the request safe? (skipped when deadlocks are detected instead,
+    //    and for the semaphore, which never leaves a process holding part of its memory)
+    if (DEADLOCK_MODE == DL_AVOID && MEMORY_MODEL != MEM_SEMAPHORE && !banker_check(pid, needed)) {
+        note_attempt(&frame_stats, &processes[pid].blocked_frames, 0);
+        unlock_mem_mutex();
+        strcpy(processes[pid].status, "Waiting (Banker Denied)");
+        return 0; // Banker's denies the request for safety
+    }
+
+    // 2. PHYSICAL ALLOCATION (PAGING, one BUDDY block, one CONTIGUOUS partition, or SEMAPHORE units)
+    int granted;
+    if (MEMORY_MODEL == MEM_BUDDY) granted = allocate_block(pid);
+    else if (MEMORY_MODEL == MEM_CONTIGUOUS) granted = allocate_partition(pid, needed);
+    else if (MEMORY_MODEL == MEM_SEMAPHORE) granted = allocate_units(pid, needed);
+    else granted = allocate_frames(pid, needed);
+    if (!granted) {
+        // Without Banker's, paging keeps the frames it could get and waits for the rest
+        if (held == 0 && processes[pid].mem_allocated > 0) {
+            processes[pid].mem_held_since = current_time;
+            processes[pid].mem_held_us = now_us();
+        }
+        // Paging should theoretically not fail if Banker passed and there was a free frame,
+        // but log the denial just in case of resource race/timing issues not captured by mutex.
+        // Buddy and contiguous placement fail whenever no free block or hole is large enough,
+        // and the semaphore whenever fewer units are left than requested (updateStatus reports that).
+        note_attempt(&frame_stats, &processes[pid].blocked_frames, 0);
+        unlock_mem_mutex();
+        if (MEMORY_MODEL != MEM_SEMAPHORE) {
+            strcpy(processes[pid].status, MEMORY_MODEL == MEM_PAGING ? "Waiting (No Free Frames)" : "Waiting (No Free Block)");
+        }
+        return 0;
+    }
+
+    note_attempt(&frame_stats, &processes[pid].blocked_frames, 1);
+    frame_stats.acquired += needed;
+    frag_requested += processes[pid].mem_units;
+    frag_paging_held += (long long)processes[pid].mem_needed * PAGE_SIZE;
+    frag_buddy_held += buddy_block_units(processes[pid].mem_units);
+    if (held == 0) {
+        processes[pid].mem_held_since = current_time;
+        processes[pid].mem_held_us = now_us();
+    }
+    unlock_mem_mutex();
+    return 1;
+}
+
+void release_memory(int pid) {
+    lock_mem_mutex(pid);
+    if (MEMORY_MODEL != MEM_DEMAND && processes[pid].mem_allocated > 0) { // Demand-paged frames are never granted here
+        note_release(&frame_stats, processes[pid].mem_held_since, processes[pid].mem_held_us);
+    }
+    release_frames(pid);
+    unlock_mem_mutex();
+}
+
+// ====================================================================
+// CFS RUN QUEUE (AVL tree keyed on vruntime, ties broken by pid)
+// Runnable processes live in the tree; the leftmost node runs next.
+// Insert, remove and pick are all O(log N).
+// ====================================================================
+
+#define NICE_0_WEIGHT 1024
+// Linux sched_prio_to_weight for nice -10, -5, 0, 5, 10 (priority 1..5)
+const int PRIO_TO_WEIGHT[MAX_PRIORITY] = {9548, 3121, 1024, 335, 110};
+
+int *cfs_left, *cfs_right, *cfs_height; // Tree links indexed by process slot
+int cfs_root = -1;
+int cfs_nr_running = 0;
+long cfs_total_weight = 0;
+long long cfs_min_vruntime = 0;
+char *cfs_queued;      // 1 while the slot is in the tree
+int *cfs_blocked;      // Dequeued while denied frames; re-queued when frames free up
+int cfs_blocked_count = 0;
+
+int cfs_less(int a, int b) {
+    if (processes[a].vruntime != processes[b].vruntime) return processes[a].vruntime < processes[b].vruntime;
+    return a < b;
+}
+
+int cfs_h(int n) { return n < 0 ? 0 : cfs_height[n]; }
+
+void cfs_fix(int n) {
+    int hl = cfs_h(cfs_left[n]), hr = cfs_h(cfs_right[n]);
+    cfs_height[n] = 1 + (hl > hr ? hl : hr);
+}
+
+int cfs_rotate_right(int n) {
+    int l = cfs_left[n];
+    cfs_left[n] = cfs_right[l];
+    cfs_right[l] = n;
+    cfs_fix(n);
+    cfs_fix(l);
+    return l;
+}
+
+int cfs_rotate_left(int n) {
+    int r = cfs_right[n];
+    cfs_right[n] = cfs_left[r];
+    cfs_left[r] = n;
+    cfs_fix(n);
+    cfs_fix(r);
+    return r;
+}
+
+int cfs_balance(int n) {
+    cfs_fix(n);
+    int diff = cfs_h(cfs_left[n]) - cfs_h(cfs_right[n]);
+    if (diff > 1) {
+        if (cfs_h(cfs_left[cfs_left[n]]) < cfs_h(cfs_right[cfs_left[n]])) cfs_left[n] = cfs_rotate_left(cfs_left[n]);
+        return cfs_rotate_right(n);
+    }
+    if (diff < -1) {
+        if (cfs_h(cfs_right[cfs_right[n]]) < cfs_h(cfs_left[cfs_right[n]])) cfs_right[n] = cfs_rotate_right(cfs_right[n]);
+        return cfs_rotate_left(n);
+    }
+    return n;
+}
+
+int cfs_insert_at(int n, int pid) {
+    if (n < 0) {
+        cfs_left[pid] = cfs_right[pid] = -1;
+        cfs_height[pid] = 1;
+        return pid;
+    }
+    if (cfs_less(pid, n)) cfs_left[n] = cfs_insert_at(cfs_left[n], pid);
+    else cfs_right[n] = cfs_insert_at(cfs_right[n], pid);
+    return cfs_balance(n);
+}
+
+// Unlinks the leftmost node of the subtree into *min
+int cfs_remove_min(int n, int *min) {
+    if (cfs_left[n] < 0) {
+        *min = n;
+        return cfs_right[n];
+    }
+    cfs_left[n] = cfs_remove_min(cfs_left[n], min);
+    return cfs_balance(n);
+}
+
+int cfs_remove_at(int n, int pid) {
+    if (n < 0) return -1;
+    if (n == pid) {
+        if (cfs_left[n] < 0) return cfs_right[n];
+        if (cfs_right[n] < 0) return cfs_left[n];
+        int succ;
+        int right = cfs_remove_min(cfs_right[n], &succ);
+        cfs_left[succ] = cfs_left[n];
+        cfs_right[succ] = right;
+        return cfs_balance(succ);
+    }
+    if (cfs_less(pid, n)) cfs_left[n] = cfs_remove_at(cfs_left[n], pid);
+    else cfs_right[n] = cfs_remove_at(cfs_right[n], pid);
+    return cfs_balance(n);
+}
+
+void cfs_update_min_vruntime() {
+    if (cfs_root < 0) return;
+    int n = cfs_root;
+    while (cfs_left[n] >= 0) n = cfs_left[n];
+    if (processes[n].vruntime > cfs_min_vruntime) cfs_min_vruntime = processes[n].vruntime; // Never moves backwards
+}
+
+void cfs_enqueue(int pid) {
+    if (cfs_queued[pid]) return;
+    cfs_queued[pid] = 1;
+    cfs_root = cfs_insert_at(cfs_root, pid);
+    cfs_nr_running++;
+    cfs_total_weight += processes[pid].weight;
+}
+
+void cfs_dequeue(int pid) {
+    if (!cfs_queued[pid]) return;
+    cfs_queued[pid] = 0;
+    cfs_root = cfs_remove_at(cfs_root, pid);
+    cfs_nr_running--;
+    cfs_total_weight -= processes[pid].weight;
+}
+
+void cfs_wake_blocked();
+
+int cfs_pick_next() {
+    if (cfs_root < 0 && cfs_blocked_count > 0) cfs_wake_blocked(); // Nobody else can free frames; retry them
+    if (cfs_root < 0) return -1;
+    int n = cfs_root;
+    while (cfs_left[n] >= 0) n = cfs_left[n];
+    return n;
+}
+
+// Share of the scheduling period (QUANTUM_SECONDS per runnable task) in proportion to weight
+int cfs_slice(int pid) {
+    long period = (long)QUANTUM_SECONDS * cfs_nr_running;
+    int slice = (cfs_total_weight > 0) ? (int)(period * processes[pid].weight / cfs_total_weight) : QUANTUM_SECONDS;
+    return slice < 1 ? 1 : slice; // Minimum granularity: one simulated second
+}
+
+void cfs_account(int pid, int exec_time) {
+    processes[pid].vruntime += (long long)exec_time * 1000 * NICE_0_WEIGHT / processes[pid].weight;
+}
+
+// Only a queued task can block (a parked or already blocked one is left alone)
+void cfs_block(int pid) {
+    if (!cfs_queued[pid]) return;
+    cfs_dequeue(pid);
+    cfs_blocked[cfs_blocked_count++] = pid;
+}
+
+void cfs_wake_blocked() {
+    // Re-queued tasks start no earlier than min_vruntime so waiting does not bank credit
+    for (int k = 0; k < cfs_blocked_count; k++) {
+        int pid = cfs_blocked[k];
+        if (processes[pid].vruntime < cfs_min_vruntime) processes[pid].vruntime = cfs_min_vruntime;
+        if (processes[pid].suspended) {
+            processes[pid].suspended = 0;
+            strcpy(processes[pid].status, "Waiting (CPU)");
+        }
+        cfs_enqueue(pid);
+    }
+    cfs_blocked_count = 0;
+}
+
+int cfs_init() {
+    cfs_left = (int *)malloc(NUM_PROCESSES * sizeof(int));
+    cfs_right = (int *)malloc(NUM_PROCESSES * sizeof(int));
+    cfs_height = (int *)malloc(NUM_PROCESSES * sizeof(int));
+    cfs_blocked = (int *)malloc(NUM_PROCESSES * sizeof(int));
+    cfs_queued = (char *)calloc(NUM_PROCESSES, 1);
+    if (!cfs_left || !cfs_right || !cfs_height || !cfs_blocked || !cfs_queued) return 0;
+    return 1; // Tasks enter the tree as they arrive (see make_ready)
+}
+
+void cfs_free() {
+    free(cfs_left);
+    free(cfs_right);
+    free(cfs_height);
+    free(cfs_blocked);
+    free(cfs_queued);
+}
+
+// ====================================================================
+// RUN QUEUES (queue-driven policies: MLFQ, SJF, SRTF, EDF)
+// MLFQ keeps one FIFO per level plus a bitmap with bit L set while level L
+// is non-empty, so picking the highest non-empty level is one
+// count-trailing-zeros instruction, as in the Linux O(1) scheduler.
+// ====================================================================
+
+int *mlfq_queue[MAX_MLFQ_LEVELS];   // Circular FIFOs of process slots
+int mlfq_head[MAX_MLFQ_LEVELS];
+int mlfq_count[MAX_MLFQ_LEVELS];
+unsigned int mlfq_bitmap = 0;
+int mlfq_last_boost = 0;
+long mlfq_demotions = 0;
+long mlfq_boosts = 0;
+long mlfq_dispatches[MAX_MLFQ_LEVELS];
+
+// SJF/SRTF/EDF ready set: binary min-heap of process slots
+int *ready_heap;
+int ready_heap_size = 0;
+
+int *mem_blocked;      // Popped but denied memory; re-queued when memory is released
+int mem_blocked_count = 0;
+
+int *rt_pending;       // Periodic tasks waiting for their next job release
+int rt_pending_count = 0;
+
+void mlfq_push(int pid) {
+    int l = processes[pid].level;
+    mlfq_queue[l][(mlfq_head[l] + mlfq_count[l]) % NUM_PROCESSES] = pid;
+    mlfq_count[l]++;
+    mlfq_bitmap |= 1u << l;
+}
+
+int mlfq_pop() {
+    if (mlfq_bitmap == 0) return -1;
+    int l = __builtin_ctz(mlfq_bitmap); // Highest non-empty level in O(1)
+    int pid = mlfq_queue[l][mlfq_head[l]];
+    mlfq_head[l] = (mlfq_head[l] + 1) % NUM_PROCESSES;
+    if (--mlfq_count[l] == 0) mlfq_bitmap &= ~(1u << l);
+    mlfq_dispatches[l]++;
+    return pid;
+}
+
+// Periodic boost: every queued or blocked process moves back to level 0, keeping FIFO order
+void mlfq_boost() {
+    for (int l = 1; l < MLFQ_LEVELS; l++) {
+        while (mlfq_count[l] > 0) {
+            int pid = mlfq_queue[l][mlfq_head[l]];
+            mlfq_head[l] = (mlfq_head[l] + 1) % NUM_PROCESSES;
+            mlfq_count[l]--;
+            processes[pid].level = 0;
+            mlfq_push(pid);
+        }
+    }
+    mlfq_bitmap &= 1u;
+    for (int k = 0; k < mem_blocked_count; k++) processes[mem_blocked[k]].level = 0;
+    mlfq_last_boost = current_time;
+    mlfq_boosts++;
+}
+
+double heap_key(int pid) {
+    if (POLICY == POLICY_EDF) return processes[pid].abs_deadline;
+    return (SJF_ALPHA > 0) ? processes[pid].tau : processes[pid].remaining_time;
+}
+
+// Shorter key first; ties go to the earlier arrival, then the lower slot
+int heap_less(int a, int b) {
+    double ka = heap_key(a), kb = heap_key(b);
+    if (ka != kb) return ka < kb;
+    if (processes[a].arrival_time != processes[b].arrival_time) return processes[a].arrival_time < processes[b].arrival_time;
+    return a < b;
+}
+
+void heap_push(int pid) {
+    int k = ready_heap_size++;
+    while (k > 0 && heap_less(pid, ready_heap[(k - 1) / 2])) {
+        ready_heap[k] = ready_heap[(k - 1) / 2];
+        k = (k - 1) / 2;
+    }
+    ready_heap[k] = pid;
+}
+
+int heap_pop() {
+    if (ready_heap_size == 0) return -1;
+    int top = ready_heap[0];
+    int last = ready_heap[--ready_heap_size];
+    int k = 0;
+    while (2 * k + 1 < ready_heap_size) {
+        int child = 2 * k + 1;
+        if (child + 1 < ready_heap_size && heap_less(ready_heap[child + 1], ready_heap[child])) child++;
+        if (!heap_less(ready_heap[child], last)) break;
+        ready_heap[k] = ready_heap[child];
+        k = child;
+    }
+    if (ready_heap_size > 0) ready_heap[k] = last;
+    return top;
+}
+
+int rq_init() {
+    mem_blocked = (int *)malloc(NUM_PROCESSES * sizeof(int));
+    ready_heap = (int *)malloc(NUM_PROCESSES * sizeof(int));
+    rt_pending = (int *)malloc(NUM_PROCESSES * sizeof(int));
+    if (!mem_blocked || !ready_heap || !rt_pending) return 0;
+    for (int l = 0; l < MLFQ_LEVELS; l++) {
+        mlfq_queue[l] = (int *)malloc(NUM_PROCESSES * sizeof(int));
+        if (!mlfq_queue[l]) return 0;
+        mlfq_head[l] = mlfq_count[l] = 0;
+        mlfq_dispatches[l] = 0;
+    }
+    return 1;
+}
+
+void rq_free() {
+    free(mem_blocked);
+    free(ready_heap);
+    free(rt_pending);
+    for (int l = 0; l < MLFQ_LEVELS; l++) free(mlfq_queue[l]);
+}
+
+void rq_push(int pid) {
+    if (POLICY == POLICY_MLFQ) mlfq_push(pid);
+    else heap_push(pid);
+}
+
+int rq_pop() {
+    if (POLICY == POLICY_MLFQ) return mlfq_pop();
+    return heap_pop();
+}
+
+// Longest run the policy grants this process before it must go back to the queue
+int rq_slice(int pid) {
+    if (POLICY == POLICY_MLFQ) return MLFQ_QUANTA[processes[pid].level];
+    if (POLICY == POLICY_SRTF || POLICY == POLICY_EDF) {
+        // Run until the next release, when a shorter job / earlier deadline may preempt
+        int next = next_arrival_time();
+        if (next > current_time) return next - current_time;
+    }
+    return processes[pid].remaining_time;
+}
+
+// Called after every slice, finished or not, with the time actually run
+void rq_observe(int pid, int used) {
+    if (SJF_ALPHA > 0) processes[pid].tau = SJF_ALPHA * used + (1 - SJF_ALPHA) * processes[pid].tau;
+}
+
+// Called after a slice that did not finish the process
+void rq_requeue(int pid, int used) {
+    if (POLICY != POLICY_MLFQ) {
+        rq_push(pid);
+        return;
+    }
+    // Using the whole quantum marks the process CPU-bound: demote it one level
+    if (used >= MLFQ_QUANTA[processes[pid].level] && processes[pid].level < MLFQ_LEVELS - 1) {
+        processes[pid].level++;
+        mlfq_demotions++;
+    }
+    rq_push(pid);
+}
+
+// Policy housekeeping before each dispatch
+void rq_tick() {
+    if (POLICY == POLICY_MLFQ && MLFQ_BOOST_PERIOD > 0 && current_time - mlfq_last_boost >= MLFQ_BOOST_PERIOD) mlfq_boost();
+}
+
+void make_ready(int pid);
+
+void release_due_jobs() {
+    for (int k = 0; k < rt_pending_count; ) {
+        int pid = rt_pending[k];
+        if (processes[pid].release_time <= current_time) {
+            make_ready(pid);
+            rt_pending[k] = rt_pending[--rt_pending_count];
+        } else {
+            k++;
+        }
+    }
+}
+
+void requeue_mem_blocked() {
+    for (int k = 0; k < mem_blocked_count; k++) rq_push(mem_blocked[k]);
+    mem_blocked_count = 0;
+}
+
+// ====================================================================
+// SCHEDULER MODULE HOOKS
+// The rest of the engine hands processes to whichever policy is selected
+// through these, so memory models, load control and deadlock recovery work
+// the same under every scheduler.
+// ====================================================================
+
+int arrived = 0;        // Processes are created in arrival order
+
+// A process became runnable (arrived, or its next periodic job was released)
+void make_ready(int pid) {
+    if (POLICY == POLICY_CFS) {
+        // Start no earlier than min_vruntime, as woken tasks do
+        if (processes[pid].vruntime < cfs_min_vruntime) processes[pid].vruntime = cfs_min_vruntime;
+        cfs_enqueue(pid);
+    } else if (POLICY >= POLICY_MLFQ) {
+        rq_push(pid);
+    }
+    // The priority and table scans find released processes on their own
+}
+
+// Hands arrivals and due periodic jobs to the scheduler
+void admit_arrivals() {
+    for (; arrived < NUM_PROCESSES && processes[arrived].arrival_time <= current_time; arrived++) {
+        if (processes[arrived].state != FINISHED) make_ready(arrived);
+    }
+    release_due_jobs();
+}
+
+// A periodic task finished a job: hold it until its next release
+void park_until_release(int pid) {
+    if (POLICY == POLICY_CFS || POLICY >= POLICY_MLFQ) rt_pending[rt_pending_count++] = pid;
+}
+
+// Memory was freed: every process blocked on it (or suspended by load control)
+// may compete again. Returns 1 if anyone was waiting.
+int wake_memory_waiters() {
+    int woken = cfs_blocked_count + mem_blocked_count;
+    if (POLICY == POLICY_CFS) cfs_wake_blocked();
+    if (POLICY >= POLICY_MLFQ) requeue_mem_blocked();
+    return clear_frames_wait() || woken > 0;
+}
+
+// ====================================================================
+// DEADLOCK DETECTION AND RECOVERY (deadlock=detect)
+// Requests are granted from whatever is free, so a process can hold frames
+// while waiting for more. Detection reduces the resource-allocation graph:
+// frames are one resource type with many instances, so a cycle in the
+// wait-for graph is necessary but not sufficient, while the reduction is
+// exact. Waiting requests are satisfied smallest first, releasing their
+// holdings into Work; whoever is left can never proceed. A pass only runs
+// when the allocation graph changed since the last one, and at most every
+// DETECT_INTERVAL seconds unless every unfinished process is blocked.
+// ====================================================================
+
+long detect_runs = 0, detect_skipped = 0, deadlocks_found = 0, deadlock_victims = 0;
+LONGLONG detect_ns = 0;
+long detected_version = -1; // alloc_version at the last pass
+int last_detect_time = 0;
+int *dl_order = NULL;       // Waiting processes sorted by outstanding request
+
+int dl_request(int i) {
+    if (processes[i].state == FINISHED) return 0;
+    return processes[i].mem_needed - processes[i].mem_allocated;
+}
+
+void dl_sort(int n) {
+    // Insertion sort: at most NUM_PROCESSES entries, usually nearly sorted between passes
+    for (int a = 1; a < n; a++) {
+        int key = dl_order[a], b = a - 1;
+        while (b >= 0 && dl_request(dl_order[b]) > dl_request(key)) {
+            dl_order[b + 1] = dl_order[b];
+            b--;
+        }
+        dl_order[b + 1] = key;
+    }
+}
+
+// Returns the deadlocked process preempted least often so far, then lowest priority,
+// then least progress; counting past preemptions keeps one process from being the
+// victim forever when it re-grabs its frames first. -1 when there is no deadlock.
+int detect_deadlock() {
+    LONGLONG t0 = now_ns();
+    int work = free_frame_count();
+    int n = 0;
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        if (dl_request(i) <= 0) work += processes[i].mem_allocated; // Not waiting: will finish and release
+        else dl_order[n++] = i;
+    }
+    dl_sort(n);
+    int k = 0;
+    while (k < n && dl_request(dl_order[k]) <= work) work += processes[dl_order[k++]].mem_allocated;
+
+    int victim = -1, stuck_holders = 0;
+    for (; k < n; k++) {
+        int i = dl_order[k];
+        if (processes[i].mem_allocated == 0) continue; // Waiting on the deadlock, not part of it
+        stuck_holders++;
+        if (victim < 0) { victim = i; continue; }
+        ProcessInfo *p = &processes[i], *v = &processes[victim];
+        if (p->dl_preempts != v->dl_preempts) { if (p->dl_preempts < v->dl_preempts) victim = i; }
+        else if (p->priority != v->priority) { if (p->priority > v->priority) victim = i; }
+        else if (p->burst_time - p->remaining_time < v->burst_time - v->remaining_time) victim = i;
+    }
+    detect_runs++;
+    detect_ns += now_ns() - t0;
+    detected_version = alloc_version;
+    last_detect_time = current_time;
+    return stuck_holders > 0 ? victim : -1;
+}
+
+int all_blocked_on_memory() {
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        if (processes[i].state != FINISHED && processes[i].mem_allocated >= processes[i].mem_needed) return 0;
+    }
+    return 1;
+}
+
+// Called after a denied request; returns 1 if a deadlock was broken
+int maybe_detect_deadlock() {
+    if (DEADLOCK_MODE != DL_DETECT) return 0;
+    if (alloc_version == detected_version ||
+        (current_time - last_detect_time < DETECT_INTERVAL && !all_blocked_on_memory())) {
+        detect_skipped++;
+        return 0;
+    }
+    int victim = detect_deadlock();
+    if (victim < 0) return 0;
+
+    deadlocks_found++;
+    deadlock_victims++;
+    processes[victim].dl_preempts++;
+    release_memory(victim); // A partial holder has not run yet, so no work is lost
+    strcpy(processes[victim].status, "Preempted (Deadlock)");
+    wake_memory_waiters();
+    return 1;
+}
+
+// ====================================================================
+// ONLINE COMPACTION (memory=contiguous compact=1)
+// A run starts when external fragmentation passes COMPACT_THRESHOLD or a
+// placement fails with enough free frames. Each step slides the partition
+// just above the lowest hole down into it, moving roughly COMPACT_STEP
+// frames, until one hole is left. Copies cost COPY_MS per frame of
+// simulated time.
+// ====================================================================
+
+int compacting = 0;
+long compact_runs = 0, compact_steps = 0, compact_frames = 0;
+int compact_ms = 0;         // Copy time not yet turned into simulated seconds
+long compact_seconds = 0;
+
+// Moves the partition above the lowest hole to the hole's start; returns the frames moved
+int compact_move_one() {
+    int h = hole_head;
+    int hs = hole_start[h], size = hole_size[h];
+    int pid = memory_frames[hs + size] - 1;
+    int count = processes[pid].page_table_count;
+
+    for (int k = 0; k < count; k++) memory_frames[processes[pid].page_table[k] - 1] = 0;
+    for (int k = 0; k < count; k++) {
+        memory_frames[hs + k] = processes[pid].id;
+        processes[pid].page_table[k] = hs + k + 1;
+    }
+    // The hole now sits above the partition and merges with the next one if they touch
+    hole_drop(h);
+    hole_free_frames -= size; // Handed back by part_release
+    part_release(hs + count, size);
+    compact_moves++;
+    return count;
+}
+
+// One bounded compaction step per scheduler pass; returns the simulated seconds it cost
+int compact_tick() {
+    if (!compacting) {
+        if (hole_count < 2 || (!compact_pending && external_fragmentation() * 100 <= COMPACT_THRESHOLD)) {
+            compact_pending = 0;
+            return 0;
+        }
+        compacting = 1;
+        compact_runs++;
+    }
+    compact_pending = 0;
+
+    int moved = 0;
+    WaitForSingleObject(mem_mutex, INFINITE);
+    while (hole_count > 1) {
+        int next = memory_frames[hole_start[hole_head] + hole_size[hole_head]] - 1;
+        if (moved > 0 && moved + processes[next].page_table_count > COMPACT_STEP) break;
+        moved += compact_move_one();
+    }
+    ReleaseMutex(mem_mutex);
+    if (hole_count < 2) compacting = 0;
+
+    compact_steps++;
+    compact_frames += moved;
+    compact_ms += moved * COPY_MS;
+    int seconds = compact_ms / 1000;
+    compact_ms %= 1000;
+    compact_seconds += seconds;
+    return seconds;
+}
+
+// ====================================================================
+// TLB (tlb=N)
+// Set-associative cache of (process, virtual page) -> frame consulted
+// before the page table. Without ASID tags it is flushed whenever another
+// process is dispatched; evicted pages are shot down so it never goes stale.
+// ====================================================================
+
+int tlb_valid[MAX_TLB], tlb_pid[MAX_TLB], tlb_vpage[MAX_TLB], tlb_frame[MAX_TLB];
+long tlb_stamp[MAX_TLB];    // Last use (LRU) or fill (FIFO)
+long tlb_clock = 0;
+int tlb_sets = 0;
+int tlb_last_pid = -1;
+unsigned int tlb_rng = 1;
+long tlb_flushes = 0, tlb_shootdowns = 0;
+
+void tlb_init() {
+    if (TLB_ENTRIES > MAX_TLB) TLB_ENTRIES = MAX_TLB;
+    if (TLB_WAYS <= 0 || TLB_WAYS > TLB_ENTRIES) TLB_WAYS = TLB_ENTRIES;
+    tlb_sets = TLB_ENTRIES / TLB_WAYS;
+    TLB_ENTRIES = tlb_sets * TLB_WAYS;
+    memset(tlb_valid, 0, sizeof(tlb_valid));
+    tlb_rng = SEED | 1;
+}
+
+// Returns the frame, or -1 on a miss (always -1 without a TLB)
+int tlb_lookup(int pid, int vpage) {
+    if (TLB_ENTRIES == 0) return -1;
+    int base = (vpage % tlb_sets) * TLB_WAYS;
+    for (int e = base; e < base + TLB_WAYS; e++) {
+        if (tlb_valid[e] && tlb_pid[e] == pid && tlb_vpage[e] == vpage) {
+            if (TLB_REPL == TLB_LRU) tlb_stamp[e] = ++tlb_clock;
+            processes[pid].tlb_hits++;
+            return tlb_frame[e];
+        }
+    }
+    processes[pid].tlb_misses++;
+    return -1;
+}
+
+void tlb_fill(int pid, int vpage, int frame) {
+    if (TLB_ENTRIES == 0) return;
+    int base = (vpage % tlb_sets) * TLB_WAYS;
+    int victim = -1;
+    for (int e = base; e < base + TLB_WAYS && victim < 0; e++) {
+        if (!tlb_valid[e]) victim = e;
+    }
+    if (victim < 0 && TLB_REPL == TLB_RANDOM) {
+        tlb_rng ^= tlb_rng << 13; tlb_rng ^= tlb_rng >> 17; tlb_rng ^= tlb_rng << 5;
+        victim = base + tlb_rng % TLB_WAYS;
+    } else if (victim < 0) {
+        victim = base; // Oldest stamp: least recently used (LRU) or first filled (FIFO)
+        for (int e = base + 1; e < base + TLB_WAYS; e++) if (tlb_stamp[e] < tlb_stamp[victim]) victim = e;
+    }
+    tlb_valid[victim] = 1;
+    tlb_pid[victim] = pid;
+    tlb_vpage[victim] = vpage;
+    tlb_frame[victim] = frame;
+    tlb_stamp[victim] = ++tlb_clock;
+}
+
+void tlb_invalidate(int pid, int vpage) {
+    if (TLB_ENTRIES == 0) return;
+    int base = (vpage % tlb_sets) * TLB_WAYS;
+    for (int e = base; e < base + TLB_WAYS; e++) {
+        if (tlb_valid[e] && tlb_pid[e] == pid && tlb_vpage[e] == vpage) {
+            tlb_valid[e] = 0;
+            tlb_shootdowns++;
+        }
+    }
+}
+
+void tlb_switch(int pid) {
+    if (TLB_ENTRIES == 0 || pid == tlb_last_pid) return;
+    if (!TLB_ASID && tlb_last_pid >= 0) {
+        memset(tlb_valid, 0, sizeof(tlb_valid));
+        tlb_flushes++;
+    }
+    tlb_last_pid = pid;
+}
+
+// Average translation + access time: a hit costs one memory access, a miss two
+double effective_access_ns(long hits, long misses) {
+    long refs = hits + misses;
+    if (refs == 0) return 0.0;
+    return TLB_NS + MEM_NS + (double)misses / refs * MEM_NS;
+}
+
+// ====================================================================
+// DEMAND PAGING (memory=demand)
+// Processes start with no frames. Each simulated second of CPU issues
+// REFS_PER_SEC references from the process's own reference string (a
+// drifting locality plus random jumps, independent of scheduling order).
+// A miss takes a free frame or evicts one picked by the replacement
+// policy over all frames (global replacement). Fault service stretches
+// the slice; when the active working sets exceed memory, load control
+// suspends the lowest-priority process until another one finishes.
+// ====================================================================
+
+int frame_page[MAX_PAGES];      // Virtual page held by each frame
+long frame_loaded[MAX_PAGES];   // Reference clock at load (FIFO)
+long frame_used[MAX_PAGES];     // Reference clock at last use (LRU)
+char frame_ref[MAX_PAGES];      // Reference bit (Clock)
+int clock_hand = 0;
+long ref_clock = 0;
+long total_refs = 0, total_faults = 0, evictions = 0;
+long thrash_events = 0, total_suspensions = 0;
+int stall_ms = 0;               // Fault service not yet turned into simulated seconds
+long stall_seconds = 0;
+
+// ARC: T1/T2 hold resident pages seen once / more than once, B1/B2 remember
+// pages recently evicted from each. A ghost hit moves the T1 target size p.
+// Lists are LRU first; a page is keyed as pid * MAX_PAGES + vpage.
+#define ARC_T1 0
+#define ARC_T2 1
+#define ARC_B1 2
+#define ARC_B2 3
+int arc_list[4][2 * MAX_PAGES];
+int arc_len[4];
+int arc_p = 0;
+int arc_drop_t1 = 0;            // T1 alone fills memory: evict its LRU page without a ghost
+
+int arc_find(int l, int key) {
+    for (int k = 0; k < arc_len[l]; k++) {
+        if (arc_list[l][k] == key) return k;
+    }
+    return -1;
+}
+
+int arc_take(int l, int k) {
+    int key = arc_list[l][k];
+    memmove(&arc_list[l][k], &arc_list[l][k + 1], (arc_len[l] - k - 1) * sizeof(int));
+    arc_len[l]--;
+    return key;
+}
+
+void arc_push(int l, int key) {
+    if (arc_len[l] == 2 * MAX_PAGES) arc_take(l, 0);
+    arc_list[l][arc_len[l]++] = key;
+}
+
+void arc_hit(int key) {
+    int k = arc_find(ARC_T1, key);
+    if (k >= 0) arc_take(ARC_T1, k);
+    else if ((k = arc_find(ARC_T2, key)) >= 0) arc_take(ARC_T2, k);
+    arc_push(ARC_T2, key);
+}
+
+// Adapts p on a miss; returns the ghost list the page was found in, or -1
+int arc_miss(int key) {
+    int c = TOTAL_FRAMES, k;
+    if ((k = arc_find(ARC_B1, key)) >= 0) {
+        int delta = arc_len[ARC_B2] / arc_len[ARC_B1];
+        arc_p += delta > 1 ? delta : 1;
+        if (arc_p > c) arc_p = c;
+        arc_take(ARC_B1, k);
+        return ARC_B1;
+    }
+    if ((k = arc_find(ARC_B2, key)) >= 0) {
+        int delta = arc_len[ARC_B1] / arc_len[ARC_B2];
+        arc_p -= delta > 1 ? delta : 1;
+        if (arc_p < 0) arc_p = 0;
+        arc_take(ARC_B2, k);
+        return ARC_B2;
+    }
+    int total = arc_len[ARC_T1] + arc_len[ARC_T2] + arc_len[ARC_B1] + arc_len[ARC_B2];
+    if (arc_len[ARC_T1] + arc_len[ARC_B1] >= c) {
+        if (arc_len[ARC_B1] > 0) arc_take(ARC_B1, 0);
+        else arc_drop_t1 = 1;
+    } else if (total >= 2 * c && arc_len[ARC_B2] > 0) {
+        arc_take(ARC_B2, 0);
+    }
+    return -1;
+}
+
+int arc_frame(int key) {
+    return processes[key / MAX_PAGES].page_table[key % MAX_PAGES] - 1;
+}
+
+int arc_victim(int ghost) {
+    int t1 = arc_len[ARC_T1];
+    int from_t1 = t1 > 0 && (arc_len[ARC_T2] == 0 || t1 > arc_p || (ghost == ARC_B2 && t1 == arc_p));
+    int key = arc_take(from_t1 ? ARC_T1 : ARC_T2, 0);
+    if (!(from_t1 && arc_drop_t1)) arc_push(from_t1 ? ARC_B1 : ARC_B2, key);
+    arc_drop_t1 = 0;
+    return arc_frame(key);
+}
+
+// Drops a page from the resident lists (and from the ghosts when its process is gone)
+void arc_forget(int key, int forget_history) {
+    int k;
+    if ((k = arc_find(ARC_T1, key)) >= 0) arc_take(ARC_T1, k);
+    if ((k = arc_find(ARC_T2, key)) >= 0) arc_take(ARC_T2, k);
+    if (!forget_history) return;
+    if ((k = arc_find(ARC_B1, key)) >= 0) arc_take(ARC_B1, k);
+    if ((k = arc_find(ARC_B2, key)) >= 0) arc_take(ARC_B2, k);
+}
+
+int pick_victim(int ghost) {
+    int victim = 0;
+    switch (REPLACEMENT) {
+        case REPL_FIFO:
+            for (int f = 1; f < TOTAL_FRAMES; f++) if (frame_loaded[f] < frame_loaded[victim]) victim = f;
+            return victim;
+        case REPL_CLOCK:
+            while (frame_ref[clock_hand]) {
+                frame_ref[clock_hand] = 0; // Second chance
+                clock_hand = (clock_hand + 1) % TOTAL_FRAMES;
+            }
+            victim = clock_hand;
+            clock_hand = (clock_hand + 1) % TOTAL_FRAMES;
+            return victim;
+        case REPL_ARC:
+            return arc_victim(ghost);
+        default:
+            for (int f = 1; f < TOTAL_FRAMES; f++) if (frame_used[f] < frame_used[victim]) victim = f;
+            return victim;
+    }
+}
+
+void demand_evict(int f) {
+    ProcessInfo *owner = &processes[memory_frames[f] - 1];
+    tlb_invalidate(memory_frames[f] - 1, frame_page[f]);
+    owner->page_table[frame_page[f]] = 0;
+    owner->mem_allocated--;
+    memory_frames[f] = 0;
+}
+
+// One reference; returns 1 if it faulted
+int page_access(int pid, int vpage) {
+    ProcessInfo *p = &processes[pid];
+    int key = pid * MAX_PAGES + vpage;
+    ref_clock++;
+    total_refs++;
+    p->last_ref[vpage] = ++p->refs;
+
+    int f = tlb_lookup(pid, vpage);
+    int tlb_miss = (f < 0);
+    if (tlb_miss) f = p->page_table[vpage] - 1; // Page-table walk
+    if (f >= 0) {
+        if (tlb_miss) tlb_fill(pid, vpage, f);
+        frame_used[f] = ref_clock;
+        frame_ref[f] = 1;
+        if (REPLACEMENT == REPL_ARC) arc_hit(key);
+        return 0;
+    }
+
+    p->faults++;
+    total_faults++;
+    int ghost = (REPLACEMENT == REPL_ARC) ? arc_miss(key) : -1;
+    for (f = 0; f < TOTAL_FRAMES && memory_frames[f] != 0; f++);
+    if (f == TOTAL_FRAMES) {
+        f = pick_victim(ghost);
+        demand_evict(f);
+        evictions++;
+    }
+    memory_frames[f] = p->id;
+    frame_page[f] = vpage;
+    frame_loaded[f] = frame_used[f] = ref_clock;
+    frame_ref[f] = 1;
+    p->page_table[vpage] = f + 1;
+    p->mem_allocated++;
+    tlb_fill(pid, vpage, f);
+    if (REPLACEMENT == REPL_ARC) arc_push(ghost >= 0 ? ARC_T2 : ARC_T1, key);
+    return 1;
+}
+
+void demand_release(int pid, int forget_history) {
+    for (int vpage = 0; vpage < processes[pid].vpages; vpage++) {
+        int f = processes[pid].page_table[vpage] - 1;
+        if (REPLACEMENT == REPL_ARC) arc_forget(pid * MAX_PAGES + vpage, forget_history);
+        if (f >= 0) demand_evict(f);
+    }
+}
+
+unsigned int ref_rand(int pid) {
+    unsigned int x = processes[pid].ref_state; // xorshift32
+    x ^= x << 13;
+    x ^= x >> 17;
+    x ^= x << 5;
+    return processes[pid].ref_state = x;
+}
+
+// 90% of references fall in a window of about a third of the address space
+int next_reference(int pid) {
+    ProcessInfo *p = &processes[pid];
+    unsigned int r = ref_rand(pid) % 100;
+    if (r < 2) p->locality = ref_rand(pid) % p->vpages; // Phase change
+    if (r >= 90) return ref_rand(pid) % p->vpages;
+    return (p->locality + ref_rand(pid) % (p->vpages / 3 + 1)) % p->vpages;
+}
+
+// Distinct pages touched in the last WS_WINDOW references
+int working_set(int pid) {
+    int ws = 0;
+    for (int vpage = 0; vpage < processes[pid].vpages; vpage++) {
+        int last = processes[pid].last_ref[vpage];
+        if (last > 0 && last > processes[pid].refs - WS_WINDOW) ws++;
+    }
+    return ws;
+}
+
+// Issues the references of 'seconds' of CPU; returns the whole seconds of fault service
+int run_references(int pid, int seconds) {
+    ProcessInfo *p = &processes[pid];
+    int faults = 0;
+    lock_mem_mutex(pid);
+    tlb_switch(pid);
+    for (int r = 0; r < seconds * REFS_PER_SEC; r++) faults += page_access(pid, next_reference(pid));
+    unlock_mem_mutex();
+
+    p->ws_last = working_set(pid);
+    p->ws_sum += p->ws_last;
+    p->ws_samples++;
+    if (p->ws_last > p->ws_max) p->ws_max = p->ws_last;
+
+    stall_ms += faults * FAULT_MS;
+    int stall = stall_ms / 1000;
+    stall_ms %= 1000;
+    stall_seconds += stall;
+    return stall;
+}
+
+int memory_ready(int i) {
+    return MEMORY_MODEL == MEM_DEMAND || processes[i].mem_allocated == processes[i].mem_needed;
+}
+
+// Load control: if the working sets of the started, active processes exceed
+// memory, swap out the lowest-priority one (largest remaining time on ties)
+void demand_load_control() {
+    int demand = 0, active = 0, victim = -1;
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        if (processes[i].state == FINISHED || processes[i].suspended || processes[i].refs == 0) continue;
+        if (processes[i].release_time > current_time) continue; // Parked until its next job: holds no frames
+        demand += processes[i].ws_last;
+        active++;
+        // The victim must be runnable, not already blocked on frames
+        if (POLICY == POLICY_CFS ? !cfs_queued[i] : processes[i].frames_wait) continue;
+        if (victim < 0 || processes[i].priority > processes[victim].priority ||
+            (processes[i].priority == processes[victim].priority && processes[i].remaining_time > processes[victim].remaining_time)) victim = i;
+    }
+    if (active < 2 || demand <= TOTAL_FRAMES || victim < 0) return;
+
+    thrash_events++;
+    total_suspensions++;
+    lock_mem_mutex(victim);
+    demand_release(victim, 0);
+    unlock_mem_mutex();
+    processes[victim].suspended = 1;
+    processes[victim].suspensions++;
+    if (POLICY == POLICY_CFS) cfs_block(victim); // Woken with the frame-blocked tasks when a process finishes
+    else processes[victim].frames_wait = 1;   // Skipped by the scans, parked by the run queues
+    strcpy(processes[victim].status, "Suspended (Thrashing)");
+}
+
+// ====================================================================
+// COLUMNAR EXPORT (export=1)
+// Alongside output.json, per-process results are streamed into results/:
+// one NumPy .npy file per column (little-endian int64, row = process index),
+// results.csv with a row per process in completion order, and the execution
+// timeline as an int32 .npy that grows with every slice. Each file is valid
+// while the run is still going: columns are sized for NUM_PROCESSES up front
+// and filled in as processes finish, and the timeline's length is patched in
+// its fixed-size header after every append. result_columns.py memory-maps them.
+// ====================================================================
+
+#define NPY_HEADER_BYTES 128 // Fixed header size, so a length can be rewritten in place
+int EXPORT = 0;
+
+#define EXPORT_COLUMNS 21
+const char *EXPORT_NAMES[EXPORT_COLUMNS] = {"id", "prio", "burst", "memNeeded", "memUnits", "maxMem", "arrival", "start", "completion",
+                                            "turnaroundTime", "waitingTime", "starvation", "vruntime", "level", "deadline", "jobs", "misses", "admitted",
+                                            "switches", "preemptions", "switchMs"};
+
+void export_values(int i, LONGLONG *v) {
+    ProcessInfo *p = &processes[i];
+    LONGLONG row[EXPORT_COLUMNS] = {p->id, p->priority, p->burst_time, p->mem_needed, p->mem_units, p->max_mem, p->arrival_time, p->start_time,
+                                    p->completion_time, p->turnaround_time, p->waiting_time, p->starvation_events, p->vruntime,
+                                    p->level, p->rel_deadline, p->jobs_total, p->deadline_misses, p->admitted,
+                                    p->switches, p->preemptions, p->switch_ms};
+    memcpy(v, row, sizeof(row));
+}
+
+FILE *export_cols[EXPORT_COLUMNS];
+FILE *export_csv = NULL;
+FILE *export_tl = NULL;
+long export_tl_len = 0;
+char *exported = NULL;      // Rows already written
+
+void npy_header(FILE *f, const char *descr, long count) {
+    static const unsigned char preamble[10] = {0x93, 'N', 'U', 'M', 'P', 'Y', 1, 0,
+                                               (NPY_HEADER_BYTES - 10) & 0xFF, (NPY_HEADER_BYTES - 10) >> 8};
+    char dict[NPY_HEADER_BYTES - 10];
+    int len = snprintf(dict, sizeof(dict), "{'descr': '%s', 'fortran_order': False, 'shape': (%ld,), }", descr, count);
+    memset(dict + len, ' ', sizeof(dict) - len - 1);
+    dict[sizeof(dict) - 1] = '\n';
+    fseek(f, 0, SEEK_SET);
+    fwrite(preamble, 1, sizeof(preamble), f);
+    fwrite(dict, 1, sizeof(dict), f);
+}
+
+void export_open() {
+    if (!EXPORT) return;
+    CreateDirectoryA("results", NULL); // Fails harmlessly if it already exists
+    exported = (char *)calloc(NUM_PROCESSES, 1);
+    char path[64];
+    LONGLONG zero = 0;
+    for (int c = 0; c < EXPORT_COLUMNS; c++) {
+        snprintf(path, sizeof(path), "results/%s.npy", EXPORT_NAMES[c]);
+        export_cols[c] = fopen(path, "wb+");
+        if (!export_cols[c]) continue;
+        npy_header(export_cols[c], "<i8", NUM_PROCESSES);
+        for (int i = 0; i < NUM_PROCESSES; i++) fwrite(&zero, sizeof(zero), 1, export_cols[c]);
+        fflush(export_cols[c]);
+    }
+    export_csv = fopen("results/results.csv", "w");
+    if (export_csv) {
+        for (int c = 0; c < EXPORT_COLUMNS; c++) fprintf(export_csv, "%s,", EXPORT_NAMES[c]);
+        fprintf(export_csv, "status\n");
+        fflush(export_csv);
+    }
+    export_tl = fopen("results/timeline.npy", "wb+");
+    if (export_tl) npy_header(export_tl, "<i4", 0);
+}
+
+// Writes process i's final values into every column and appends its CSV row
+void export_row(int i) {
+    if (!EXPORT || exported == NULL || exported[i]) return;
+    LONGLONG v[EXPORT_COLUMNS];
+    export_values(i, v);
+    for (int c = 0; c < EXPORT_COLUMNS; c++) {
+        if (!export_cols[c]) continue;
+        fseek(export_cols[c], NPY_HEADER_BYTES + (long)i * (long)sizeof(LONGLONG), SEEK_SET);
+        fwrite(&v[c], sizeof(LONGLONG), 1, export_cols[c]);
+        fflush(export_cols[c]);
+    }
+    if (export_csv) {
+        for (int c = 0; c < EXPORT_COLUMNS; c++) fprintf(export_csv, "%lld,", (long long)v[c]);
+        fprintf(export_csv, "\"%s\"\n", processes[i].status);
+        fflush(export_csv);
+    }
+    exported[i] = 1;
+}
+
+void export_timeline(int pid) {
+    if (!export_tl) return;
+    int v = pid;
+    fseek(export_tl, 0, SEEK_END);
+    fwrite(&v, sizeof(v), 1, export_tl);
+    npy_header(export_tl, "<i4", ++export_tl_len);
+    fflush(export_tl);
+}
+
+// Rows for processes that never finished, then the run-level fields the columns lack
+void export_close() {
+    if (!EXPORT) return;
+    for (int i = 0; i < NUM_PROCESSES; i++) export_row(i);
+    for (int c = 0; c < EXPORT_COLUMNS; c++) if (export_cols[c]) fclose(export_cols[c]);
+    if (export_csv) fclose(export_csv);
+    if (export_tl) fclose(export_tl);
+    FILE *fp = fopen("results/meta.json", "w");
+    if (fp) {
+        fprintf(fp, "{\"numProcesses\": %d, \"totalTime\": %d, \"totalBurstTime\": %d, \"algorithm\": \"%s\", \"seed\": %u, \"timelineLength\": %ld, \"columns\": [",
+                NUM_PROCESSES, current_time, time_total_burst, ALGORITHM, SEED, export_tl_len);
+        for (int c = 0; c < EXPORT_COLUMNS; c++) fprintf(fp, "\"%s\"%s", EXPORT_NAMES[c], c < EXPORT_COLUMNS - 1 ? ", " : "");
+        fprintf(fp, "]}\n");
+        fclose(fp);
+    }
+    free(exported);
+}
+
+// ====================================================================
+// SCHEDULER (Priority Preemptive + RR/FCFS or CFS, table scan, or run queues)
+// ====================================================================
+
+int completed = 0;      // Finished (or rejected) processes; the scheduler runs until all are
+
+// Bookkeeping shared by every policy when a process's last job completes
+void finish_process(int i) {
+    mark_finished(i);
+    updateStatus(i, 0);
+    processes[i].completion_time = current_time;
+    processes[i].turnaround_time = processes[i].completion_time - processes[i].arrival_time;
+    completed++;
+    export_row(i);
+
+    release_memory(i);
+    release_cpu(i);
+    wake_memory_waiters(); // Freed frames may satisfy blocked processes
+}
+
+// A periodic task's job is done; the next one waits for its release
+void finish_job(int i) {
+    processes[i].state = WAITING;
+    updateStatus(i, 0);
+    release_memory(i);
+    release_cpu(i);
+    wake_memory_waiters();
+    park_until_release(i);
+}
+
+// Demand paging: the slice is stretched by the time spent servicing its page faults
+void page_fault_stall(int i, int exec_time) {
+    if (MEMORY_MODEL != MEM_DEMAND) return;
+    int stall = run_references(i, exec_time);
+    if (stall > 0) {
+        strcpy(processes[i].status, "Waiting (Page Fault)");
+        logSnapshot();
+        sim_sleep(stall * 1000);
+        current_time += stall;
+    }
+}
+
+// ====================================================================
+// CONTEXT SWITCHES
+// A dispatch that changes the running process is a context switch. It
+// costs SWITCH_MS, plus a cache refill for the incoming process: its
+// working set is evicted a share at a time by the slices other processes
+// ran since it last held the CPU, so it pays CACHE_MS / CACHE_PROCS per
+// slice, at most CACHE_MS (and all of it on its first dispatch). The
+// outgoing process was preempted if it still had work left. Costs add up
+// in milliseconds and reach current_time a whole second at a time, like
+// compaction copies, so short quanta pay for their extra switches in
+// waiting time and throughput.
+// ====================================================================
+
+int cpu_last_pid = -1;          // Process that last held the CPU
+long switch_seq = 0;            // Context switches so far (the cache-warmth clock)
+long switch_preemptions = 0;
+long switch_direct_ms = 0, switch_cache_ms = 0;
+long switch_debt_ms = 0;        // Overhead not yet charged to current_time
+long switch_seconds = 0;
+
+void context_switch(int i) {
+    int out = cpu_last_pid;
+    if (i == out) return;
+    cpu_last_pid = i;
+    if (out < 0) {
+        processes[i].last_switch = switch_seq; // First dispatch of the run: nothing to save
+        return;
+    }
+
+    switch_seq++;
+    processes[i].switches++;
+    if (processes[out].state != FINISHED && processes[out].remaining_time > 0 && processes[out].release_time <= current_time) {
+        processes[out].preemptions++;
+        switch_preemptions++;
+    }
+    long others = switch_seq - processes[i].last_switch - 1;
+    if (processes[i].last_switch < 0 || others > CACHE_PROCS) others = CACHE_PROCS;
+    processes[i].last_switch = switch_seq;
+
+    int refill = (int)(CACHE_MS * others / CACHE_PROCS);
+    int cost = SWITCH_MS + refill;
+    switch_direct_ms += SWITCH_MS;
+    switch_cache_ms += refill;
+    processes[i].switch_ms += cost;
+    if (cost == 0) return;
+
+    sim_sleep(cost);
+    switch_debt_ms += cost;
+    int seconds = switch_debt_ms / 1000;
+    switch_debt_ms %= 1000;
+    switch_seconds += seconds;
+    current_time += seconds;
+}
+
+int priority_step();
+int scan_step();
+int queue_step();
+
+// One scheduling decision of the selected module; returns 0 once every process has finished
+int scheduler_step() {
+    if (completed >= NUM_PROCESSES) return 0;
+    admit_arrivals();
+
+    if (MEMORY_MODEL == MEM_CONTIGUOUS && COMPACTION && (compacting || compact_pending || hole_count > 1)) {
+        int copy_time = compact_tick();
+        if (copy_time > 0 || compacting) {
+            // Relocation copies occupy the machine; waiting processes may now fit
+            sim_sleep(copy_time * 1000);
+            current_time += copy_time;
+            wake_memory_waiters();
+            logSnapshot();
+        }
+    }
+    if (POLICY == POLICY_SCAN) return scan_step();
+    if (POLICY >= POLICY_MLFQ) return queue_step();
+    return priority_step();
+}
+
+// Priority Preemptive + RR/FCFS, or CFS: one dispatch per call
+int priority_step() {
+    int is_rr = (strcmp(ALGORITHM, "RR") == 0);
+    int is_cfs = (POLICY == POLICY_CFS);
+    int quantum_s = QUANTUM_SECONDS;
+    
+    int did_something = 0;
+    int next_pid_to_run = -1;
+
+    int highest_prio = MAX_PRIORITY + 1;
+    int best_base_prio = MAX_PRIORITY + 1;
+
+    // 1. SELECTION: leftmost vruntime (CFS) or highest effective priority (linear scan)
+    if (is_cfs) next_pid_to_run = cfs_pick_next();
+    else for (int i = 0; i < NUM_PROCESSES; i++) {
+        if (processes[i].state != FINISHED && processes[i].remaining_time > 0 && !processes[i].frames_wait &&
+            processes[i].release_time <= current_time) {
+            int prio = effective_priority(i);
+            if (processes[i].priority < best_base_prio) best_base_prio = processes[i].priority;
+            if (prio < highest_prio) {
+                highest_prio = prio;
+                next_pid_to_run = i; 
+            } else if (prio == highest_prio) {
+                // Tie-breaker: FCFS by arrival time (default 0)
+                if (next_pid_to_run == -1 || processes[i].arrival_time < processes[next_pid_to_run].arrival_time) {
+                     next_pid_to_run = i;
+                }
+            }
+        }
+    }
+    
+    if (next_pid_to_run == -1) {
+        if (wake_memory_waiters()) return 1; // Only frame-blocked processes left: let them retry
+        int next = next_arrival_time();
+        if (next > current_time) current_time = next; // CPU idles until the next arrival
+        else if (completed < NUM_PROCESSES) sim_sleep(100); 
+        return 1;
+    }
+    int aged_pick = !is_cfs && processes[next_pid_to_run].priority > best_base_prio;
+
+    int i = next_pid_to_run;
+
+    // 2. Memory Pre-check (demand paging faults pages in while running instead)
+    if (!memory_ready(i)) {
+        if (!acquire_memory(i)) {
+            // Denied by Banker or No Frames, process must wait
+            processes[i].state = WAITING;
+            processes[i].idle_cycles++;
+            if (is_cfs) cfs_block(i); // Let the next-smallest vruntime try
+            else processes[i].frames_wait = 1; // Let the next-highest priority try
+            updateStatus(i, 0);
+            maybe_detect_deadlock();
+            did_something = 1;
+            logSnapshot();
+            return 1; 
+        }
+    } else {
+        processes[i].idle_cycles = 0; 
+    }
+
+    // 3. CPU Acquisition (Only the highest priority process attempts CPU)
+    if (memory_ready(i) && acquire_cpu(i)) {
+        
+        did_something = 1;
+        processes[i].state = RUNNING;
+        updateStatus(i, 1); 
+        context_switch(i);
+        if (processes[i].start_time == -1) processes[i].start_time = current_time;
+        if (aged_pick) aged_dispatches++;
+        
+        logEvent();
+        
+        int execTime;
+        if (is_cfs) {
+             int slice = cfs_slice(i);
+             execTime = (processes[i].remaining_time > slice) ? slice : processes[i].remaining_time;
+             cfs_dequeue(i); // Re-inserted with its new vruntime after the slice
+        } else if (is_rr) {
+             execTime = (processes[i].remaining_time > quantum_s) ? quantum_s : processes[i].remaining_time;
+        } else {
+             // FCFS: run for 1 second per step for logging/visualization.
+             execTime = (processes[i].remaining_time > 0) ? 1 : 0; 
+        }
+        
+        sim_sleep(execTime * 1000); 
+
+        current_time += execTime;
+        processes[i].remaining_time -= execTime;
+        if (is_cfs) cfs_account(i, execTime);
+        if (timeCount < MAX_TIMELINE_SIZE) {
+            timeline[timeCount++] = processes[i].id;
+        }
+        export_timeline(processes[i].id);
+        page_fault_stall(i, execTime);
+        
+        int job_done = (processes[i].remaining_time <= 0);
+        if (job_done && complete_job(i)) {
+            // 3a. Process finished
+            finish_process(i);
+        } else if (job_done) {
+            // 3c. Periodic task: park until the next job is released
+            finish_job(i);
+        } else {
+            // 3b. Preemption/Step end (Always preempt after burst/quantum to check for higher prio)
+            processes[i].state = WAITING;
+            updateStatus(i, 0);
+            release_cpu(i); 
+            if (is_cfs) cfs_enqueue(i);
+        }
+        if (MEMORY_MODEL == MEM_DEMAND) demand_load_control();
+        if (is_cfs) cfs_update_min_vruntime();
+        
+        logEvent();
+    } else if (memory_ready(i)) {
+        // Memory acquired, but CPU busy
+        processes[i].state = WAITING;
+        processes[i].idle_cycles++;
+        updateStatus(i, 0);
+        did_something = 1;
+        logSnapshot();
+    } else {
+        // Memory not acquired (Banker/No Frames), waiting is handled in 2.
+        processes[i].idle_cycles++;
+        did_something = 1; 
+        if (processes[i].idle_cycles > STARVATION_THRESHOLD && strcmp(processes[i].status, "STARVATION DANGER") != 0) {
+             updateStatus(i, 0);
+             logSnapshot();
+        }
+    }
+
+    if (completed < NUM_PROCESSES && !did_something) sim_sleep(100); 
+    return 1;
+}
+
+// Table scan (dispatch=scan): one pass over every released process, in slot order
+int scan_step() {
+    int is_rr = (strcmp(ALGORITHM, "RR") == 0);
+    int quantum_s = QUANTUM_SECONDS;
+    
+    int did_something = 0;
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        if (processes[i].state != FINISHED && processes[i].release_time <= current_time && !processes[i].frames_wait) {
+            
+            // 1. Memory Pre-check
+            if (!memory_ready(i)) {
+                if (!acquire_memory(i)) {
+                    processes[i].state = WAITING;
+                    processes[i].idle_cycles++;
+                    updateStatus(i, 0);
+                    maybe_detect_deadlock();
+                    did_something = 1;
+                    logSnapshot();
+                    continue; 
+                }
+            } else {
+                processes[i].idle_cycles = 0; 
+            }
+
+            // 2. CPU Acquisition
+            if (memory_ready(i) && acquire_cpu(i)) {
+                
+                did_something = 1;
+                processes[i].state = RUNNING;
+                updateStatus(i, 1); 
+                context_switch(i);
+                if (processes[i].start_time == -1) processes[i].start_time = current_time;
+                
+                logEvent();
+                
+                int execTime;
+                if (is_rr) {
+                     execTime = (processes[i].remaining_time > quantum_s) ? quantum_s : processes[i].remaining_time;
+                } else {
+                     // FCFS: run for 1 second per step for logging/visualization.
+                     execTime = (processes[i].remaining_time > 0) ? 1 : 0; 
+                }
+                
+                sim_sleep(execTime * 1000); 
+
+                current_time += execTime;
+                processes[i].remaining_time -= execTime;
+                if (timeCount < MAX_TIMELINE_SIZE) {
+                    timeline[timeCount++] = processes[i].id;
+                }
+                export_timeline(processes[i].id);
+                page_fault_stall(i, execTime);
+                
+                int job_done = (processes[i].remaining_time <= 0);
+                if (job_done && complete_job(i)) {
+                    // 3a. Process finished
+                    finish_process(i);
+                } else if (job_done) {
+                    // 3c. Periodic task: this job is done, the next one waits for its release
+                    finish_job(i);
+                } else {
+                    // 3b. Preemption/Step end
+                    processes[i].state = WAITING;
+                    updateStatus(i, 0);
+                    release_cpu(i); 
+                }
+                if (MEMORY_MODEL == MEM_DEMAND) demand_load_control();
+                
+                logEvent();
+            } else if (memory_ready(i)) {
+                // Memory acquired, but CPU busy
+                processes[i].state = WAITING;
+                processes[i].idle_cycles++;
+                updateStatus(i, 0);
+                did_something = 1;
+                logSnapshot();
+            } else {
+                processes[i].idle_cycles++;
+                did_something = 1; 
+                if (processes[i].idle_cycles > STARVATION_THRESHOLD && strcmp(processes[i].status, "STARVATION DANGER") != 0) {
+                    updateStatus(i, 0);
+                    logSnapshot();
+                }
+            }
+        }
+    }
+    if (completed < NUM_PROCESSES && !did_something) {
+        if (wake_memory_waiters()) return 1; // Only suspended processes left: let them retry
+        int next = next_arrival_time();
+        if (next > current_time) current_time = next; // CPU idles until the next arrival
+        else sim_sleep(100);
+    }
+    return 1;
+}
+
+// Run-queue policies (MLFQ, SJF, SRTF, EDF): the queue decides who runs next and for how long.
+// One dispatch per call
+int queue_step() {
+    rq_tick();
+    int i = rq_pop();
+    if (i < 0) {
+        // Everyone left is waiting on memory that nobody holds: retry them
+        int next = next_arrival_time();
+        if (mem_blocked_count > 0) wake_memory_waiters();
+        else if (next > current_time) current_time = next; // CPU idles until the next release
+        else sim_sleep(100);
+        return 1;
+    }
+    if (processes[i].frames_wait) {
+        // Suspended by load control: waits with the memory-blocked processes
+        mem_blocked[mem_blocked_count++] = i;
+        return 1;
+    }
+
+    // 1. Memory Pre-check (demand paging faults pages in while running instead)
+    if (!memory_ready(i)) {
+        if (!acquire_memory(i)) {
+            processes[i].state = WAITING;
+            processes[i].idle_cycles++;
+            updateStatus(i, 0);
+            mem_blocked[mem_blocked_count++] = i;
+            maybe_detect_deadlock();
+            logSnapshot();
+            return 1;
+        }
+    } else {
+        processes[i].idle_cycles = 0;
+    }
+
+    // 2. CPU Acquisition
+    if (!acquire_cpu(i)) {
+        processes[i].state = WAITING;
+        processes[i].idle_cycles++;
+        updateStatus(i, 0);
+        rq_push(i);
+        logSnapshot();
+        return 1;
+    }
+
+    processes[i].state = RUNNING;
+    updateStatus(i, 1);
+    context_switch(i);
+    if (processes[i].start_time == -1) processes[i].start_time = current_time;
+    logEvent();
+
+    int slice = rq_slice(i);
+    int execTime = (processes[i].remaining_time > slice) ? slice : processes[i].remaining_time;
+
+    sim_sleep(execTime * 1000);
+
+    current_time += execTime;
+    processes[i].remaining_time -= execTime;
+    rq_observe(i, execTime);
+    if (timeCount < MAX_TIMELINE_SIZE) {
+        timeline[timeCount++] = processes[i].id;
+    }
+    export_timeline(processes[i].id);
+    page_fault_stall(i, execTime);
+
+    int job_done = (processes[i].remaining_time <= 0);
+    if (job_done && complete_job(i)) {
+        // 3a. Process finished
+        finish_process(i);
+    } else if (job_done) {
+        // 3c. Periodic task: park until the next job is released
+        finish_job(i);
+    } else {
+        // 3b. Slice used up: back to the run queue
+        processes[i].state = WAITING;
+        updateStatus(i, 0);
+        release_cpu(i);
+        rq_requeue(i, execTime);
+    }
+    if (MEMORY_MODEL == MEM_DEMAND) demand_load_control();
+
+    logEvent();
+    return 1;
+}
+
+void scheduler() {
+    while (scheduler_step());
+}
+
+// ====================================================================
+// FINAL OUTPUT
+// ====================================================================
+
+// Where a JSON writer goes: a file (output.json), or a growing buffer when fp is NULL (sim_sections)
+typedef struct {
+    FILE *fp;
+    char *buf;
+    size_t len, cap;
+    int failed;             // The buffer could not grow; its text is cut short
+} JsonOut;
+
+void out_printf(JsonOut *out, const char *fmt, ...) {
+    va_list ap;
+    va_start(ap, fmt);
+    if (out->fp) {
+        vfprintf(out->fp, fmt, ap);
+        va_end(ap);
+        return;
+    }
+    va_list again;
+    va_copy(again, ap);
+    int n = vsnprintf(NULL, 0, fmt, ap);
+    va_end(ap);
+    if (n > 0 && !out->failed && out->len + n + 1 > out->cap) {
+        size_t cap = out->cap ? out->cap : 1024;
+        while (out->len + n + 1 > cap) cap *= 2;
+        char *grown = (char *)realloc(out->buf, cap);
+        if (grown) {
+            out->buf = grown;
+            out->cap = cap;
+        } else out->failed = 1;
+    }
+    if (n > 0 && !out->failed) {
+        vsnprintf(out->buf + out->len, n + 1, fmt, again);
+        out->len += n;
+    }
+    va_end(again);
+}
+
+// Run-level blocks of output.json, from "dispatch" to "deadlines", one per line ending in ","
+void write_run_sections(JsonOut *out) {
+    if (POLICY == POLICY_SCAN) out_printf(out, "  \"dispatch\": \"scan\",\n");
+    const char *snapshot_names[] = {"all", "change", "ticks", "events"};
+    out_printf(out, "  \"snapshots\": {\"policy\": \"%s\", \"every\": %d, \"taken\": %ld, \"logged\": %ld},\n",
+            snapshot_names[SNAPSHOT_POLICY], SNAPSHOT_EVERY, snapshots_taken, snapshots_logged);
+    out_printf(out, "  \"contextSwitch\": {\"quantum\": %d, \"switchMs\": %d, \"cacheMs\": %d, \"cacheProcs\": %d, \"switches\": %ld, \"preemptions\": %ld, "
+                "\"directMs\": %ld, \"cacheRefillMs\": %ld, \"seconds\": %ld},\n",
+            QUANTUM_SECONDS, SWITCH_MS, CACHE_MS, CACHE_PROCS, switch_seq, switch_preemptions,
+            switch_direct_ms, switch_cache_ms, switch_seconds);
+    if (SJF_ALPHA > 0) out_printf(out, "  \"burstPrediction\": {\"alpha\": %.3f, \"tau0\": %.3f},\n", SJF_ALPHA, SJF_TAU0);
+    out_printf(out, "  \"memory\": {\"model\": \"%s\", \"units\": %lld, \"pageSize\": %d, \"requested\": %lld, \"pagingHeld\": %lld, \"buddyHeld\": %lld",
+            MEMORY_MODEL == MEM_BUDDY ? "buddy" : MEMORY_MODEL == MEM_CONTIGUOUS ? "contiguous" : MEMORY_MODEL == MEM_DEMAND ? "demand" :
+            MEMORY_MODEL == MEM_SEMAPHORE ? "semaphore" : "paging",
+            (long long)TOTAL_FRAMES * PAGE_SIZE, PAGE_SIZE,
+            frag_requested, frag_paging_held, frag_buddy_held);
+    if (MEMORY_MODEL == MEM_BUDDY) {
+        out_printf(out, ", \"buddy\": {\"minBlock\": %d, \"maxOrder\": %d, \"allocs\": %ld, \"failures\": %ld, \"fragFailures\": %ld, \"splits\": %ld, \"merges\": %ld}",
+                BUDDY_MIN, buddy_top_order, buddy_allocs, buddy_failures, buddy_frag_failures, buddy_splits, buddy_merges);
+    }
+    if (MEMORY_MODEL == MEM_CONTIGUOUS) {
+        const char *fit_names[] = {"best", "worst", "next"};
+        long attempts = part_allocs + part_failures;
+        out_printf(out, ", \"contiguous\": {\"fit\": \"%s\", \"allocs\": %ld, \"failures\": %ld, \"fragFailures\": %ld, \"avgProbes\": %.2f, \"avgAllocNs\": %.1f, "
+                    "\"externalFragmentation\": {\"avg\": %.4f, \"max\": %.4f, \"final\": %.4f}, \"holes\": %d",
+                fit_names[FIT_POLICY], part_allocs, part_failures, part_frag_failures,
+                attempts ? (double)part_probes / attempts : 0.0, attempts ? (double)part_alloc_ns / attempts : 0.0,
+                ext_frag_samples ? ext_frag_sum / ext_frag_samples : 0.0, ext_frag_max, external_fragmentation(), hole_count);
+        if (COMPACTION) {
+            out_printf(out, ", \"compaction\": {\"threshold\": %d, \"step\": %d, \"copyMs\": %d, \"runs\": %ld, \"steps\": %ld, \"moves\": %ld, "
+                        "\"frames\": %ld, \"seconds\": %ld, \"failuresAvoided\": %ld}",
+                    COMPACT_THRESHOLD, COMPACT_STEP, COPY_MS, compact_runs, compact_steps, compact_moves,
+                    compact_frames, compact_seconds, failures_avoided);
+        }
+        out_printf(out, "}");
+    }
+    if (MEMORY_MODEL == MEM_DEMAND) {
+        const char *repl_names[] = {"fifo", "lru", "clock", "arc"};
+        out_printf(out, ", \"demand\": {\"policy\": \"%s\", \"vpages\": %d, \"refsPerSec\": %d, \"faultMs\": %d, \"wsWindow\": %d, "
+                    "\"refs\": %ld, \"faults\": %ld, \"faultRate\": %.4f, \"evictions\": %ld, \"stallSeconds\": %ld, \"thrashEvents\": %ld, \"suspensions\": %ld}",
+                repl_names[REPLACEMENT], VPAGES, REFS_PER_SEC, FAULT_MS, WS_WINDOW, total_refs, total_faults,
+                total_refs ? (double)total_faults / total_refs : 0.0, evictions, stall_seconds, thrash_events, total_suspensions);
+    }
+    out_printf(out, "},\n");
+    if (MEMORY_MODEL == MEM_DEMAND && TLB_ENTRIES > 0) {
+        const char *tlb_repl_names[] = {"lru", "fifo", "random"};
+        long hits = 0, misses = 0;
+        for (int i = 0; i < NUM_PROCESSES; i++) {
+            hits += processes[i].tlb_hits;
+            misses += processes[i].tlb_misses;
+        }
+        out_printf(out, "  \"tlb\": {\"entries\": %d, \"ways\": %d, \"replacement\": \"%s\", \"asid\": %s, \"tlbNs\": %d, \"memNs\": %d, "
+                    "\"hits\": %ld, \"misses\": %ld, \"hitRatio\": %.4f, \"flushes\": %ld, \"shootdowns\": %ld, \"eatNs\": %.2f},\n",
+                TLB_ENTRIES, TLB_WAYS, tlb_repl_names[TLB_REPL], TLB_ASID ? "true" : "false", TLB_NS, MEM_NS,
+                hits, misses, (hits + misses) ? (double)hits / (hits + misses) : 0.0, tlb_flushes, tlb_shootdowns,
+                effective_access_ns(hits, misses));
+    }
+    out_printf(out, "  \"deadlock\": {\"mode\": \"%s\", \"safetyChecks\": %ld, \"safetyCacheHits\": %ld, \"safetyNs\": %lld",
+            DEADLOCK_MODE == DL_DETECT ? "detect" : "avoid", safety_checks, safety_cache_hits, (long long)safety_ns);
+    if (DEADLOCK_MODE == DL_DETECT) {
+        out_printf(out, ", \"interval\": %d, \"detections\": %ld, \"skipped\": %ld, \"detectNs\": %lld, \"deadlocks\": %ld, \"victims\": %ld",
+                DETECT_INTERVAL, detect_runs, detect_skipped, (long long)detect_ns, deadlocks_found, deadlock_victims);
+    }
+    out_printf(out, "},\n");
+    if (AGING != AGING_NONE) {
+        const char *aging_names[] = {"none", "linear", "exp", "capped"};
+        out_printf(out, "  \"aging\": {\"policy\": \"%s\", \"interval\": %d, \"cap\": %d, \"agedDispatches\": %ld},\n",
+                aging_names[AGING], AGING_INTERVAL, AGING_CAP, aged_dispatches);
+    }
+    if (POLICY == POLICY_MLFQ) {
+        out_printf(out, "  \"mlfq\": {\"levels\": %d, \"boostPeriod\": %d, \"boosts\": %ld, \"demotions\": %ld, \"quanta\": [", MLFQ_LEVELS, MLFQ_BOOST_PERIOD, mlfq_boosts, mlfq_demotions);
+        for (int l = 0; l < MLFQ_LEVELS; l++) out_printf(out, "%d%s", MLFQ_QUANTA[l], l < MLFQ_LEVELS - 1 ? "," : "");
+        out_printf(out, "], \"dispatches\": [");
+        for (int l = 0; l < MLFQ_LEVELS; l++) out_printf(out, "%ld%s", mlfq_dispatches[l], l < MLFQ_LEVELS - 1 ? "," : "");
+        out_printf(out, "]},\n");
+    }
+    if (DEADLINE_SLACK > 0) {
+        int misses = 0;
+        for (int k = 0; k < lateness_count; k++) if (lateness[k] > 0) misses++;
+        out_printf(out, "  \"deadlines\": {\"slack\": %d, \"utilization\": %.4f, \"admittedUtilization\": %.4f, \"bound\": %.4f, \"schedulable\": %s, \"admission\": %s, \"rejected\": %d, \"jobs\": %d, \"misses\": %d, \"lateness\": [",
+                DEADLINE_SLACK, rt_utilization, rt_admitted_util, RT_BOUND, rt_utilization <= RT_BOUND + 1e-9 ? "true" : "false",
+                (POLICY == POLICY_EDF && RT_ADMIT) ? "true" : "false", rt_rejected, lateness_count, misses);
+        for (int k = 0; k < lateness_count; k++) out_printf(out, "%d%s", lateness[k], k < lateness_count - 1 ? "," : "");
+        out_printf(out, "]},\n");
+    }
+}
+
+void writeLogsToJSON() {
+    FILE *fp = fopen("output.json", "w");
+    if (!fp) return;
+    
+    int final_mem_available = free_frame_count(); 
+    JsonOut out = {fp, NULL, 0, 0, 0};
+
+    fprintf(fp, "{\n");
+    fprintf(fp, "  \"numProcesses\": %d,\n", NUM_PROCESSES);
+    fprintf(fp, "  \"totalTime\": %d,\n", current_time);
+    fprintf(fp, "  \"totalBurstTime\": %d,\n", time_total_burst);
+    fprintf(fp, "  \"algorithm\": \"%s\",\n", ALGORITHM);
+    fprintf(fp, "  \"seed\": %u,\n", SEED);
+    write_run_sections(&out);
+    
+    fprintf(fp, "  \"timeline\": [");
+    for (int i = 0; i < timeCount; i++) {
+        fprintf(fp, "\"P%d\"", timeline[i]);
+        if (i < timeCount - 1) fprintf(fp, ", ");
+    }
+    fprintf(fp, "],\n  \"processes\": [\n");
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        fprintf(fp, "    { \"id\": %d, \"prio\": %d, \"burst\": %d, \"memNeeded\": %d, \"memUnits\": %d, \"maxMem\": %d, \"arrival\": %d, \"start\": %d, \"completion\": %d, \"turnaroundTime\": %d, \"waitingTime\": %d, \"starvation\": %d, \"vruntime\": %lld, \"level\": %d, \"deadline\": %d, \"jobs\": %d, \"misses\": %d, \"admitted\": %d, \"switches\": %d, \"preemptions\": %d, \"switchMs\": %ld, \"status\": \"%s\", \"waitHist\": ",
+                processes[i].id, processes[i].priority, processes[i].burst_time, processes[i].mem_needed, processes[i].mem_units, processes[i].max_mem, processes[i].arrival_time, processes[i].start_time,
+                processes[i].completion_time, processes[i].turnaround_time, processes[i].waiting_time, processes[i].starvation_events, processes[i].vruntime,
+                processes[i].level, processes[i].rel_deadline, processes[i].jobs_total, processes[i].deadline_misses, processes[i].admitted,
+                processes[i].switches, processes[i].preemptions, processes[i].switch_ms, processes[i].status);
+        logWaitHist(fp, i);
+        if (MEMORY_MODEL == MEM_DEMAND) {
+            fprintf(fp, ", \"paging\": {\"vpages\": %d, \"refs\": %ld, \"faults\": %ld, \"wsAvg\": %.2f, \"wsMax\": %d, \"suspensions\": %d",
+                    processes[i].vpages, processes[i].refs, processes[i].faults,
+                    processes[i].ws_samples ? (double)processes[i].ws_sum / processes[i].ws_samples : 0.0, processes[i].ws_max, processes[i].suspensions);
+            if (TLB_ENTRIES > 0) {
+                fprintf(fp, ", \"tlbHits\": %ld, \"tlbMisses\": %ld, \"eatNs\": %.2f",
+                        processes[i].tlb_hits, processes[i].tlb_misses, effective_access_ns(processes[i].tlb_hits, processes[i].tlb_misses));
+            }
+            fprintf(fp, "}");
+        }
+        fprintf(fp, " }");
+        if (i < NUM_PROCESSES - 1) fprintf(fp, ",\n"); else fprintf(fp, "\n");
+    }
+    fprintf(fp, "  ],\n  \"sync\": {");
+    logSemStats(fp, &cpu_stats);
+    fprintf(fp, ", ");
+    logSemStats(fp, &mutex_stats);
+    fprintf(fp, ", ");
+    logSemStats(fp, &frame_stats);
+    fprintf(fp, "},\n  \"resources\": {\n    \"cpu_max\": 1,\n    \"mem_max\": %d,\n    \"cpu_status\": \"Available\",\n    \"mem_available\": %d\n  }\n}\n", 
+            TOTAL_FRAMES, final_mem_available);
+    fclose(fp);
+}
+
+// ====================================================================
+// MAIN ENTRY POINT
+// ====================================================================
+
+// "a,b,c" -> values[0..]; returns how many were read
+int parse_int_list(const char *text, int *values, int max_count) {
+    int n = 0;
+    while (*text && n < max_count) {
+        values[n++] = atoi(text);
+        while (*text && *text != ',') text++;
+        if (*text == ',') text++;
+    }
+    return n;
+}
+
+// Optional KEY=VALUE arguments after the positional ones, e.g. aging=linear aging_interval=4
+void parse_options(int argc, char *argv[], int first) {
+    for (int a = first; a < argc; a++) {
+        char *eq = strchr(argv[a], '=');
+        if (!eq) continue;
+        *eq = '\0';
+        const char *key = argv[a], *value = eq + 1;
+        if (strcmp(key, "aging") == 0) {
+            if (strcmp(value, "linear") == 0) AGING = AGING_LINEAR;
+            else if (strcmp(value, "exp") == 0) AGING = AGING_EXP;
+            else if (strcmp(value, "capped") == 0) AGING = AGING_CAPPED;
+            else AGING = AGING_NONE;
+        }
+        else if (strcmp(key, "aging_interval") == 0) AGING_INTERVAL = atoi(value);
+        else if (strcmp(key, "aging_cap") == 0) AGING_CAP = atoi(value);
+        else if (strcmp(key, "memory") == 0) {
+            if (strcmp(value, "buddy") == 0) MEMORY_MODEL = MEM_BUDDY;
+            else if (strcmp(value, "contiguous") == 0) MEMORY_MODEL = MEM_CONTIGUOUS;
+            else if (strcmp(value, "demand") == 0) MEMORY_MODEL = MEM_DEMAND;
+            else if (strcmp(value, "semaphore") == 0) MEMORY_MODEL = MEM_SEMAPHORE;
+            else MEMORY_MODEL = MEM_PAGING;
+        }
+        else if (strcmp(key, "dispatch") == 0) SCAN_DISPATCH = (strcmp(value, "scan") == 0);
+        else if (strcmp(key, "fit") == 0) {
+            if (strcmp(value, "worst") == 0) FIT_POLICY = FIT_WORST;
+            else if (strcmp(value, "next") == 0) FIT_POLICY = FIT_NEXT;
+            else FIT_POLICY = FIT_BEST;
+        }
+        else if (strcmp(key, "buddy_min") == 0) BUDDY_MIN = atoi(value);
+        else if (strcmp(key, "compact") == 0) COMPACTION = atoi(value);
+        else if (strcmp(key, "deadlock") == 0) DEADLOCK_MODE = (strcmp(value, "detect") == 0) ? DL_DETECT : DL_AVOID;
+        else if (strcmp(key, "detect_interval") == 0) DETECT_INTERVAL = atoi(value);
+        else if (strcmp(key, "safety_cache") == 0) SAFETY_CACHE = atoi(value);
+        else if (strcmp(key, "compact_threshold") == 0) COMPACT_THRESHOLD = atoi(value);
+        else if (strcmp(key, "compact_step") == 0) COMPACT_STEP = atoi(value);
+        else if (strcmp(key, "copy_ms") == 0) COPY_MS = atoi(value);
+        else if (strcmp(key, "replacement") == 0) {
+            if (strcmp(value, "fifo") == 0) REPLACEMENT = REPL_FIFO;
+            else if (strcmp(value, "clock") == 0) REPLACEMENT = REPL_CLOCK;
+            else if (strcmp(value, "arc") == 0) REPLACEMENT = REPL_ARC;
+            else REPLACEMENT = REPL_LRU;
+        }
+        else if (strcmp(key, "vpages") == 0) VPAGES = atoi(value);
+        else if (strcmp(key, "refs") == 0) REFS_PER_SEC = atoi(value);
+        else if (strcmp(key, "fault_ms") == 0) FAULT_MS = atoi(value);
+        else if (strcmp(key, "ws_window") == 0) WS_WINDOW = atoi(value);
+        else if (strcmp(key, "tlb") == 0) TLB_ENTRIES = atoi(value);
+        else if (strcmp(key, "tlb_ways") == 0) TLB_WAYS = atoi(value);
+        else if (strcmp(key, "tlb_repl") == 0) {
+            if (strcmp(value, "fifo") == 0) TLB_REPL = TLB_FIFO;
+            else if (strcmp(value, "random") == 0) TLB_REPL = TLB_RANDOM;
+            else TLB_REPL = TLB_LRU;
+        }
+        else if (strcmp(key, "tlb_asid") == 0) TLB_ASID = atoi(value);
+        else if (strcmp(key, "tlb_ns") == 0) TLB_NS = atoi(value);
+        else if (strcmp(key, "mem_ns") == 0) MEM_NS = atoi(value);
+        else if (strcmp(key, "seed") == 0) SEED = (unsigned int)strtoul(value, NULL, 10);
+        else if (strcmp(key, "realtime") == 0) REALTIME = atoi(value);
+        else if (strcmp(key, "export") == 0) EXPORT = atoi(value);
+        else if (strcmp(key, "snapshots") == 0) {
+            if (strcmp(value, "all") == 0) SNAPSHOT_POLICY = SNAP_ALL;
+            else if (strcmp(value, "ticks") == 0) SNAPSHOT_POLICY = SNAP_TICKS;
+            else if (strcmp(value, "events") == 0) SNAPSHOT_POLICY = SNAP_EVENTS;
+            else SNAPSHOT_POLICY = SNAP_CHANGE;
+        }
+        else if (strcmp(key, "snapshot_every") == 0) SNAPSHOT_EVERY = atoi(value);
+        else if (strcmp(key, "log_compress") == 0) LOG_COMPRESS = (strcmp(value, "zlib") == 0);
+        else if (strcmp(key, "log_block") == 0) LOG_BLOCK_KB = atoi(value);
+        else if (strcmp(key, "mlfq_levels") == 0) MLFQ_LEVELS = atoi(value);
+        else if (strcmp(key, "mlfq_quanta") == 0) parse_int_list(value, MLFQ_QUANTA, MAX_MLFQ_LEVELS);
+        else if (strcmp(key, "mlfq_boost") == 0) MLFQ_BOOST_PERIOD = atoi(value);
+        else if (strcmp(key, "sjf_alpha") == 0) SJF_ALPHA = atof(value);
+        else if (strcmp(key, "sjf_tau0") == 0) SJF_TAU0 = atof(value);
+        else if (strcmp(key, "arrival_gap") == 0) ARRIVAL_GAP = atoi(value);
+        else if (strcmp(key, "deadline_slack") == 0) DEADLINE_SLACK = atoi(value);
+        else if (strcmp(key, "rt_jobs") == 0) RT_JOBS = atoi(value);
+        else if (strcmp(key, "rt_admit") == 0) RT_ADMIT = atoi(value);
+        else if (strcmp(key, "rt_bound") == 0) RT_BOUND = atof(value);
+        else if (strcmp(key, "quantum") == 0) QUANTUM_SECONDS = atoi(value);
+        else if (strcmp(key, "switch_ms") == 0) SWITCH_MS = atoi(value);
+        else if (strcmp(key, "cache_ms") == 0) CACHE_MS = atoi(value);
+        else if (strcmp(key, "cache_procs") == 0) CACHE_PROCS = atoi(value);
+    }
+}
+
+// Parses the arguments, draws the workload and logs the first snapshot; returns 0 on success
+int sim_setup(int argc, char *argv[]) {
+    // Argument Parsing: [0]=exe, [1]=Algorithm, [2]=Quantum, [3]=TotalFrames, [4]=PageSize, [5]=NumProcesses, [6..]=KEY=VALUE options
+    if (argc < 6) {
+        return 1; // Critical failure if args are missing
+    } else {
+        strcpy(ALGORITHM, argv[1]);
+        QUANTUM_SECONDS = atoi(argv[2]);
+        TOTAL_FRAMES = atoi(argv[3]);
+        PAGE_SIZE = atoi(argv[4]); // Memory units per frame
+        NUM_PROCESSES = atoi(argv[5]);
+        
+        if (NUM_PROCESSES <= 0 || NUM_PROCESSES > 50) NUM_PROCESSES = 5; 
+        if (TOTAL_FRAMES <= 0 || TOTAL_FRAMES > MAX_PAGES) TOTAL_FRAMES = 5; 
+
+        memset(MLFQ_QUANTA, 0, sizeof(MLFQ_QUANTA)); // Levels left unset default from the quantum below
+        parse_options(argc, argv, 6); // quantum=N overrides the positional quantum
+        if (QUANTUM_SECONDS <= 0) QUANTUM_SECONDS = 2;
+        if (AGING_INTERVAL <= 0) AGING_INTERVAL = 5;
+        if (AGING_CAP < 0) AGING_CAP = 0;
+        if (PAGE_SIZE <= 0) PAGE_SIZE = 1;
+        if (BUDDY_MIN <= 0) BUDDY_MIN = 1;
+        if (COMPACT_THRESHOLD < 0) COMPACT_THRESHOLD = 30;
+        if (DETECT_INTERVAL < 0) DETECT_INTERVAL = 5;
+        if (COMPACT_STEP <= 0) COMPACT_STEP = 2;
+        if (COPY_MS < 0) COPY_MS = 100;
+        if (VPAGES <= 0 || VPAGES > MAX_PAGES) VPAGES = 8;
+        if (REFS_PER_SEC < 0) REFS_PER_SEC = 20;
+        if (FAULT_MS < 0) FAULT_MS = 50;
+        if (WS_WINDOW <= 0) WS_WINDOW = 20;
+        if (TLB_ENTRIES < 0) TLB_ENTRIES = 0;
+        if (TLB_NS < 0) TLB_NS = 1;
+        if (MEM_NS < 0) MEM_NS = 100;
+        if (MLFQ_LEVELS <= 0 || MLFQ_LEVELS > MAX_MLFQ_LEVELS) MLFQ_LEVELS = 3;
+        for (int l = 0; l < MAX_MLFQ_LEVELS; l++) if (MLFQ_QUANTA[l] <= 0) MLFQ_QUANTA[l] = QUANTUM_SECONDS << l;
+        if (SJF_ALPHA < 0 || SJF_ALPHA > 1) SJF_ALPHA = 0;
+        if (ARRIVAL_GAP < 0) ARRIVAL_GAP = 0;
+        if (SNAPSHOT_EVERY <= 0) SNAPSHOT_EVERY = 1;
+        if (SWITCH_MS < 0) SWITCH_MS = 0;
+        if (CACHE_MS < 0) CACHE_MS = 0;
+        if (CACHE_PROCS <= 0) CACHE_PROCS = 2;
+        if (LOG_BLOCK_KB <= 0) LOG_BLOCK_KB = 64;
+#ifndef SIM_ZLIB
+        if (LOG_COMPRESS) {
+            fprintf(stderr, "log_compress=zlib needs a build with -DSIM_ZLIB -lz; writing a plain events.log\n");
+            LOG_COMPRESS = 0;
+        }
+#endif
+        if (strcmp(ALGORITHM, "CFS") == 0) POLICY = POLICY_CFS;
+        else if (strcmp(ALGORITHM, "MLFQ") == 0) POLICY = POLICY_MLFQ;
+        else if (strcmp(ALGORITHM, "SJF") == 0) POLICY = POLICY_SJF;
+        else if (strcmp(ALGORITHM, "SRTF") == 0) POLICY = POLICY_SRTF;
+        else if (strcmp(ALGORITHM, "EDF") == 0) POLICY = POLICY_EDF;
+        else POLICY = SCAN_DISPATCH ? POLICY_SCAN : POLICY_PRIORITY;
+        if (POLICY == POLICY_EDF && DEADLINE_SLACK <= 0) DEADLINE_SLACK = NUM_PROCESSES * MAX_BURST_TIME; // EDF needs deadlines
+        if (RT_JOBS <= 0) RT_JOBS = 1;
+        if (RT_BOUND <= 0) RT_BOUND = 1.0;
+    }
+    
+    if (SEED == 0) SEED = (unsigned)time(NULL);
+    srand(SEED);
+    if (LOG_FILES) log_open();
+
+    // Dynamic Allocation of Processes array
+    processes = (ProcessInfo *)malloc(NUM_PROCESSES * sizeof(ProcessInfo));
+    if (processes == NULL) return 1;
+    memset(memory_frames, 0, sizeof(memory_frames));
+
+    // Initialize Semaphores/Mutex
+    // Named only for a paced (live) run: headless runs, batch workers and the library
+    // may run side by side and must not share them
+    int named = LOG_FILES && REALTIME;
+    cpu_semaphore = CreateSemaphore(NULL, 1, 1, named ? "CPUSemaphore" : NULL);
+    mem_mutex = CreateMutex(NULL, FALSE, named ? "MemMutex" : NULL); // Mutex to protect shared memory structures
+    // memory=semaphore: a counting semaphore of TOTAL_FRAMES units
+    if (MEMORY_MODEL == MEM_SEMAPHORE) mem_semaphore = CreateSemaphore(NULL, TOTAL_FRAMES, TOTAL_FRAMES, named ? "MemSemaphore" : NULL);
+    
+    if (cpu_semaphore == NULL || mem_mutex == NULL || (MEMORY_MODEL == MEM_SEMAPHORE && mem_semaphore == NULL)) {
+        free(processes);
+        return 1;
+    }
+
+    // Initialize Processes
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        processes[i].id = i + 1;
+        processes[i].priority = (rand() % (MAX_PRIORITY - MIN_PRIORITY + 1)) + MIN_PRIORITY; // Priority
+        processes[i].burst_time = (rand() % (MAX_BURST_TIME - MIN_BURST_TIME + 1)) + MIN_BURST_TIME;
+        processes[i].remaining_time = processes[i].burst_time;
+        processes[i].mem_needed = (rand() % (MAX_MEM_REQ - MIN_MEM_REQ + 1)) + MIN_MEM_REQ; // Frames needed
+        processes[i].max_mem = (rand() % (MAX_MEM_REQ - processes[i].mem_needed + 1)) + processes[i].mem_needed; // Max frames (Banker)
+        // Fewer frames than MAX_MEM_REQ: no request may exceed the whole memory, or it could never be granted
+        if (processes[i].mem_needed > TOTAL_FRAMES) processes[i].mem_needed = TOTAL_FRAMES;
+        if (processes[i].max_mem > TOTAL_FRAMES) processes[i].max_mem = TOTAL_FRAMES;
+        processes[i].mem_allocated = 0;
+        processes[i].page_table_count = 0;
+        processes[i].block_slot = -1;
+        processes[i].frag_failed_at = -1;
+        processes[i].vpages = 0;
+        processes[i].refs = processes[i].faults = processes[i].ws_sum = 0;
+        processes[i].ws_samples = processes[i].ws_last = processes[i].ws_max = 0;
+        processes[i].suspended = processes[i].suspensions = 0;
+        processes[i].tlb_hits = processes[i].tlb_misses = 0;
+        processes[i].state = WAITING;
+        processes[i].idle_cycles = 0;
+        processes[i].starvation_events = 0;
+        processes[i].frames_wait = 0;
+        processes[i].dl_preempts = 0;
+        processes[i].weight = PRIO_TO_WEIGHT[processes[i].priority - 1];
+        processes[i].vruntime = 0;
+        processes[i].level = 0;
+        processes[i].tau = SJF_TAU0;
+        processes[i].rel_deadline = 0;
+        processes[i].jobs_total = 1;
+        processes[i].jobs_done = 0;
+        processes[i].deadline_misses = 0;
+        processes[i].admitted = 1;
+        processes[i].switches = processes[i].preemptions = 0;
+        processes[i].switch_ms = 0;
+        processes[i].last_switch = -1;
+        strcpy(processes[i].status, "Waiting (CPU)"); 
+        processes[i].arrival_time = 0;
+        processes[i].start_time = -1;
+        processes[i].completion_time = 0;
+        processes[i].waiting_time = 0;
+        processes[i].turnaround_time = 0;
+        processes[i].wait_since = processes[i].arrival_time;
+        memset(processes[i].wait_hist, 0, sizeof(processes[i].wait_hist));
+        processes[i].blocked_cpu = 0;
+        processes[i].blocked_mutex = 0;
+        processes[i].blocked_frames = 0;
+        processes[i].mem_held_since = 0;
+        processes[i].mem_held_us = 0;
+
+        time_total_burst += processes[i].burst_time;
+    }
+    
+    // Footprints in units, drawn after the loop above so a seed keeps its workload.
+    // The last frame is partly used, which is the paging model's internal fragmentation.
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        processes[i].mem_units = (processes[i].mem_needed - 1) * PAGE_SIZE + rand() % PAGE_SIZE + 1;
+    }
+
+    // Staggered arrivals, drawn after the footprints for the same reason
+    for (int i = 1; i < NUM_PROCESSES && ARRIVAL_GAP > 0; i++) {
+        processes[i].arrival_time = processes[i - 1].arrival_time + rand() % (ARRIVAL_GAP + 1);
+        processes[i].wait_since = processes[i].arrival_time;
+    }
+
+    // Deadlines and periods, drawn after the arrivals
+    lateness = (int *)malloc(NUM_PROCESSES * RT_JOBS * sizeof(int));
+    if (lateness == NULL) {
+        free(processes);
+        return 1;
+    }
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        processes[i].release_time = processes[i].arrival_time;
+        if (DEADLINE_SLACK > 0) {
+            processes[i].rel_deadline = processes[i].burst_time + rand() % (DEADLINE_SLACK + 1);
+            processes[i].abs_deadline = processes[i].arrival_time + processes[i].rel_deadline;
+            processes[i].jobs_total = RT_JOBS;
+            time_total_burst += processes[i].burst_time * (RT_JOBS - 1);
+        }
+    }
+    admit_tasks();
+    for (int i = 0; i < NUM_PROCESSES; i++) {
+        if (!processes[i].admitted) time_total_burst -= processes[i].burst_time * processes[i].jobs_total;
+    }
+    completed = rt_rejected; // Rejected tasks never run
+
+    if ((POLICY == POLICY_CFS && !cfs_init()) || !rq_init()) {
+        free(processes);
+        return 1;
+    }
+    dl_order = (int *)malloc(NUM_PROCESSES * sizeof(int));
+    if (dl_order == NULL) {
+        free(processes);
+        return 1;
+    }
+    if (MEMORY_MODEL == MEM_BUDDY) {
+        if (!buddy_init()) {
+            buddy_destroy();
+            free(processes);
+            return 1;
+        }
+        // A request bigger than the largest block could never be placed
+        for (int i = 0; i < NUM_PROCESSES; i++) {
+            long long largest = (long long)BUDDY_MIN << buddy_top_order;
+            if (processes[i].mem_units > largest) processes[i].mem_units = (int)largest;
+        }
+    }
+    if (MEMORY_MODEL == MEM_CONTIGUOUS) hole_init();
+    if (MEMORY_MODEL == MEM_DEMAND) {
+        if (TLB_ENTRIES > 0) tlb_init();
+        // Address spaces of mem_needed..VPAGES pages; reference strings get their own generators
+        for (int i = 0; i < NUM_PROCESSES; i++) {
+            int lo = processes[i].mem_needed < VPAGES ? processes[i].mem_needed : VPAGES;
+            processes[i].vpages = lo + rand() % (VPAGES - lo + 1);
+            processes[i].ref_state = (SEED ^ (unsigned int)(processes[i].id * 2654435761u)) | 1;
+            processes[i].locality = 0;
+            memset(processes[i].page_table, 0, sizeof(processes[i].page_table));
+            memset(processes[i].last_ref, 0, sizeof(processes[i].last_ref));
+        }
+    }
+
+    if (LOG_FILES && REALTIME) ringOpen(); // Only a paced run has a live viewer
+    export_open();
+    logSnapshotKind(SNAP_FORCE);
+    return 0;
+}
+
+// Writes output.json (unless write_results is 0) and frees the run
+void sim_teardown(int write_results) {
+    if (SNAPSHOT_POLICY != SNAP_ALL) logSnapshotKind(SNAP_FORCE); // The final state, if sampling skipped it
+    if (LOG_FILES) log_close();
+    if (write_results) writeLogsToJSON();
+    export_close();
+    ringClose();
+
+    CloseHandle(cpu_semaphore);
+    CloseHandle(mem_mutex);
+    if (mem_semaphore) CloseHandle(mem_semaphore);
+    cfs_free();
+    rq_free();
+    free(lateness);
+    free(dl_order);
+    buddy_destroy();
+    free(callback_words);
+    free(snap_words);
+    free(processes); 
+}
+
+#ifdef SIM_LIBRARY
+// ====================================================================
+// IN-PROCESS LIBRARY API (gcc -shared -DSIM_LIBRARY, see engine_lib.py)
+// The same engine loaded with ctypes instead of started as a process:
+// sim_init takes the executable's command line, then the caller drives the
+// scheduler a step at a time and reads snapshots straight from memory, into
+// its own buffer (sim_snapshot) or through a callback on every logged
+// snapshot, instead of through events.log and the shared-memory ring. Words
+// use the ring's slot layout, described by sim_header. Engine state is
+// global, so one loaded copy of the library holds one run.
+// ====================================================================
+
+#ifdef _WIN32
+#define SIM_API __declspec(dllexport)
+#else
+#define SIM_API __attribute__((visibility("default")))
+#endif
+
+// Same arguments as the executable (argv[0] is ignored); no wall-clock pacing unless realtime=1
+SIM_API int sim_init(int argc, char *argv[]) {
+    LOG_FILES = 0;
+    REALTIME = 0;
+    return sim_setup(argc, argv);
+}
+
+// One scheduler step; returns 0 once every process has finished
+SIM_API int sim_step() {
+    return scheduler_step();
+}
+
+// Up to max_steps steps (until the end if max_steps <= 0); returns the steps taken
+SIM_API int sim_run(int max_steps) {
+    int steps = 0;
+    while ((max_steps <= 0 || steps < max_steps) && scheduler_step()) steps++;
+    return steps;
+}
+
+SIM_API int sim_done() {
+    return completed >= NUM_PROCESSES;
+}
+
+SIM_API int sim_time() {
+    return current_time;
+}
+
+// Called with the slot words of every snapshot the engine logs (NULL to stop)
+SIM_API void sim_set_callback(SnapshotCallback callback) {
+    snapshot_callback = callback;
+}
+
+// Ring header for the slot layout, RING_HEADER_BYTES long
+SIM_API void sim_header(unsigned char *buf) {
+    RingHeader *h = (RingHeader *)buf;
+    fill_ring_header(h);
+    h->magic = RING_MAGIC;
+}
+
+SIM_API int sim_snapshot_words() {
+    return slot_words();
+}
+
+// The current state as slot words; returns how many were written, or -1 if buf is too small
+SIM_API int sim_snapshot(int *buf, int capacity) {
+    if (capacity < slot_words()) return -1;
+    return fill_slot(buf, cpu_busy(), free_frame_count());
+}
+
+SIM_API int sim_columns() {
+    return EXPORT_COLUMNS;
+}
+
+SIM_API const char *sim_column_name(int c) {
+    return (c >= 0 && c < EXPORT_COLUMNS) ? EXPORT_NAMES[c] : NULL;
+}
+
+// Per-process results, one row of the export=1 columns per process; returns the rows written
+SIM_API int sim_results(long long *buf, int capacity) {
+    int rows = capacity / EXPORT_COLUMNS < NUM_PROCESSES ? capacity / EXPORT_COLUMNS : NUM_PROCESSES;
+    for (int i = 0; i < rows; i++) export_values(i, (LONGLONG *)(buf + (long)i * EXPORT_COLUMNS));
+    return rows;
+}
+
+// numProcesses, totalTime, totalBurstTime, seed: the run-level fields of output.json
+SIM_API void sim_totals(long long *buf) {
+    buf[0] = NUM_PROCESSES;
+    buf[1] = current_time;
+    buf[2] = time_total_burst;
+    buf[3] = SEED;
+}
+
+SIM_API const char *sim_algorithm() {
+    return ALGORITHM;
+}
+
+// output.json's "deadlines": info gets slack, utilization, admittedUtilization, bound, admission, rejected
+// and lateness_buf up to capacity job latenesses; returns the finished jobs, or -1 if the run has no deadlines
+SIM_API int sim_deadlines(double *info, int *lateness_buf, int capacity) {
+    if (DEADLINE_SLACK <= 0) return -1;
+    info[0] = DEADLINE_SLACK;
+    info[1] = rt_utilization;
+    info[2] = rt_admitted_util;
+    info[3] = RT_BOUND;
+    info[4] = (POLICY == POLICY_EDF && RT_ADMIT);
+    info[5] = rt_rejected;
+    for (int k = 0; k < lateness_count && k < capacity; k++) lateness_buf[k] = lateness[k];
+    return lateness_count;
+}
+
+// output.json's run-level blocks (contextSwitch, memory, tlb, deadlock, deadlines, ...) as one JSON
+// object; returns its length, which may exceed capacity (call again with a bigger buffer), or -1
+SIM_API int sim_sections(char *buf, int capacity) {
+    JsonOut out = {NULL, NULL, 0, 0, 0};
+    out_printf(&out, "{\n");
+    write_run_sections(&out);
+    if (out.len >= 2 && out.buf[out.len - 2] == ',') out.len -= 2; // The last block closes the object
+    out_printf(&out, "\n}\n");
+    int len = out.failed ? -1 : (int)out.len;
+    if (len >= 0 && buf && capacity > 0) {
+        int n = len < capacity - 1 ? len : capacity - 1;
+        memcpy(buf, out.buf, n);
+        buf[n] = '\0';
+    }
+    free(out.buf);
+    return len;
+}
+
+// Ends the run; write_results=1 also writes output.json as the executable does
+SIM_API void sim_finish(int write_results) {
+    sim_teardown(write_results);
+}
+#else
+int main(int argc, char *argv[]) {
+    if (sim_setup(argc, argv) != 0) return 1;
+    scheduler();
+    sim_teardown(1);
+    return 0;
+}
+#endif
+"""
@@ -0,0 +1,1153 @@
+import tkinter as tk
+from tkinter import messagebox, scrolledtext, ttk
+import subprocess
+import json
+import os
+import sys
+import platform
+import random
+import threading
+import time
+
+import numpy as np
+
+from sim_engine import C_SOURCE_CODE
+from snapshot_ring import SnapshotRingReader
+from snapshot_store import SnapshotStore
+from engine_lib import build_executable, build_library, run_output
+from metrics import compute_metrics, format_report
+from montecarlo import compare_batches, format_batch, format_comparison, run_batch
+
+# ====================================================================
+# PYTHON GUI CODE (Tkinter)
+# One window for every engine mode; main.py and phase3.py open it with
+# their own preset (defaults, title and which policies the report and
+# the batch compare on the same workload).
+# ====================================================================
+
+# Bucket labels for the log2 wait-time histogram (WAIT_HIST_BUCKETS in the C engine)
+WAIT_HIST_LABELS = ["<1s", "1-2s", "2-4s", "4-8s", "8-16s", "16-32s", "32-64s", "64s+"]
+SYNC_COLORS = ["#ef4444", "#3b82f6", "#f59e0b", "#10b981"]
+# Policies replayed on the same workload for the TLB comparison
+TLB_COMPARE_ALGOS = ["RR", "FCFS", "CFS"]
+# Quanta replayed on the same workload for the context-switch trade-off (policies that use the quantum)
+QUANTUM_SWEEP = [1, 2, 4, 8]
+QUANTUM_ALGOS = ("RR", "CFS", "MLFQ")
+BATCH_MAX_RUNS = 300 # Seeds (per policy) for the Monte Carlo batch (it stops earlier once precise enough)
+REPLAY_TIMEOUT = 60 # Seconds per replay behind the report's comparisons
+PLAYBACK_SPEEDS = ["0.25x", "0.5x", "1x", "2x", "4x", "8x", "16x", "64x"]
+LIVE_POLL_MS = 50 # How often the GUI samples the engine's shared-memory ring
+ALGORITHMS = ["RR", "FCFS", "CFS", "MLFQ", "SJF", "SRTF", "EDF"]
+
+# Window defaults per launcher. "compare" lists the policies replayed on the same
+# workload for the report and the batch (empty: no policy comparison).
+PRESETS = {
+    "main": {
+        "title": "Dynamic OS Resource Allocation System",
+        "heading": "Dynamic OS Resource Allocation Simulation",
+        "geometry": "1700x820",
+        "frames": "6",
+        "page_size": "1",
+        "options": "memory=semaphore dispatch=scan",
+        "compare": ["RR", "FCFS", "MLFQ", "SJF", "SRTF", "EDF"],
+    },
+    "phase3": {
+        "title": "OS Resource Allocation",
+        "heading": "OS Resource Allocation",
+        "geometry": "1850x880",
+        "frames": "12",
+        "page_size": "1",
+        "options": "",
+        "compare": [],
+    },
+}
+
+class SemaphoreUI(tk.Tk):
+    def __init__(self, preset="phase3"):
+        super().__init__()
+        self.preset = PRESETS[preset]
+        self.title(self.preset["title"])
+        self.geometry(self.preset["geometry"])
+        self.configure(bg="#f6f8fa")
+        self.store = SnapshotStore()
+        self.current_snapshot_index = -1
+        self.snapshot_count = 0
+        self.run_cmd = []
+        self.aging_baseline = None
+        self.tlb_comparison = {}
+        self.compaction_baseline = None
+        self.deadlock_baseline = None
+        self.comparison = []
+        self.quantum_sweep = []
+        self.replay_thread = None
+        self.replay_results = {}
+        self.batch_thread = None
+        self.batch_result = None
+        self.batch_progress = (0, 0)
+        self.playing = False
+        self.play_job = None
+        self.time_index = []
+        self.scrub_syncing = False
+        self.sim_proc = None
+        self.ring_reader = None
+        self.process_colors = ["#7dc3f2", "#f29f7d", "#a6d37a", "#d57dd6", "#f2e27d", "#ff99e6", "#99ff99", "#ffcc66", "#6699ff", "#ff6666", "#c7e9b4", "#7fcdbb", "#41b6c4", "#1d91c0", "#225ea8"]
+        self.create_widgets()
+        self.style_widgets()
+        
+        if platform.system() != 'Windows':
+            messagebox.showwarning("OS Warning", "The C code uses Windows API (windows.h) for synchronization. "
+                                                 "Compilation and execution may fail on Linux/macOS unless GCC has the necessary compatibility libraries.")
+
+    def create_widgets(self):
+        # Top control bar (Dark Background)
+        top = tk.Frame(self, bg="#0f1724", height=70)
+        top.pack(fill=tk.X, side=tk.TOP)
+
+        title = tk.Label(top, text=self.preset["heading"], bg="#0f1724", fg="white",
+                             font=("Segoe UI", 16, "bold"))
+        title.pack(side=tk.LEFT, padx=20, pady=12)
+
+        # --- Settings Frame (Packed to the RIGHT) ---
+        settings_frame = tk.Frame(top, bg="#0f1724")
+        settings_frame.pack(side=tk.RIGHT, padx=12, pady=6)
+
+        # Num Processes Input 
+        tk.Label(settings_frame, text="Processes:", bg="#0f1724", fg="#cbd5e1", font=("Segoe UI", 10)).grid(row=0, column=0, padx=(10, 2))
+        self.num_proc_var = tk.StringVar(value="8") 
+        tk.Entry(settings_frame, textvariable=self.num_proc_var, width=4).grid(row=0, column=1, padx=(0, 10))
+
+        # Algorithm Selector
+        tk.Label(settings_frame, text="Algo:", bg="#0f1724", fg="#cbd5e1", font=("Segoe UI", 10)).grid(row=0, column=2, padx=(10, 2))
+        self.algo_var = tk.StringVar(value="RR")
+        ttk.Combobox(settings_frame, textvariable=self.algo_var, values=ALGORITHMS, width=6, state="readonly").grid(row=0, column=3, padx=(0, 10))
+
+        # Quantum Input
+        tk.Label(settings_frame, text="Quantum (s):", bg="#0f1724", fg="#cbd5e1", font=("Segoe UI", 10)).grid(row=0, column=4, padx=(10, 2))
+        self.quantum_var = tk.StringVar(value="2")
+        tk.Entry(settings_frame, textvariable=self.quantum_var, width=4).grid(row=0, column=5, padx=(0, 10))
+        
+        # Total Frames Input (Max Mem)
+        tk.Label(settings_frame, text="Total Frames:", bg="#0f1724", fg="#cbd5e1", font=("Segoe UI", 10)).grid(row=0, column=6, padx=(10, 2))
+        self.mem_var = tk.StringVar(value=self.preset["frames"])
+        tk.Entry(settings_frame, textvariable=self.mem_var, width=4).grid(row=0, column=7, padx=(0, 10))
+        
+        # Page Size Input (Simplified model uses 1, but keep UI for completeness)
+        tk.Label(settings_frame, text="Page Size (KB):", bg="#0f1724", fg="#cbd5e1", font=("Segoe UI", 10)).grid(row=0, column=8, padx=(10, 2))
+        self.page_size_var = tk.StringVar(value=self.preset["page_size"])
+        tk.Entry(settings_frame, textvariable=self.page_size_var, width=4).grid(row=0, column=9, padx=(0, 10))
+
+        # Engine options (KEY=VALUE, space separated), e.g. "aging=linear aging_interval=4" or "memory=semaphore dispatch=scan"
+        tk.Label(settings_frame, text="Options:", bg="#0f1724", fg="#cbd5e1", font=("Segoe UI", 10)).grid(row=0, column=10, padx=(10, 2))
+        self.options_var = tk.StringVar(value=self.preset["options"])
+        tk.Entry(settings_frame, textvariable=self.options_var, width=24).grid(row=0, column=11, padx=(0, 20))
+
+
+        # --- BUTTONS RELOCATED TO A SEPARATE FRAME BELOW THE HEADER ---
+        
+        button_frame = tk.Frame(self, bg="#e6eef6", pady=8)
+        button_frame.pack(fill=tk.X, side=tk.TOP)
+        
+        # Start Button
+        self.start_btn = tk.Button(button_frame, text="▶ Start Simulation", command=self.start_simulation,
+                                     bg="#10b981", fg="white", font=("Segoe UI", 10, "bold"), padx=12, pady=6)
+        self.start_btn.pack(side=tk.LEFT, padx=(20, 10)) 
+
+        # Prev Step Button
+        self.prev_btn = tk.Button(button_frame, text="⏮ Prev Step", command=self.show_prev_snapshot, state=tk.DISABLED,
+                                     bg="#64748b", fg="white", font=("Segoe UI", 10), padx=10, pady=6)
+        self.prev_btn.pack(side=tk.LEFT, padx=6)
+
+        # Next Step Button
+        self.next_btn = tk.Button(button_frame, text="Next Step ⏭", command=self.show_next_snapshot, state=tk.DISABLED,
+                                     bg="#64748b", fg="white", font=("Segoe UI", 10), padx=10, pady=6)
+        self.next_btn.pack(side=tk.LEFT, padx=6)
+
+        # Play/Pause Button (autoplay driven by after())
+        self.play_btn = tk.Button(button_frame, text="▶ Play", command=self.toggle_playback, state=tk.DISABLED,
+                                     bg="#2563eb", fg="white", font=("Segoe UI", 10, "bold"), padx=10, pady=6)
+        self.play_btn.pack(side=tk.LEFT, padx=6)
+
+        # Monte Carlo batch: the last configuration over many seeds, in the background
+        self.batch_btn = tk.Button(button_frame, text="📊 Batch", command=self.start_batch, state=tk.DISABLED,
+                                     bg="#7c3aed", fg="white", font=("Segoe UI", 10), padx=10, pady=6)
+        self.batch_btn.pack(side=tk.LEFT, padx=6)
+
+        # Playback rate: target frames per second and speed multiplier
+        tk.Label(button_frame, text="FPS:", bg="#e6eef6", fg="#0f1724", font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(10, 2))
+        self.fps_var = tk.StringVar(value="10")
+        tk.Entry(button_frame, textvariable=self.fps_var, width=4).pack(side=tk.LEFT)
+        tk.Label(button_frame, text="Speed:", bg="#e6eef6", fg="#0f1724", font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(10, 2))
+        self.speed_var = tk.StringVar(value="1x")
+        ttk.Combobox(button_frame, textvariable=self.speed_var, values=PLAYBACK_SPEEDS, width=5, state="readonly").pack(side=tk.LEFT)
+
+        # Step Label
+        self.step_label = tk.Label(button_frame, text="Step: 0/0 (Time: 0s)", bg="#e6eef6", fg="#0f1724", font=("Segoe UI", 10, "bold"))
+        self.step_label.pack(side=tk.LEFT, padx=12)
+
+
+        # --- Timeline scrubber: seek directly to any simulated time ---
+        scrub_frame = tk.Frame(self, bg="#e6eef6", pady=4)
+        scrub_frame.pack(fill=tk.X, side=tk.TOP)
+
+        tk.Label(scrub_frame, text="Seek Time (s):", bg="#e6eef6", fg="#0f1724", font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(20, 6))
+        self.time_scale = tk.Scale(scrub_frame, from_=0, to=0, orient=tk.HORIZONTAL, length=700, showvalue=True,
+                                   command=self.on_scrub, state=tk.DISABLED, bg="#e6eef6", highlightthickness=0)
+        self.time_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        self.seek_var = tk.StringVar(value="0")
+        tk.Entry(scrub_frame, textvariable=self.seek_var, width=7).pack(side=tk.LEFT, padx=(12, 4))
+        self.seek_btn = tk.Button(scrub_frame, text="Go ⏩", command=self.seek_to_entered_time, state=tk.DISABLED,
+                                  bg="#64748b", fg="white", font=("Segoe UI", 9), padx=8)
+        self.seek_btn.pack(side=tk.LEFT, padx=(0, 20))
+
+
+        # Main area
+        main = tk.Frame(self, bg="#f6f8fa")
+        main.pack(fill=tk.BOTH, expand=True, padx=14, pady=(12,14))
+
+        # Left panel — Process table and details
+        left = tk.Frame(main, bg="#f6f8fa")
+        left.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0,10))
+
+        # Resource Gauges Card
+        gauge_card = tk.Frame(left, bg="white", bd=0, relief=tk.RIDGE)
+        gauge_card.pack(fill=tk.X, pady=(0,8))
+        tk.Label(gauge_card, text="Resource Utilization (Gauges)", bg="white", font=("Segoe UI", 12, "bold")).pack(anchor="w", padx=12, pady=(10,0))
+        
+        gauge_frame = tk.Frame(gauge_card, bg="white")
+        gauge_frame.pack(fill=tk.X, padx=12, pady=(6,6))
+
+        tk.Label(gauge_frame, text="CPU (Binary Semaphore):", bg="white", font=("Segoe UI", 10, "bold")).grid(row=0, column=0, sticky="w", padx=(0, 10))
+        self.cpu_gauge = ttk.Progressbar(gauge_frame, orient="horizontal", length=200, mode="determinate")
+        self.cpu_gauge.grid(row=0, column=1, sticky="w")
+        self.cpu_label = tk.Label(gauge_frame, text="[N/A]", bg="white", font=("Segoe UI", 10, "italic"), width=10)
+        self.cpu_label.grid(row=0, column=2, sticky="w", padx=(10, 0))
+
+        tk.Label(gauge_frame, text="Memory (Total Frames):", bg="white", font=("Segoe UI", 10, "bold")).grid(row=1, column=0, sticky="w", padx=(0, 10), pady=(4,0))
+        self.mem_gauge = ttk.Progressbar(gauge_frame, orient="horizontal", length=200, mode="determinate")
+        self.mem_gauge.grid(row=1, column=1, sticky="w", pady=(4,0))
+        self.mem_label = tk.Label(gauge_frame, text="[N/A]", bg="white", font=("Segoe UI", 10, "italic"), width=10)
+        self.mem_label.grid(row=1, column=2, sticky="w", padx=(10, 0), pady=(4,0))
+        
+        # --- ADVANCED RESOURCE UTILIZATION (Contention Metrics) ---
+        contention_frame = tk.Frame(gauge_card, bg="white")
+        contention_frame.pack(fill=tk.X, padx=12, pady=(0, 12)) 
+
+        tk.Label(contention_frame, text="Resource Contention Metrics:", bg="white", font=("Segoe UI", 10, "bold"), fg="#1e40af").pack(anchor="w", pady=(4, 2))
+
+        self.cpu_contention_label = tk.Label(contention_frame, text="Processes Waiting for CPU: N/A", bg="white", font=("Segoe UI", 9), anchor="w", fg="#475569")
+        self.cpu_contention_label.pack(fill=tk.X)
+
+        self.mem_contention_label = tk.Label(contention_frame, text="Processes Waiting for Memory: N/A (Including Banker's Denial)", bg="white", font=("Segoe UI", 9), anchor="w", fg="#475569")
+        self.mem_contention_label.pack(fill=tk.X)
+
+        # --- SEMAPHORE / MUTEX INSTRUMENTATION (per-resource counters) ---
+        sync_columns = ("Resource", "Attempts", "Failures", "Fail %", "Acquired", "Avg Hold (s)", "Max Hold (s)", "Queue")
+        self.sync_tree = ttk.Treeview(contention_frame, columns=sync_columns, show="headings", height=3)
+        for col in sync_columns:
+            self.sync_tree.heading(col, text=col)
+            self.sync_tree.column(col, anchor="center", width=90 if col != "Resource" else 100)
+        self.sync_tree.pack(fill=tk.X, pady=(6, 4))
+
+        self.bottleneck_label = tk.Label(contention_frame, text="Bottleneck: N/A", bg="white", font=("Segoe UI", 9, "bold"), anchor="w", fg="#b91c1c")
+        self.bottleneck_label.pack(fill=tk.X)
+
+        tk.Label(contention_frame, text="Queue Length Over Time:", bg="white", font=("Segoe UI", 9), anchor="w", fg="#475569").pack(fill=tk.X, pady=(4, 0))
+        self.queue_canvas = tk.Canvas(contention_frame, height=70, bg="#f8fafc", highlightthickness=0)
+        self.queue_canvas.pack(fill=tk.X)
+        # -----------------------------------------------------------------
+
+
+        # Process table card
+        card_proc = tk.Frame(left, bg="white")
+        card_proc.pack(fill=tk.BOTH, expand=True)
+
+        tk.Label(card_proc, text="Process States", bg="white", font=("Segoe UI", 12, "bold")).pack(anchor="w", padx=12, pady=(12,6))
+
+        columns = ("PID", "Prio", "Burst (s)", "Remaining (s)", "Mem Req", "Max Mem (Banker's)", "Frames Alloc", "Status")
+        self.tree = ttk.Treeview(card_proc, columns=columns, show="headings", height=10)
+        
+        col_widths = {"PID": 50, "Prio": 50, "Burst (s)": 80, "Remaining (s)": 100, "Mem Req": 80, "Max Mem (Banker's)": 130, "Frames Alloc": 100, "Status": 180}
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, anchor="center", width=col_widths.get(col, 80))
+        
+        self.tree.tag_configure("Critical Section", background="#ffeb3b", foreground="#333333")
+        self.tree.tag_configure("STARVATION DANGER", background="#ef9a9a", foreground="#b71c1c")
+        self.tree.tag_configure("Banker Denied", background="#ffb347", foreground="#333333")
+        self.tree.tag_configure("Rejected", background="#e5e7eb", foreground="#6b7280")
+
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=12, pady=(0,12))
+
+        # Right panel — Timeline (Gantt) and final report
+        right = tk.Frame(main, bg="#f6f8fa", width=420)
+        right.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Gantt card
+        gantt_card = tk.Frame(right, bg="white")
+        gantt_card.pack(fill=tk.X, pady=(0,8))
+
+        tk.Label(gantt_card, text="Execution Timeline (Gantt)", bg="white", font=("Segoe UI", 12, "bold")).pack(anchor="w", padx=12, pady=(10,6))
+        self.gantt_canvas = tk.Canvas(gantt_card, height=160, bg="#f8fafc", highlightthickness=0)
+        self.gantt_canvas.pack(fill=tk.X, padx=12, pady=(0,12))
+
+        # Wait-time histogram card
+        hist_card = tk.Frame(right, bg="white")
+        hist_card.pack(fill=tk.X, pady=(0,8))
+
+        tk.Label(hist_card, text="Wait-Time Histogram (Ready → Dispatch)", bg="white", font=("Segoe UI", 12, "bold")).pack(anchor="w", padx=12, pady=(10,6))
+        self.hist_canvas = tk.Canvas(hist_card, height=110, bg="#f8fafc", highlightthickness=0)
+        self.hist_canvas.pack(fill=tk.X, padx=12, pady=(0,12))
+
+        # Report card
+        report_card = tk.Frame(right, bg="white")
+        report_card.pack(fill=tk.BOTH, expand=True)
+        tk.Label(report_card, text="Final Performance Report", bg="white", font=("Segoe UI", 12, "bold")).pack(anchor="w", padx=12, pady=(12,6))
+        
+        # New Performance Metrics Label
+        self.metrics_label = tk.Label(report_card, text="Metrics: CPU Util: N/A | Total Time: N/A", bg="white", font=("Segoe UI", 10, "bold"), anchor="w", fg="#10b981")
+        self.metrics_label.pack(fill=tk.X, padx=12)
+
+        self.report_text = scrolledtext.ScrolledText(report_card, width=40, height=10, state=tk.DISABLED, font=("Consolas", 10))
+        self.report_text.pack(fill=tk.BOTH, expand=True, padx=12, pady=(0,12))
+
+        # Status bar
+        self.status_bar = tk.Label(self, text="Ready", anchor="w", bg="#e6eef6", fg="#0f1724", font=("Segoe UI", 9))
+        self.status_bar.pack(fill=tk.X, side=tk.BOTTOM)
+
+    def style_widgets(self):
+        style = ttk.Style(self)
+        style.theme_use("default")
+        style.configure("Treeview", font=("Segoe UI", 10), rowheight=26)
+        style.configure("Treeview.Heading", font=("Segoe UI", 10, "bold"))
+        style.map("Treeview", background=[('selected', '#cdebf9')])
+        style.configure("TProgressbar", thickness=15)
+        style.map("TProgressbar", background=[('selected', '#cdebf9'), ('active', '#4338ca')])
+
+    # -------------------- Simulation / compile / run --------------------
+    def start_simulation(self):
+        # 0. Get user inputs and validate
+        try:
+            algo = self.algo_var.get()
+            quantum = int(self.quantum_var.get())
+            total_frames = int(self.mem_var.get())
+            page_size = int(self.page_size_var.get())
+            num_proc = int(self.num_proc_var.get()) 
+            if quantum <= 0 or total_frames <= 0 or num_proc <= 0 or page_size <= 0:
+                raise ValueError("All parameters must be positive integers.")
+            options = self.options_var.get().split()
+            if any("=" not in opt for opt in options):
+                raise ValueError("Options must be KEY=VALUE pairs.")
+            # Pin the seed so the baselines and the policy comparison replay exactly this workload
+            if not any(opt.startswith("seed=") for opt in options):
+                options.append(f"seed={random.randrange(1, 2**31)}")
+        except ValueError as e:
+            messagebox.showerror("Input Error", f"Invalid parameter: {e}")
+            return
+
+        self.stop_playback()
+        self.status_bar.config(text="Compiling and running simulation...")
+        self.start_btn.config(state=tk.DISABLED)
+        self.next_btn.config(state=tk.DISABLED)
+        self.prev_btn.config(state=tk.DISABLED)
+        self.play_btn.config(state=tk.DISABLED)
+        self.batch_btn.config(state=tk.DISABLED)
+        self.update_idletasks()
+
+        # Live frames are drawn on a clean slate until the full log is loaded
+        self.store = SnapshotStore()
+        self.snapshot_count = 0
+        self.current_snapshot_index = -1
+        self.time_index = []
+
+        try:
+            # 1. Compile (once per engine source; every mode is chosen by arguments)
+            exe_name = build_executable(C_SOURCE_CODE)
+
+            # 2. Run executable with ALL dynamic arguments (in the background, followed live through the ring)
+            # Args: [exe, algo, quantum, total_frames, page_size, num_proc]
+            run_cmd = [exe_name, algo, str(quantum), str(total_frames), str(page_size), str(num_proc)]
+            run_cmd += options
+            self.run_cmd = run_cmd
+            self.aging_baseline = None
+            self.tlb_comparison = {}
+            self.compaction_baseline = None
+            self.deadlock_baseline = None
+            self.comparison = []
+            self.quantum_sweep = []
+            self.sim_proc = subprocess.Popen(run_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            self.ring_reader = SnapshotRingReader()
+            self.status_bar.config(text="Simulation running (live view)...")
+            self.after(LIVE_POLL_MS, self.poll_live_run)
+
+        except Exception as ex:
+            messagebox.showerror("Compilation/Execution Error", f"Failed to compile or run C code. \n\n{str(ex)}")
+            self.start_btn.config(state=tk.NORMAL)
+            self.status_bar.config(text="Compilation/execution failed.")
+
+    # -------------------- Live monitor (shared-memory ring) --------------------
+    def poll_live_run(self):
+        frame = self.ring_reader.latest()
+        if frame is not None:
+            seq, snapshot = frame
+            live = SnapshotStore.from_snapshots([snapshot]).view(0)
+            self.update_ui_with_snapshot(live)
+            self.step_label.config(text=f"LIVE frame #{seq} (Time: {live.time}s)")
+            self.status_bar.config(text=f"Simulation running: live frame #{seq}, {self.ring_reader.dropped} stale frames dropped.")
+
+        if self.sim_proc.poll() is None:
+            self.after(LIVE_POLL_MS, self.poll_live_run)
+        else:
+            self.finish_simulation()
+
+    def finish_simulation(self):
+        p_run, self.sim_proc = self.sim_proc, None
+        self.ring_reader.close()
+        self.ring_reader = None
+        _, stderr = p_run.communicate()
+
+        try:
+            if p_run.returncode != 0:
+                 err = stderr.decode(errors="ignore")
+                 raise Exception(f"Execution failed with error code {p_run.returncode}. \n--- C Output ---\n{err}")
+
+            # 3. Load snapshots
+            self.load_snapshots_from_file("events.log")
+
+            # 4. Enable navigation & report
+            if self.snapshot_count > 0:
+                self.next_btn.config(state=tk.NORMAL)
+                self.play_btn.config(state=tk.NORMAL)
+                self.enable_scrubber()
+                self.show_next_snapshot()
+                self.show_final_report()
+                # 5. The comparisons replay the workload in the background; Start and Batch wait for them
+                self.replay_thread = threading.Thread(target=self.run_replays, daemon=True)
+                self.replay_thread.start()
+                self.status_bar.config(text=f"Loaded {self.snapshot_count} snapshots. Replaying the workload for the report's comparisons...")
+                self.after(LIVE_POLL_MS, self.poll_replays)
+            else:
+                messagebox.showinfo("No data", "No snapshots found in events.log. Simulation may have failed internally.")
+                self.start_btn.config(state=tk.NORMAL)
+
+        except Exception as ex:
+            messagebox.showerror("Compilation/Execution Error", f"Failed to compile or run C code. \n\n{str(ex)}")
+            self.status_bar.config(text="Compilation/execution failed.")
+        finally:
+            if self.replay_thread is None:
+                self.start_btn.config(state=tk.NORMAL)
+
+    def run_replays(self):
+        """Replays behind the report's comparisons (worker thread); poll_replays applies them."""
+        results = {}
+        try:
+            if any(arg.startswith("aging=") and arg != "aging=none" for arg in self.run_cmd):
+                results["aging_baseline"] = self.run_plain_baseline()
+            if "deadlock=detect" in self.run_cmd:
+                results["deadlock_baseline"] = self.replay_run(overrides=["deadlock=avoid"])
+            if "compact=1" in self.run_cmd:
+                results["compaction_baseline"] = self.replay_run(overrides=["compact=0"])
+            if any(arg.startswith("tlb=") and arg != "tlb=0" for arg in self.run_cmd):
+                results["tlb_comparison"] = self.run_tlb_comparison()
+            if self.preset["compare"]:
+                results["comparison"] = self.run_policy_comparison()
+            if self.run_cmd[1] in QUANTUM_ALGOS:
+                results["quantum_sweep"] = self.run_quantum_sweep()
+        finally:
+            self.replay_results = results
+
+    def poll_replays(self):
+        if self.replay_thread.is_alive():
+            self.after(LIVE_POLL_MS, self.poll_replays)
+            return
+        self.replay_thread = None
+        results, self.replay_results = self.replay_results, {}
+        for name, value in results.items():
+            setattr(self, name, value)
+        self.start_btn.config(state=tk.NORMAL)
+        self.batch_btn.config(state=tk.NORMAL)
+        self.show_final_report()
+        self.status_bar.config(text=f"Loaded {self.snapshot_count} snapshots. Click Next Step ⏭ or ▶ Play to step through the timeline.")
+
+
+    def replay_engine(self):
+        """The engine replays run on: the shared library (in process), or the executable if it cannot be built."""
+        try:
+            return build_library(C_SOURCE_CODE)
+        except (OSError, RuntimeError):
+            return self.run_cmd[0]
+
+    def replay_run(self, algo=None, overrides=()):
+        """Reruns the finished run's workload (same seed) without pacing; returns its output.json data.
+
+        algo replaces the algorithm, overrides are KEY=VALUE options that replace options with the same key.
+        """
+        keys = tuple(opt.split("=", 1)[0] + "=" for opt in overrides)
+        args = [algo or self.run_cmd[1]] + [arg for arg in self.run_cmd[2:] if not arg.startswith(keys)]
+        return run_output(self.replay_engine(), args + list(overrides), timeout=REPLAY_TIMEOUT)
+
+    def run_plain_baseline(self):
+        """Metrics of the same workload without aging."""
+        data = self.replay_run(overrides=["aging=none"])
+        return compute_metrics(data) if data else None
+
+    def run_tlb_comparison(self):
+        """TLB figures of the same workload under each scheduling policy."""
+        rows = {}
+        for algo in TLB_COMPARE_ALGOS:
+            data = self.replay_run(algo=algo)
+            if data and "tlb" in data:
+                rows[algo] = data["tlb"]
+        return rows
+
+    def deadline_overrides(self):
+        """Pins the finished run's deadline slack, so every policy sees the same deadlines
+        (EDF picks a default slack when none is given)."""
+        try:
+            with open("output.json", "r", encoding="utf-8") as f:
+                deadlines = json.load(f).get("deadlines")
+        except (OSError, ValueError):
+            deadlines = None
+        return [f"deadline_slack={deadlines['slack']}"] if deadlines else []
+
+    def comparison_args(self):
+        """The finished run's arguments after the algorithm, set up so every policy sees the same workload."""
+        overrides = self.deadline_overrides()
+        keys = tuple(opt.split("=", 1)[0] + "=" for opt in overrides) + ("realtime=",)
+        return [arg for arg in self.run_cmd[2:] if not arg.startswith(keys)] + overrides
+
+    def run_policy_comparison(self):
+        """Metrics of the same workload under every policy of the preset."""
+        overrides = self.deadline_overrides()
+        rows = []
+        for algo in self.preset["compare"]:
+            data = self.replay_run(algo=algo, overrides=overrides)
+            if data:
+                rows.append(compute_metrics(data))
+        return rows
+
+    def effective_quantum(self):
+        """The quantum the finished run used: a quantum= option overrides the Quantum field."""
+        try:
+            with open("output.json", "r", encoding="utf-8") as f:
+                return int(json.load(f)["contextSwitch"]["quantum"])
+        except (OSError, ValueError, KeyError):
+            return int(self.run_cmd[2])
+
+    def run_quantum_sweep(self):
+        """(quantum, metrics) of the same workload under each quantum of QUANTUM_SWEEP and the run's own."""
+        quanta = sorted(set(QUANTUM_SWEEP) | {self.effective_quantum()})
+        rows = []
+        for quantum in quanta:
+            data = self.replay_run(overrides=[f"quantum={quantum}"])
+            if data:
+                rows.append((quantum, compute_metrics(data)))
+        return rows
+
+    # -------------------- Monte Carlo batch --------------------
+    def start_batch(self):
+        """Reruns the last configuration over many seeds (starting at its own) and appends the intervals to the report."""
+        if not self.run_cmd or self.batch_thread is not None:
+            return
+        seed = next((int(arg.split("=", 1)[1]) for arg in self.run_cmd if arg.startswith("seed=")), 1)
+        self.batch_progress = (0, 0)
+        self.batch_btn.config(state=tk.DISABLED)
+        self.start_btn.config(state=tk.DISABLED)
+        algo = self.run_cmd[1]
+        cmd = [self.run_cmd[0], algo] + self.comparison_args()
+        algos = [algo] + [a for a in self.preset["compare"] if a != algo] if self.preset["compare"] else []
+        self.batch_thread = threading.Thread(target=self.run_batch_worker, args=(cmd, algos, seed), daemon=True)
+        self.batch_thread.start()
+        self.status_bar.config(text="Batch running...")
+        self.after(LIVE_POLL_MS, self.poll_batch)
+
+    def run_batch_worker(self, cmd, algos, seed):
+        # Runs off the Tk thread: it only sets attributes, poll_batch does the drawing
+        cmd = [self.replay_engine()] + cmd[1:] # Seeds run in process where the library builds
+        if algos:
+            self.batch_result = compare_batches(cmd, algos, base_seed=seed, max_runs=BATCH_MAX_RUNS, progress=self.note_batch_progress)
+        else:
+            self.batch_result = run_batch(cmd, base_seed=seed, max_runs=BATCH_MAX_RUNS, progress=self.note_batch_progress)
+
+    def note_batch_progress(self, done, failed):
+        self.batch_progress = (done, failed)
+
+    def poll_batch(self):
+        if self.batch_thread.is_alive():
+            done, failed = self.batch_progress
+            self.status_bar.config(text=f"Batch running: {done} runs done, {failed} failed...")
+            self.after(LIVE_POLL_MS, self.poll_batch)
+            return
+        self.batch_thread = None
+        self.batch_btn.config(state=tk.NORMAL)
+        self.start_btn.config(state=tk.NORMAL)
+        if self.batch_result is None:
+            self.status_bar.config(text="Batch failed.")
+            return
+        result, self.batch_result = self.batch_result, None
+        self.report_text.config(state=tk.NORMAL)
+        if "batches" in result:
+            self.report_text.insert(tk.END, "\n" + format_batch(result["batches"][result["baseline"]]) + format_comparison(result))
+            runs = sum(b["runs"] for b in result["batches"].values())
+            self.status_bar.config(text=f"Batch finished: {runs} runs over {len(result['batches'])} policies.")
+        else:
+            self.report_text.insert(tk.END, "\n" + format_batch(result))
+            self.status_bar.config(text=f"Batch finished: {result['runs']} runs, {result['failed']} failed.")
+        self.report_text.see(tk.END)
+        self.report_text.config(state=tk.DISABLED)
+
+    def load_snapshots_from_file(self, events_file):
+        try:
+            self.store = SnapshotStore.from_file(events_file)
+        except FileNotFoundError:
+            self.store = SnapshotStore()
+        self.snapshot_count = self.store.count
+        self.current_snapshot_index = -1
+        # time_index[t] = last snapshot whose time <= t, so a seek is one array lookup.
+        # Every events.log line is a full snapshot, so any index is a valid keyframe to render from.
+        self.time_index = self.store.time_index()
+
+    def show_next_snapshot(self):
+        self.stop_playback()
+        if self.current_snapshot_index + 1 < self.snapshot_count:
+            self.goto_snapshot(self.current_snapshot_index + 1)
+
+    def show_prev_snapshot(self):
+        self.stop_playback()
+        if self.current_snapshot_index - 1 >= 0:
+            self.goto_snapshot(self.current_snapshot_index - 1)
+
+    def goto_snapshot(self, index):
+        self.current_snapshot_index = index
+        snapshot = self.store.view(index)
+        self.update_ui_with_snapshot(snapshot)
+        self.sync_scrubber(snapshot.time)
+        self.prev_btn.config(state=tk.NORMAL if index > 0 else tk.DISABLED)
+        self.next_btn.config(state=tk.NORMAL if index + 1 < self.snapshot_count else tk.DISABLED)
+
+    # -------------------- Timeline scrubber --------------------
+    def enable_scrubber(self):
+        max_time = max(0, len(self.time_index) - 1)
+        self.time_scale.config(state=tk.NORMAL, to=max_time)
+        self.seek_btn.config(state=tk.NORMAL)
+
+    def sync_scrubber(self, sim_time):
+        # Keep the slider on the shown snapshot without re-entering on_scrub
+        self.scrub_syncing = True
+        try:
+            self.time_scale.set(sim_time)
+        finally:
+            self.scrub_syncing = False
+
+    def on_scrub(self, value):
+        if self.scrub_syncing or len(self.time_index) == 0:
+            return
+        self.seek_to_time(int(float(value)))
+
+    def seek_to_entered_time(self):
+        try:
+            t = int(self.seek_var.get())
+            if t < 0:
+                raise ValueError("Time must be a non-negative integer.")
+        except ValueError as e:
+            messagebox.showerror("Input Error", f"Invalid seek time: {e}")
+            return
+        self.seek_to_time(t)
+
+    def seek_to_time(self, t):
+        if len(self.time_index) == 0:
+            return
+        index = int(self.time_index[min(t, len(self.time_index) - 1)])
+        self.stop_playback()
+        if index != self.current_snapshot_index:
+            self.goto_snapshot(index)
+
+    # -------------------- Autoplay --------------------
+    def toggle_playback(self):
+        if self.playing:
+            self.stop_playback()
+        else:
+            self.start_playback()
+
+    def start_playback(self):
+        if self.snapshot_count == 0:
+            return
+        try:
+            fps = float(self.fps_var.get())
+            speed = float(self.speed_var.get().rstrip("x"))
+            if fps <= 0 or speed <= 0:
+                raise ValueError("FPS and speed must be positive.")
+        except ValueError as e:
+            messagebox.showerror("Input Error", f"Invalid playback setting: {e}")
+            return
+
+        if self.current_snapshot_index + 1 >= self.snapshot_count:
+            self.current_snapshot_index = -1 # Replay from the start
+        self.playing = True
+        self.play_rate = fps * speed # Snapshots advanced per wall-clock second
+        self.play_interval_ms = 1000.0 / fps
+        self.play_speed = speed # Snapshots each tick is meant to advance
+        self.play_origin = (time.perf_counter(), self.current_snapshot_index)
+        self.play_ticks = 0
+        self.frames_skipped = 0
+        self.play_btn.config(text="⏸ Pause")
+        self.play_tick()
+
+    def stop_playback(self):
+        if self.play_job is not None:
+            self.after_cancel(self.play_job)
+            self.play_job = None
+        if self.playing:
+            self.playing = False
+            self.play_btn.config(text="▶ Play")
+
+    def play_tick(self):
+        self.play_job = None
+        if not self.playing:
+            return
+        started = time.perf_counter()
+
+        # Position is derived from elapsed wall time, so a slow render skips ahead instead of lagging behind
+        origin_time, origin_index = self.play_origin
+        target = min(self.snapshot_count - 1, origin_index + 1 + int((started - origin_time) * self.play_rate))
+        if target > self.current_snapshot_index:
+            # Above 1x every tick steps over snapshots by design; only the lead of the wall clock over the ticks is lost to slow renders
+            scheduled = origin_index + 1 + int(self.play_ticks * self.play_speed)
+            self.frames_skipped = max(self.frames_skipped, target - scheduled)
+            self.goto_snapshot(target)
+            self.status_bar.config(text=f"Playing step {target + 1} of {self.snapshot_count} "
+                                        f"({self.frames_skipped} snapshots skipped to keep up).")
+
+        self.play_ticks += 1
+        if self.current_snapshot_index + 1 >= self.snapshot_count:
+            self.stop_playback()
+            return
+        render_ms = (time.perf_counter() - started) * 1000
+        self.play_job = self.after(max(1, int(self.play_interval_ms - render_ms)), self.play_tick)
+
+    def update_ui_with_snapshot(self, snapshot):
+        # snapshot is a SnapshotView: every field is read from the columnar store
+        time = snapshot.time
+        self.step_label.config(text=f"Step: {self.current_snapshot_index + 1}/{self.snapshot_count} (Time: {time}s)")
+        
+        # Available resources (Gauges)
+        cpu_status = snapshot.cpu_status
+        mem_avail = snapshot.mem_available
+        mem_max = snapshot.mem_max
+
+        # CPU Gauge (Binary Semaphore)
+        cpu_value = 100 if cpu_status == "Busy" else 0
+        self.cpu_gauge["value"] = cpu_value
+        self.cpu_label.config(text=f"[{cpu_status}]")
+        
+        # Update CPU gauge color based on status
+        style = ttk.Style()
+        if cpu_status == "Busy":
+            style.configure("TProgressbar", troughcolor="white", background="#ef4444") # Red/Busy
+        else:
+            style.configure("TProgressbar", troughcolor="white", background="#10b981") # Green/Available
+
+        # Memory Gauge (Counting Frames)
+        mem_allocated = mem_max - mem_avail
+        mem_percent = (mem_allocated / mem_max) * 100 if mem_max > 0 else 0
+        self.mem_gauge["value"] = mem_percent
+        self.mem_label.config(text=f"[{mem_allocated} / {mem_max} Frames]") 
+        
+        # Update Memory gauge color based on usage
+        if mem_percent > 80:
+            style.configure("TProgressbar", troughcolor="white", background="#f97316") # Orange/High Usage
+        elif mem_percent > 50:
+            style.configure("TProgressbar", troughcolor="white", background="#f59e0b") # Yellow/Medium Usage
+        else:
+            style.configure("TProgressbar", troughcolor="white", background="#3b82f6") # Blue/Low Usage
+
+
+        # Update Treeview (and calculate contention metrics)
+        for row in self.tree.get_children():
+            self.tree.delete(row)
+
+        # One row view per column instead of one dict per process
+        columns = [snapshot.column(name).tolist() for name in ("id", "prio", "burst", "remaining", "mem_needed", "max_mem", "mem_allocated")]
+        
+        # --- NEW: Calculate Contention Metrics ---
+        cpu_wait_count = 0
+        mem_wait_count = 0
+
+        for (pid, prio, burst, remaining, mem_needed, max_mem, mem_allocated), status in zip(zip(*columns), snapshot.statuses()):
+            values = (f"P{pid}", prio, burst, remaining, mem_needed, max_mem, mem_allocated, status)
+            
+            tag = status
+            if status == "Waiting (CPU)":
+                 cpu_wait_count += 1
+                 tag = "Waiting"
+            elif "Waiting (Memory" in status or "Banker" in status or "No Free" in status or "Page Fault" in status or "Suspended" in status or "Deadlock" in status:
+                 mem_wait_count += 1
+                 if "Banker" in status or "Suspended" in status or "Deadlock" in status:
+                     tag = "Banker Denied"
+                 else:
+                     tag = "Waiting"
+            
+            self.tree.insert("", tk.END, values=values, tags=(tag,))
+        
+        # --- NEW: Update Contention Metrics Labels ---
+        self.cpu_contention_label.config(text=f"Processes Waiting for CPU: {cpu_wait_count}")
+        self.mem_contention_label.config(text=f"Processes Waiting for Memory: {mem_wait_count} (Including Banker's Denial)")
+
+        # Semaphore instrumentation and wait histogram
+        self.update_sync_metrics(snapshot.sync)
+        self.draw_wait_histogram(snapshot)
+
+        # Draw Gantt chart
+        self.draw_gantt(snapshot.timeline)
+
+        self.status_bar.config(text=f"Showing step {self.current_snapshot_index + 1} of {self.snapshot_count}. Current Time: {time}s")
+
+    # -------------------- Contention instrumentation --------------------
+    def update_sync_metrics(self, sync):
+        for row in self.sync_tree.get_children():
+            self.sync_tree.delete(row)
+
+        total_failures = sum(s.get("failures", 0) for s in sync.values())
+        bottleneck = None
+        for name, s in sync.items():
+            attempts = s.get("attempts", 0)
+            failures = s.get("failures", 0)
+            releases = s.get("releases", 0)
+            fail_pct = (failures / attempts) * 100 if attempts > 0 else 0
+            avg_hold = s.get("hold_total", 0) / releases if releases > 0 else 0
+            values = (name, attempts, failures, f"{fail_pct:.1f}", s.get("acquired", 0), f"{avg_hold:.2f}", s.get("hold_max", 0), s.get("waiting", 0))
+            self.sync_tree.insert("", tk.END, values=values)
+            if failures > 0 and (bottleneck is None or failures > sync[bottleneck].get("failures", 0)):
+                bottleneck = name
+
+        if bottleneck is None:
+            self.bottleneck_label.config(text="Bottleneck: no failed acquires so far")
+        else:
+            share = sync[bottleneck]["failures"] / total_failures * 100
+            self.bottleneck_label.config(text=f"Bottleneck: {bottleneck} ({share:.0f}% of failed acquires, {sync[bottleneck].get('waiting', 0)} queued)")
+
+        self.draw_queue_chart()
+
+    def draw_queue_chart(self):
+        c = self.queue_canvas
+        c.delete("all")
+        if self.store.count == 0 or not self.store.sync_names:
+            return
+
+        width = c.winfo_width() or 600
+        height = c.winfo_height() or 70
+        pad = 6
+        waiting = self.store.sync_column("waiting") # (snapshot, resource) view
+        peak = max(1, int(waiting.max()))
+        n = self.store.count
+        stride = max(1, n // max(1, width - 2 * pad)) # Decimate to roughly one point per pixel
+        x_scale = (width - 2 * pad) / max(1, n - 1)
+        y_scale = (height - 2 * pad - 10) / peak
+        xs = pad + np.arange(0, n, stride) * x_scale
+
+        for k, name in enumerate(self.store.sync_names):
+            color = SYNC_COLORS[k % len(SYNC_COLORS)]
+            ys = height - pad - waiting[::stride, k] * y_scale
+            points = np.column_stack((xs, ys)).ravel().tolist()
+            if len(points) >= 4:
+                c.create_line(*points, fill=color, width=2)
+            c.create_text(pad + k * 90, pad, anchor="nw", text=f"■ {name}", fill=color, font=("Segoe UI", 8, "bold"))
+
+        # Cursor at the snapshot being shown
+        x = pad + max(0, self.current_snapshot_index) * x_scale
+        c.create_line(x, pad, x, height - pad, fill="#0f1724", dash=(2, 2))
+
+    def draw_wait_histogram(self, snapshot):
+        c = self.hist_canvas
+        c.delete("all")
+        totals = [0] * len(WAIT_HIST_LABELS)
+        if snapshot.has("wait_hist"):
+            totals = snapshot.column("wait_hist").sum(axis=0).tolist()[:len(totals)]
+        if not any(totals):
+            c.create_text(10, 10, anchor="nw", text="No dispatches recorded yet.", font=("Segoe UI", 10), fill="#475569")
+            return
+
+        width = c.winfo_width() or 400
+        height = c.winfo_height() or 110
+        pad = 8
+        slot_w = (width - 2 * pad) / len(totals)
+        peak = max(totals)
+        for b, count in enumerate(totals):
+            x0 = pad + b * slot_w
+            x1 = x0 + slot_w - 4
+            y1 = height - 18
+            y0 = y1 - (count / peak) * (height - 40)
+            c.create_rectangle(x0, y0, x1, y1, fill="#6366f1", outline="#0f1724")
+            c.create_text((x0 + x1) / 2, y0 - 2, text=str(count), anchor="s", font=("Segoe UI", 8), fill="#0f1724")
+            c.create_text((x0 + x1) / 2, height - 4, text=WAIT_HIST_LABELS[b], anchor="s", font=("Segoe UI", 8), fill="#334155")
+
+    # -------------------- Gantt drawing --------------------
+    def draw_gantt(self, timeline):
+        c = self.gantt_canvas
+        c.delete("all")
+        if len(timeline) == 0:
+            c.create_text(10, 10, anchor="nw", text="No timeline data yet. Press Next Step ⏭.", font=("Segoe UI", 10), fill="#475569")
+            return
+
+        width = c.winfo_width() or 800
+        height = c.winfo_height() or 160
+
+        padding_left = 8
+        padding_right = 8
+        padding_top = 10
+        padding_bottom = 20
+
+        available_w = max(10, width - padding_left - padding_right)
+        n = len(timeline)
+        slot_w = available_w / max(1, n)
+
+        # Draw bars (timeline holds integer PIDs)
+        for i, pid in enumerate(timeline.tolist()):
+            x0 = padding_left + i * slot_w
+            x1 = x0 + slot_w - 2
+            y0 = padding_top + 10
+            y1 = height - padding_bottom
+            fill = self.process_colors[(pid - 1) % len(self.process_colors)] if pid > 0 else "#9ca3af"
+            c.create_rectangle(x0, y0, x1, y1, fill=fill, outline="#0f1724")
+            c.create_text((x0 + x1) / 2, (y0 + y1) / 2, text=f"P{pid}", font=("Segoe UI", 10, "bold"), fill="#0f1724")
+
+        # Draw axis/time markers
+        for i in range(n + 1):
+            x = padding_left + i * slot_w
+            c.create_text(x, height - 6, text=str(i), anchor="n", font=("Segoe UI", 8), fill="#334155")
+            if i > 0 and i < n:
+                c.create_line(x, height - 20, x, height - 35, fill="#cbd5e1")
+
+
+    # -------------------- Final report --------------------
+    def show_final_report(self):
+        try:
+            if not os.path.exists("output.json"):
+                self.report_text.config(state=tk.NORMAL)
+                self.report_text.delete("1.0", tk.END)
+                self.report_text.insert(tk.END, "output.json not found. Run the simulation first.")
+                self.report_text.config(state=tk.DISABLED)
+                return
+            
+            with open("output.json", "r", encoding="utf-8") as f:
+                data = json.load(f)
+                
+            self.report_text.config(state=tk.NORMAL)
+            self.report_text.delete("1.0", tk.END)
+            
+            procs = data.get("processes", [])
+            total_time = data.get("totalTime", 1)
+            
+            # 1. Performance Metrics (vectorized, see metrics.py)
+            metrics = compute_metrics(data)
+            cpu_utilization = metrics["cpu_utilization"]
+            
+            # 2. Formatted Report
+            algorithm = data.get("algorithm", "N/A")
+            # RR and FCFS pick by priority unless the scan dispatcher is on; the other policies order their own queue
+            if algorithm in ("RR", "FCFS") and data.get("dispatch") != "scan":
+                algorithm = f"PRIORITY + {algorithm}"
+            header = f"--- SCHEDULER: {algorithm} ({data.get('numProcesses', 0)} Processes) ---\n"
+            header += f"{'PID':<4}{'Prio':>5}{'Burst':>8}{'MemReq':>8}{'MaxMem':>8}{'Completion':>12}{'Turnaround':>12}{'Waiting':>10}{'Response':>10}\n"
+            self.report_text.insert(tk.END, header)
+            self.report_text.insert(tk.END, "=" * 85 + "\n")
+            
+            # One insert for the whole table keeps large runs responsive
+            rows = [f"P{p['id']:<3}{p['prio']:>5}{p['burst']:>8}{p['memNeeded']:>8}{p['maxMem']:>8}{p['completion']:>12}{p['turnaroundTime']:>12}{p['waitingTime']:>10}"
+                    f"{p.get('start', -1) - p.get('arrival', 0) if p.get('start', -1) >= 0 else '-':>10}\n" for p in procs]
+            self.report_text.insert(tk.END, "".join(rows))
+                
+            # 3. Averages, percentiles, throughput, fairness, starvation
+            if procs:
+                avg_turn = metrics["turnaround"]["avg"]
+                avg_wait = metrics["waiting"]["avg"]
+                self.report_text.insert(tk.END, "\n")
+                self.report_text.insert(tk.END, f"Average Turnaround Time: {avg_turn:.2f} s\n")
+                self.report_text.insert(tk.END, f"Average Waiting Time:    {avg_wait:.2f} s\n")
+                self.report_text.insert(tk.END, "\n" + format_report(metrics))
+
+            snapshots = data.get("snapshots")
+            if snapshots and snapshots["logged"] < snapshots["taken"]:
+                every = f", every {snapshots['every']} s" if snapshots["policy"] == "ticks" else ""
+                self.report_text.insert(tk.END, f"\nSnapshots ({snapshots['policy']}{every}): {snapshots['logged']} of {snapshots['taken']} logged\n")
+            
+            aging = data.get("aging")
+            if aging:
+                self.report_text.insert(tk.END, f"\n--- PRIORITY AGING ({aging['policy']}, every {aging['interval']} s waited) ---\n")
+                self.report_text.insert(tk.END, f"Dispatches won through aging: {aging['agedDispatches']}\n")
+                base = self.aging_baseline
+                if base:
+                    self.report_text.insert(tk.END, f"{'Waiting':<12}{'Plain':>9}{'Aged':>9}{'Change':>9}\n")
+                    for label, key in (("Average", "avg"), ("P95", "p95"), ("P99", "p99")):
+                        plain, aged = base["waiting"][key], metrics["waiting"][key]
+                        change = f"{(aged - plain) / plain * 100:+.1f}%" if plain > 0 else "-"
+                        self.report_text.insert(tk.END, f"{label:<12}{plain:>9.2f}{aged:>9.2f}{change:>9}\n")
+                    self.report_text.insert(tk.END, f"{'Starved':<12}{base['starvation']['processes']:>9}{metrics['starvation']['processes']:>9}\n")
+
+            memory = data.get("memory")
+            if memory and (memory.get("requested", 0) > 0 or "demand" in memory):
+                self.report_text.insert(tk.END, f"\n--- MEMORY ALLOCATOR ({memory['model']}, {memory['units']} units, page {memory['pageSize']}) ---\n")
+                if memory.get("requested", 0) > 0:
+                    self.report_text.insert(tk.END, f"{'Model':<10}{'Requested':>11}{'Held':>11}{'Internal frag':>15}\n")
+                    for label, key in (("Paging", "pagingHeld"), ("Buddy", "buddyHeld")):
+                        held = memory[key]
+                        frag = (held - memory["requested"]) / held * 100 if held > 0 else 0
+                        self.report_text.insert(tk.END, f"{label:<10}{memory['requested']:>11}{held:>11}{frag:>14.1f}%\n")
+                part = memory.get("contiguous")
+                if part:
+                    frag = part["externalFragmentation"]
+                    self.report_text.insert(tk.END, f"Contiguous ({part['fit']}-fit): {part['allocs']} allocs, {part['failures']} failed "
+                                                    f"({part['fragFailures']} with enough free frames), {part['holes']} hole(s) left\n")
+                    self.report_text.insert(tk.END, f"External fragmentation: avg {frag['avg'] * 100:.1f}%, max {frag['max'] * 100:.1f}%; "
+                                                    f"allocation latency {part['avgAllocNs']:.0f} ns, {part['avgProbes']:.2f} probes\n")
+                    comp = part.get("compaction")
+                    if comp:
+                        self.report_text.insert(tk.END, f"Compaction (>{comp['threshold']}% fragmentation, {comp['step']} frames/step): {comp['runs']} run(s), "
+                                                        f"{comp['steps']} steps, {comp['moves']} partitions / {comp['frames']} frames moved, "
+                                                        f"{comp['seconds']} s copying; {comp['failuresAvoided']} placement(s) fit only after compaction\n")
+                        base = (self.compaction_baseline or {}).get("memory", {}).get("contiguous")
+                        if base:
+                            self.report_text.insert(tk.END, f"Without compaction: {base['failures']} failed placements ({base['fragFailures']} on fragmentation), "
+                                                            f"total time {self.compaction_baseline['totalTime']} s vs {data.get('totalTime', 0)} s\n")
+                demand = memory.get("demand")
+                if demand:
+                    self.report_text.insert(tk.END, f"Demand paging ({demand['policy']}): {demand['faults']}/{demand['refs']} references faulted "
+                                                    f"({demand['faultRate'] * 100:.1f}%), {demand['evictions']} evictions, {demand['stallSeconds']} s fault service\n")
+                    self.report_text.insert(tk.END, f"Thrashing: {demand['thrashEvents']} detection(s), {demand['suspensions']} suspension(s) "
+                                                    f"(working-set window {demand['wsWindow']} refs)\n")
+                    self.report_text.insert(tk.END, f"{'PID':<4}{'VPages':>8}{'Refs':>8}{'Faults':>8}{'Rate':>8}{'WS avg':>8}{'WS max':>8}{'Susp':>6}\n")
+                    for p in procs:
+                        pg = p.get("paging", {})
+                        rate = pg.get("faults", 0) / pg["refs"] * 100 if pg.get("refs") else 0
+                        self.report_text.insert(tk.END, f"P{p['id']:<3}{pg.get('vpages', 0):>8}{pg.get('refs', 0):>8}{pg.get('faults', 0):>8}{rate:>7.1f}%"
+                                                        f"{pg.get('wsAvg', 0):>8.2f}{pg.get('wsMax', 0):>8}{pg.get('suspensions', 0):>6}\n")
+                tlb = data.get("tlb")
+                if tlb:
+                    mode = "ASID-tagged" if tlb["asid"] else "flush on switch"
+                    self.report_text.insert(tk.END, f"\n--- TLB ({tlb['entries']} entries, {tlb['ways']}-way, {tlb['replacement']}, {mode}) ---\n")
+                    self.report_text.insert(tk.END, f"Hit ratio {tlb['hitRatio'] * 100:.1f}% ({tlb['hits']}/{tlb['hits'] + tlb['misses']}), "
+                                                    f"{tlb['flushes']} flushes, {tlb['shootdowns']} shootdowns, "
+                                                    f"EAT {tlb['eatNs']:.1f} ns (TLB {tlb['tlbNs']} ns, memory {tlb['memNs']} ns)\n")
+                    self.report_text.insert(tk.END, f"{'PID':<4}{'Hits':>8}{'Misses':>8}{'Hit %':>8}{'EAT ns':>9}\n")
+                    for p in procs:
+                        pg = p.get("paging", {})
+                        lookups = pg.get("tlbHits", 0) + pg.get("tlbMisses", 0)
+                        ratio = pg.get("tlbHits", 0) / lookups * 100 if lookups else 0
+                        self.report_text.insert(tk.END, f"P{p['id']:<3}{pg.get('tlbHits', 0):>8}{pg.get('tlbMisses', 0):>8}{ratio:>8.1f}{pg.get('eatNs', 0):>9.2f}\n")
+                    if self.tlb_comparison:
+                        self.report_text.insert(tk.END, f"{'Policy':<8}{'Hit %':>8}{'Flushes':>9}{'EAT ns':>9}\n")
+                        for algo, row in self.tlb_comparison.items():
+                            self.report_text.insert(tk.END, f"{algo:<8}{row['hitRatio'] * 100:>8.1f}{row['flushes']:>9}{row['eatNs']:>9.2f}\n")
+                buddy = memory.get("buddy")
+                if buddy:
+                    self.report_text.insert(tk.END, f"Buddy: {buddy['allocs']} allocs, {buddy['splits']} splits, {buddy['merges']} merges, "
+                                                    f"{buddy['failures']} failed ({buddy['fragFailures']} with enough free memory), "
+                                                    f"min block {buddy['minBlock']} units, max order {buddy['maxOrder']}\n")
+
+            deadlock = data.get("deadlock", {})
+            if deadlock.get("mode") == "detect":
+                self.report_text.insert(tk.END, f"\n--- DEADLOCK DETECTION (every {deadlock['interval']} s) vs BANKER'S AVOIDANCE ---\n")
+                self.report_text.insert(tk.END, f"{deadlock['deadlocks']} deadlock(s) broken by preempting {deadlock['victims']} victim(s); "
+                                                f"{deadlock['detections']} passes, {deadlock['skipped']} skipped (graph unchanged or not due)\n")
+                rows = [("Detect", data, deadlock["detections"], deadlock["detectNs"])]
+                base = self.deadlock_baseline
+                if base:
+                    rows.append(("Banker's", base, base["deadlock"]["safetyChecks"], base["deadlock"]["safetyNs"]))
+                self.report_text.insert(tk.END, f"{'Mode':<10}{'Done':>6}{'Time(s)':>9}{'Proc/s':>8}{'Avg wait':>10}{'Checks':>8}{'Check us':>10}\n")
+                for label, run, checks, ns in rows:
+                    m = metrics if run is data else compute_metrics(run)
+                    self.report_text.insert(tk.END, f"{label:<10}{m['completed']:>6}{m['total_time']:>9}{m['throughput']['overall']:>8.3f}"
+                                                    f"{m['waiting']['avg']:>10.2f}{checks:>8}{ns / 1000:>10.1f}\n")
+            elif deadlock.get("safetyChecks"):
+                checks = deadlock["safetyChecks"]
+                hits = deadlock.get("safetyCacheHits", 0)
+                self.report_text.insert(tk.END, "\n--- BANKER'S AVOIDANCE ---\n")
+                self.report_text.insert(tk.END, f"{checks} safety checks, {hits} ({hits / checks * 100:.1f}%) answered from the verdict cache, "
+                                                f"{deadlock['safetyNs'] / 1000:.1f} us in total\n")
+
+            if self.comparison:
+                self.report_text.insert(tk.END, f"\n--- POLICY COMPARISON (same workload, seed {data.get('seed', '?')}) ---\n")
+                self.report_text.insert(tk.END, f"{'Algo':<7}{'AvgWait':>9}{'P95Wait':>9}{'AvgResp':>9}{'P95Turn':>9}{'Fairness':>10}{'Misses':>8}\n")
+                for m in self.comparison:
+                    mark = "*" if m["algorithm"] == data.get("algorithm") else " "
+                    misses = f"{m['deadlines']['misses']}/{m['deadlines']['jobs']}" if "deadlines" in m else "-"
+                    self.report_text.insert(tk.END, f"{m['algorithm'] + mark:<7}{m['waiting']['avg']:>9.2f}{m['waiting']['p95']:>9.2f}"
+                                                    f"{m['response']['avg']:>9.2f}{m['turnaround']['p95']:>9.2f}{m['fairness']:>10.3f}{misses:>8}\n")
+
+            if "deadlines" in metrics:
+                dl = metrics["deadlines"]
+                self.report_text.insert(tk.END, "\n--- DEADLINES ---\n")
+                verdict = "schedulable" if dl["schedulable"] else "NOT schedulable"
+                self.report_text.insert(tk.END, f"Utilization: {dl['utilization']:.3f} (bound {dl['bound']:.2f}, {verdict})")
+                if dl["admission"]:
+                    self.report_text.insert(tk.END, f" | Admitted: {dl['admitted_utilization']:.3f}, rejected {dl['rejected']} task(s)")
+                self.report_text.insert(tk.END, f"\nJobs: {dl['jobs']} | Misses: {dl['misses']} ({dl['miss_ratio'] * 100:.1f}%) | Max lateness: {dl['lateness']['max']} s\n")
+                self.report_text.insert(tk.END, f"{'PID':<5}{'Deadline':>9}{'Jobs':>6}{'Misses':>8}{'Admitted':>10}\n")
+                rows = [f"P{p['id']:<4}{p.get('deadline', 0):>9}{p.get('jobs', 1):>6}{p.get('misses', 0):>8}{'yes' if p.get('admitted', 1) else 'no':>10}\n" for p in procs]
+                self.report_text.insert(tk.END, "".join(rows))
+
+            mlfq = data.get("mlfq")
+            if mlfq:
+                self.report_text.insert(tk.END, "\n--- MLFQ ---\n")
+                boost = f"every {mlfq['boostPeriod']} s ({mlfq['boosts']} boosts)" if mlfq["boostPeriod"] > 0 else "off"
+                self.report_text.insert(tk.END, f"Levels: {mlfq['levels']} | Boost: {boost} | Demotions: {mlfq['demotions']}\n")
+                self.report_text.insert(tk.END, f"{'Level':<7}{'Quantum':>9}{'Dispatches':>12}{'Ended here':>12}\n")
+                for level, (quantum, dispatches) in enumerate(zip(mlfq["quanta"], mlfq["dispatches"])):
+                    ended = sum(1 for p in procs if p.get("level") == level)
+                    self.report_text.insert(tk.END, f"{level:<7}{quantum:>9}{dispatches:>12}{ended:>12}\n")
+
+            switch = data.get("contextSwitch")
+            if switch:
+                cs = metrics["context_switches"]
+                self.report_text.insert(tk.END, f"\n--- CONTEXT SWITCHES ({switch['switchMs']} ms each, cache refill up to {switch['cacheMs']} ms "
+                                                f"after {switch['cacheProcs']} other slices) ---\n")
+                self.report_text.insert(tk.END, f"{switch['switches']} switches ({switch['preemptions']} preemptions): {switch['directMs']} ms switching + "
+                                                f"{switch['cacheRefillMs']} ms cache refill = {cs['overhead_seconds']:.2f} s "
+                                                f"({cs['overhead_share'] * 100:.1f}% of the run, {switch['seconds']} s charged to the clock)\n")
+                self.report_text.insert(tk.END, f"{'PID':<5}{'Switches':>9}{'Preempted':>11}{'Overhead ms':>13}\n")
+                rows = [f"P{p['id']:<4}{p.get('switches', 0):>9}{p.get('preemptions', 0):>11}{p.get('switchMs', 0):>13}\n" for p in procs]
+                self.report_text.insert(tk.END, "".join(rows))
+                if self.quantum_sweep:
+                    self.report_text.insert(tk.END, f"{'Quantum':<9}{'Switches':>9}{'Overhead':>10}{'Time(s)':>9}{'Proc/s':>8}{'Avg wait':>10}{'Avg resp':>10}\n")
+                    for quantum, m in self.quantum_sweep:
+                        mark = "*" if quantum == switch["quantum"] else " "
+                        sw = m["context_switches"]
+                        self.report_text.insert(tk.END, f"{str(quantum) + mark:<9}{sw['switches']:>9}{sw['overhead_share'] * 100:>9.1f}%{m['total_time']:>9}"
+                                                        f"{m['throughput']['overall']:>8.3f}{m['waiting']['avg']:>10.2f}{m['response']['avg']:>10.2f}\n")
+                    best = max(self.quantum_sweep, key=lambda row: (row[1]["throughput"]["overall"], -row[1]["waiting"]["avg"]))
+                    self.report_text.insert(tk.END, f"Highest throughput: quantum {best[0]} s (ties go to the lower average wait)\n")
+
+            # 4. Synchronization Contention
+            sync = data.get("sync", {})
+            if sync:
+                self.report_text.insert(tk.END, "\n--- SYNCHRONIZATION CONTENTION ---\n")
+                self.report_text.insert(tk.END, f"{'Resource':<10}{'Attempts':>10}{'Failures':>10}{'Fail %':>8}{'Hold(s)':>9}{'Hold(us)':>10}\n")
+                for name, s in sync.items():
+                    attempts = s.get("attempts", 0)
+                    fail_pct = (s.get("failures", 0) / attempts) * 100 if attempts > 0 else 0
+                    self.report_text.insert(tk.END, f"{name:<10}{attempts:>10}{s.get('failures', 0):>10}{fail_pct:>8.1f}{s.get('hold_total', 0):>9}{s.get('hold_us', 0):>10}\n")
+                worst = max(sync, key=lambda name: sync[name].get("failures", 0))
+                if sync[worst].get("failures", 0) > 0:
+                    self.report_text.insert(tk.END, f"Throughput bottleneck: {worst}\n")
+
+            if any("waitHist" in p for p in procs):
+                self.report_text.insert(tk.END, "\n--- WAIT-TIME HISTOGRAM (dispatches per bucket) ---\n")
+                self.report_text.insert(tk.END, "PID " + "".join(f"{label:>7}" for label in WAIT_HIST_LABELS) + "\n")
+                for p in procs:
+                    self.report_text.insert(tk.END, f"P{p['id']:<3}" + "".join(f"{count:>7}" for count in p.get("waitHist", [])) + "\n")
+
+            # 5. Display Metrics
+            self.metrics_label.config(text=f"Metrics: CPU Util: {cpu_utilization:.2f}% | Total Time: {total_time} s | Processes Completed: {metrics['completed']}"
+                                           f" | P95 Wait: {metrics['waiting']['p95']:.1f} s | Fairness: {metrics['fairness']:.3f}")
+            
+            self.report_text.config(state=tk.DISABLED)
+            self.status_bar.config(text="Final report loaded.")
+            
+        except Exception as e:
+            messagebox.showerror("Report Error", f"Failed to load report data: {str(e)}")
+            self.status_bar.config(text="Failed to load report.")
+
+# Entry point
+if __name__ == "__main__":
+    app = SemaphoreUI(sys.argv[1] if len(sys.argv) > 1 else "phase3")
+    app.mainloop()
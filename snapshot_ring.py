@@ -0,0 +1,162 @@
+import mmap
+import os
+import platform
+import struct
+
+# ====================================================================
+# SHARED-MEMORY SNAPSHOT RING READER
+# Mirrors the RING_* layout in the embedded C engine (sim_engine.py).
+# The engine overwrites the oldest slot and never waits for us, so a slow
+# reader simply skips stale frames instead of blocking the simulation.
+# ====================================================================
+
+RING_NAME = "Local\\SemaphoreSimRing"
+RING_MAGIC = 0x474E5253 # "SRNG"
+RING_VERSION = 1
+RING_SLOTS = 64
+RING_SLOT_BYTES = 8192
+RING_HEADER_BYTES = 1024
+RING_BYTES = RING_HEADER_BYTES + RING_SLOTS * RING_SLOT_BYTES
+RING_SCALARS = 8
+SYNC_FIELDS = ("attempts", "failures", "acquired", "releases", "hold_total", "hold_max", "waiting")
+
+# RingHeader: 8 x uint32, int64 write_seq, int32 finished, 5 x int32 reserved, then the name blocks
+HEADER_STRUCT = struct.Struct("<8Iqi5i")
+SEQ_STRUCT = struct.Struct("<q")
+WRITE_SEQ_OFFSET = 32
+NAME_BLOCKS = ((64, 256), (320, 256), (576, 448)) # proc_field_names, sync_names, status_names
+
+
+class SlotLayout:
+    """What one slot holds, as described by a ring header.
+
+    The header comes from the shared mapping or, for an engine loaded in
+    process (engine_lib.py), from sim_header(); both use the same slot words.
+    """
+
+    def __init__(self, header):
+        (magic, version, self.slot_count, self.slot_bytes, self.num_processes, self.proc_fields,
+         self.sync_count, self.timeline_cap, _, self.finished, *_) = HEADER_STRUCT.unpack_from(header, 0)
+        self.valid = magic == RING_MAGIC and version == RING_VERSION
+        field_names, sync_names, status_names = (read_name_block(header, off, size) for off, size in NAME_BLOCKS)
+        self.sync_names = sync_names.split(",")
+        self.status_names = status_names.split("|")
+
+        # "wait_hist:8" -> (name, width); width 0 marks a scalar column
+        self.proc_layout = []
+        for entry in field_names.split(","):
+            name, _, width = entry.partition(":")
+            self.proc_layout.append((name, int(width) if width else 0))
+
+
+def read_name_block(header, offset, size):
+    raw = bytes(header[offset:offset + size])
+    return raw.split(b"\0", 1)[0].decode("utf-8", errors="replace")
+
+
+def decode_slot(words, w, layout):
+    """Rebuilds the events.log-shaped snapshot dict from the slot words starting at words[w]."""
+    time, cpu_busy, mem_max, mem_available, timeline_len = words[w:w + 5]
+    n = w + RING_SCALARS
+
+    sync = {}
+    for name in layout.sync_names:
+        sync[name] = dict(zip(SYNC_FIELDS, words[n:n + len(SYNC_FIELDS)]))
+        n += len(SYNC_FIELDS)
+
+    processes = []
+    status_names = layout.status_names
+    for _ in range(layout.num_processes):
+        proc = {}
+        for name, width in layout.proc_layout:
+            if width:
+                proc[name] = list(words[n:n + width])
+                n += width
+            else:
+                proc[name] = words[n]
+                n += 1
+        code = proc.get("status", -1)
+        proc["status"] = status_names[code] if 0 <= code < len(status_names) else "Unknown"
+        processes.append(proc)
+
+    timeline_len = min(timeline_len, layout.timeline_cap)
+    return {
+        "time": time,
+        "resources": {"cpu_status": "Busy" if cpu_busy else "Available", "mem_max": mem_max, "mem_available": mem_available},
+        "sync": sync,
+        "processes": processes,
+        "timeline": [f"P{pid}" for pid in words[n:n + timeline_len]],
+    }
+
+
+class SnapshotRingReader:
+    """Follows the newest snapshot the engine has published to shared memory.
+
+    Values are read straight out of the mapping through a memoryview (no file
+    I/O, no JSON). latest() rebuilds only the small dict the GUI renders, and
+    re-checks the slot's sequence number afterwards so a frame the engine
+    overwrote mid-read is discarded rather than shown torn.
+    """
+
+    def __init__(self, name=RING_NAME):
+        self.name = name
+        self.mm = None
+        self.words = None
+        self.last_seq = 0
+        self.dropped = 0
+        self.finished = False
+
+    def open(self):
+        """Maps the ring; returns False until the engine has published a valid header."""
+        if self.mm is None:
+            try:
+                if platform.system() == 'Windows':
+                    self.mm = mmap.mmap(-1, RING_BYTES, tagname=self.name)
+                else:
+                    # POSIX compatibility layers back named mappings with /dev/shm
+                    path = os.path.join("/dev/shm", self.name.split("\\")[-1])
+                    with open(path, "r+b") as f:
+                        self.mm = mmap.mmap(f.fileno(), RING_BYTES)
+            except (OSError, ValueError):
+                self.mm = None
+                return False
+
+        layout = SlotLayout(self.mm)
+        if not layout.valid:
+            return False
+        self.layout = layout
+        if self.words is None:
+            self.words = memoryview(self.mm).cast("i")
+        return True
+
+    def write_seq(self):
+        return SEQ_STRUCT.unpack_from(self.mm, WRITE_SEQ_OFFSET)[0]
+
+    def latest(self):
+        """Returns (seq, snapshot) for the newest frame, or None if nothing new is ready."""
+        if self.words is None and not self.open():
+            return None
+
+        for _ in range(3):
+            seq = self.write_seq()
+            if seq <= self.last_seq:
+                self.finished = HEADER_STRUCT.unpack_from(self.mm, 0)[9] == 1
+                return None
+            slot = RING_HEADER_BYTES + ((seq - 1) % self.layout.slot_count) * self.layout.slot_bytes
+            if SEQ_STRUCT.unpack_from(self.mm, slot)[0] != seq:
+                continue # Engine is rewriting this slot; pick up the next newest
+            snapshot = decode_slot(self.words, slot // 4 + 2, self.layout)
+            if SEQ_STRUCT.unpack_from(self.mm, slot)[0] == seq:
+                if self.last_seq:
+                    self.dropped += seq - self.last_seq - 1
+                self.last_seq = seq
+                return seq, snapshot
+        return None
+
+    def close(self):
+        if self.words is not None:
+            self.words.release()
+            self.words = None
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
@@ -0,0 +1,246 @@
+import numpy as np
+
+from event_log import iter_snapshots
+
+# ====================================================================
+# COLUMNAR SNAPSHOT STORE
+# One NumPy array per field, indexed by (snapshot, process), instead of a
+# nested dict per snapshot. The execution timeline only ever grows, so it is
+# stored once as integer PIDs and each snapshot keeps just its length.
+# ====================================================================
+
+INITIAL_CAPACITY = 1024
+
+
+class SnapshotStore:
+    """Holds every snapshot of a run as column arrays.
+
+    The schema is taken from the first snapshot, so the same store serves
+    main.py (counting-semaphore model) and phase3.py (priority + Banker's):
+    integer process fields become (snapshot, pid) int32 columns, list fields
+    such as wait_hist become (snapshot, pid, bucket) arrays, and status
+    strings are interned into small integer codes.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.capacity = 0
+        self.num_processes = 0
+        self.proc_fields = []       # Scalar per-process fields, in log order
+        self.array_fields = {}      # Per-process list fields -> width
+        self.sync_names = []
+        self.sync_fields = []
+        self.status_names = []
+        self.status_codes = {}
+        self.schema_ready = False
+
+        self.time = np.zeros(0, dtype=np.int32)
+        self.cpu_busy = np.zeros(0, dtype=np.int8)
+        self.mem_max = np.zeros(0, dtype=np.int32)
+        self.mem_available = np.zeros(0, dtype=np.int32)
+        self.timeline_len = np.zeros(0, dtype=np.int32)
+        self.status = np.zeros((0, 0), dtype=np.int16)
+        self.proc = {}
+        self.arrays = {}
+        self.sync = np.zeros((0, 0, 0), dtype=np.int64)
+        self.timeline = np.zeros(0, dtype=np.int32)
+        self.timeline_used = 0
+
+    # -------------------- Building --------------------
+    @classmethod
+    def from_file(cls, events_file):
+        """Loads an events.log, plain or block-compressed (streamed a block at a time)."""
+        store = cls()
+        for snapshot in iter_snapshots(events_file):
+            store.append(snapshot)
+        store.finalize()
+        return store
+
+    @classmethod
+    def from_snapshots(cls, snapshots):
+        store = cls()
+        for snapshot in snapshots:
+            store.append(snapshot)
+        store.finalize()
+        return store
+
+    def _init_schema(self, snapshot):
+        processes = snapshot.get("processes", [])
+        self.num_processes = len(processes)
+        first = processes[0] if processes else {}
+        for name, value in first.items():
+            if name == "status":
+                continue
+            if isinstance(value, list):
+                self.array_fields[name] = len(value)
+            else:
+                self.proc_fields.append(name)
+
+        sync = snapshot.get("sync", {})
+        self.sync_names = list(sync)
+        if sync:
+            self.sync_fields = list(next(iter(sync.values())))
+
+    def _grow(self):
+        capacity = max(INITIAL_CAPACITY, self.capacity * 2)
+        p = self.num_processes
+
+        def grown(old, shape, dtype):
+            new = np.zeros(shape, dtype=dtype)
+            if self.count:
+                new[:self.count] = old[:self.count]
+            return new
+
+        self.time = grown(self.time, capacity, np.int32)
+        self.cpu_busy = grown(self.cpu_busy, capacity, np.int8)
+        self.mem_max = grown(self.mem_max, capacity, np.int32)
+        self.mem_available = grown(self.mem_available, capacity, np.int32)
+        self.timeline_len = grown(self.timeline_len, capacity, np.int32)
+        self.status = grown(self.status, (capacity, p), np.int16)
+        for name in self.proc_fields:
+            self.proc[name] = grown(self.proc.get(name, np.zeros((0, p), dtype=np.int32)), (capacity, p), np.int32)
+        for name, width in self.array_fields.items():
+            self.arrays[name] = grown(self.arrays.get(name, np.zeros((0, p, width), dtype=np.int32)), (capacity, p, width), np.int32)
+        self.sync = grown(self.sync, (capacity, len(self.sync_names), len(self.sync_fields)), np.int64)
+        self.capacity = capacity
+
+    def _status_code(self, status):
+        code = self.status_codes.get(status)
+        if code is None:
+            code = self.status_codes[status] = len(self.status_names)
+            self.status_names.append(status)
+        return code
+
+    def _extend_timeline(self, entries):
+        # Snapshots only ever append to the timeline, so only the unseen tail is converted
+        if len(entries) <= self.timeline_used:
+            return
+        if len(entries) > len(self.timeline):
+            grown = np.zeros(max(len(entries), 2 * len(self.timeline), 256), dtype=np.int32)
+            grown[:self.timeline_used] = self.timeline[:self.timeline_used]
+            self.timeline = grown
+        for k in range(self.timeline_used, len(entries)):
+            entry = entries[k]
+            self.timeline[k] = int(entry[1:]) if isinstance(entry, str) else int(entry)
+        self.timeline_used = len(entries)
+
+    def append(self, snapshot):
+        if not self.schema_ready:
+            self._init_schema(snapshot)
+            self.schema_ready = True
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+
+        self.time[i] = snapshot.get("time", 0)
+        res = snapshot.get("resources", {})
+        self.cpu_busy[i] = res.get("cpu_status") == "Busy"
+        self.mem_max[i] = res.get("mem_max", 0)
+        self.mem_available[i] = res.get("mem_available", 0)
+
+        for k, proc in enumerate(snapshot.get("processes", [])[:self.num_processes]):
+            for name in self.proc_fields:
+                self.proc[name][i, k] = proc.get(name, 0)
+            for name in self.array_fields:
+                values = proc.get(name, [])
+                self.arrays[name][i, k, :len(values)] = values
+            self.status[i, k] = self._status_code(proc.get("status", "Waiting"))
+
+        sync = snapshot.get("sync", {})
+        for r, name in enumerate(self.sync_names):
+            stats = sync.get(name, {})
+            for f, field in enumerate(self.sync_fields):
+                self.sync[i, r, f] = stats.get(field, 0)
+
+        timeline = snapshot.get("timeline", [])
+        self._extend_timeline(timeline)
+        self.timeline_len[i] = len(timeline)
+        self.count += 1
+
+    def finalize(self):
+        # Drop the growth slack so the arrays are exactly count rows long
+        n = self.count
+        self.time = self.time[:n].copy()
+        self.cpu_busy = self.cpu_busy[:n].copy()
+        self.mem_max = self.mem_max[:n].copy()
+        self.mem_available = self.mem_available[:n].copy()
+        self.timeline_len = self.timeline_len[:n].copy()
+        self.status = self.status[:n].copy()
+        self.proc = {name: col[:n].copy() for name, col in self.proc.items()}
+        self.arrays = {name: col[:n].copy() for name, col in self.arrays.items()}
+        self.sync = self.sync[:n].copy()
+        self.timeline = self.timeline[:self.timeline_used].copy()
+        self.capacity = n
+
+    # -------------------- Reading --------------------
+    def view(self, index):
+        return SnapshotView(self, index)
+
+    def sync_column(self, field):
+        """(snapshot, resource) array of one counter, e.g. queue length over time."""
+        if field not in self.sync_fields:
+            return np.zeros((self.count, len(self.sync_names)), dtype=np.int64)
+        return self.sync[:self.count, :, self.sync_fields.index(field)]
+
+    def time_index(self):
+        """time_index[t] = last snapshot whose time <= t (times never decrease)."""
+        if self.count == 0:
+            return np.zeros(0, dtype=np.int64)
+        times = self.time[:self.count]
+        return np.searchsorted(times, np.arange(int(times[-1]) + 1), side="right") - 1
+
+    def nbytes(self):
+        total = self.time.nbytes + self.cpu_busy.nbytes + self.mem_max.nbytes + self.mem_available.nbytes
+        total += self.timeline_len.nbytes + self.status.nbytes + self.sync.nbytes + self.timeline.nbytes
+        total += sum(col.nbytes for col in self.proc.values()) + sum(col.nbytes for col in self.arrays.values())
+        return total
+
+
+class SnapshotView:
+    """One snapshot, read through views into the store's arrays (no copies)."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def time(self):
+        return int(self.store.time[self.index])
+
+    @property
+    def cpu_status(self):
+        return "Busy" if self.store.cpu_busy[self.index] else "Available"
+
+    @property
+    def mem_max(self):
+        return int(self.store.mem_max[self.index])
+
+    @property
+    def mem_available(self):
+        return int(self.store.mem_available[self.index])
+
+    def has(self, name):
+        return name in self.store.proc or name in self.store.arrays
+
+    def column(self, name):
+        """Per-process values of one field at this snapshot."""
+        if name in self.store.proc:
+            return self.store.proc[name][self.index]
+        return self.store.arrays[name][self.index]
+
+    def statuses(self):
+        names = self.store.status_names
+        return [names[code] for code in self.store.status[self.index].tolist()]
+
+    @property
+    def sync(self):
+        store = self.store
+        rows = store.sync[self.index].tolist()
+        return {name: dict(zip(store.sync_fields, row)) for name, row in zip(store.sync_names, rows)}
+
+    @property
+    def timeline(self):
+        """Integer PIDs executed so far."""
+        return self.store.timeline[:self.store.timeline_len[self.index]]
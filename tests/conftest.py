@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+# The modules are flat files at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine_lib import build_executable, build_library, engine_source
+
+
+def built(build):
+    try:
+        return build(engine_source())
+    except (OSError, RuntimeError) as ex:
+        pytest.skip(f"engine cannot be built here: {ex}")
+
+
+# Skipped where the engine cannot be built (no gcc, or no windows.h or
+# compatible stub on the include path)
+@pytest.fixture(scope="session")
+def library():
+    return built(build_library)
+
+
+@pytest.fixture(scope="session")
+def executable():
+    return built(build_executable)
@@ -0,0 +1,88 @@
+import pytest
+
+from engine_lib import run_metrics, run_output
+from montecarlo import run_seed
+
+# ====================================================================
+# HEADLESS ENGINE SMOKE TESTS
+# Every scheduler under every memory model runs to completion in process
+# (engine_lib), with a wall-clock cap so a livelock fails the test instead
+# of hanging the suite. Configurations that once hung inside a single
+# scheduler step run as an engine process instead, which can be killed.
+# ====================================================================
+
+ALGORITHMS = ["RR", "FCFS", "CFS", "MLFQ", "SJF", "SRTF", "EDF"]
+MEMORY_MODELS = ["paging", "semaphore", "buddy", "contiguous", "demand"]
+TIMEOUT = 20 # Wall-clock seconds per run; the runs below finish in milliseconds
+WALL_CLOCK_FIELDS = {"safetyNs", "detectNs", "avgAllocNs"} # Measured, so they differ between two runs
+
+
+def check_finished(m):
+    assert m is not None, "engine run failed or did not finish in time"
+    rejected = m.get("deadlines", {}).get("rejected", 0) # Turned away by EDF admission control, never run
+    assert m["completed"] + rejected == m["num_processes"]
+    return m
+
+
+def run_to_end(library, args):
+    return check_finished(run_metrics(library, args + ["seed=1"], timeout=TIMEOUT))
+
+
+@pytest.mark.parametrize("memory", MEMORY_MODELS)
+@pytest.mark.parametrize("algo", ALGORITHMS)
+def test_every_scheduler_and_memory_model_finishes(library, algo, memory):
+    run_to_end(library, [algo, "2", "12", "1", "8", f"memory={memory}"])
+
+
+@pytest.mark.parametrize("algo", ["RR", "FCFS"])
+def test_scan_dispatch_finishes(library, algo):
+    run_to_end(library, [algo, "2", "6", "1", "8", "memory=semaphore", "dispatch=scan"])
+
+
+@pytest.mark.parametrize("algo", ALGORITHMS)
+def test_thrash_control_with_periodic_tasks(executable, algo):
+    # Load control used to suspend parked periodic tasks, which corrupted the CFS tree
+    cmd = [executable, algo, "2", "12", "2", "30", "memory=demand", "rt_jobs=3", "deadline_slack=5"]
+    check_finished(run_seed(cmd, 1, timeout=TIMEOUT))
+
+
+@pytest.mark.parametrize("frames", [1, 2, 3])
+@pytest.mark.parametrize("memory", MEMORY_MODELS)
+def test_fewer_frames_than_the_largest_request(executable, memory, frames):
+    # Requests are drawn up to 4 frames; with less memory they must still be grantable
+    cmd = [executable, "RR", "2", str(frames), "1", "8", f"memory={memory}", "dispatch=scan"]
+    check_finished(run_seed(cmd, 1, timeout=TIMEOUT))
+
+
+def test_context_switch_cost_is_charged(library):
+    free = run_to_end(library, ["RR", "1", "12", "1", "8", "dispatch=scan"])
+    costly = run_to_end(library, ["RR", "1", "12", "1", "8", "dispatch=scan", "switch_ms=500"])
+    assert costly["context_switches"]["switches"] == free["context_switches"]["switches"] > 0
+    assert costly["total_time"] > free["total_time"]
+
+
+def without_wall_clock(block):
+    if not isinstance(block, dict):
+        return block
+    return {key: without_wall_clock(value) for key, value in block.items() if key not in WALL_CLOCK_FIELDS}
+
+
+@pytest.mark.parametrize("args", [
+    ["RR", "2", "12", "1", "8", "memory=demand", "tlb=8", "tlb_ways=2"],
+    ["SJF", "2", "10", "1", "8", "memory=contiguous", "compact=1"],
+    ["RR", "2", "6", "1", "8", "memory=buddy", "deadlock=detect"],
+    ["EDF", "2", "12", "1", "6", "rt_jobs=2"],
+    ["MLFQ", "2", "12", "1", "8", "aging=linear", "dispatch=scan"],
+])
+def test_library_output_matches_the_executables(library, executable, args):
+    # Replays read the run-level blocks through the library instead of output.json
+    in_process = run_output(library, args + ["seed=3"], timeout=TIMEOUT)
+    written = run_output(executable, args + ["seed=3"], timeout=TIMEOUT)
+    assert in_process is not None and written is not None
+    assert {key for key in written if key not in in_process} == {"sync", "resources"}
+    for key, value in written.items():
+        if key == "processes":
+            for mine, theirs in zip(in_process["processes"], value):
+                assert mine == {k: v for k, v in theirs.items() if k in mine}
+        elif key in in_process and key != "snapshots": # The executable logs one more, at exit
+            assert without_wall_clock(in_process[key]) == without_wall_clock(value), key
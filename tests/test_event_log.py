@@ -0,0 +1,92 @@
+import os
+import subprocess
+
+import pytest
+
+from event_log import STAGE_SUFFIX, EventLog, parse_lines
+
+# ====================================================================
+# EVENT LOG
+# The same run is logged plain and block-compressed; every read of the
+# compressed log (streaming, seeks by index and by time, a run cut short)
+# must give back the plain log's snapshots.
+# ====================================================================
+
+ARGS = ["RR", "2", "12", "1", "12", "seed=2", "realtime=0"]
+BLOCK_KB = 16 # A few snapshots per block
+TIMEOUT = 20
+
+
+def run_logged(executable, workdir, *options):
+    os.makedirs(workdir, exist_ok=True)
+    subprocess.run([executable] + ARGS + list(options), cwd=workdir, timeout=TIMEOUT,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return os.path.join(workdir, "events.log")
+
+
+@pytest.fixture(scope="module")
+def logs(executable, tmp_path_factory):
+    """(plain snapshots, plain events.log text, compressed events.log path) of one run."""
+    root = tmp_path_factory.mktemp("event_log")
+    plain_path = run_logged(executable, root / "plain")
+    compressed_path = run_logged(executable, root / "zlib", "log_compress=zlib", f"log_block={BLOCK_KB}")
+    if not EventLog(compressed_path).compressed:
+        pytest.skip("engine built without zlib")
+    with open(plain_path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return list(EventLog(plain_path)), text, compressed_path
+
+
+def times_of(snapshots):
+    return range(-1, snapshots[-1]["time"] + 3)
+
+
+def test_compressed_log_streams_the_plain_snapshots(logs):
+    plain, _, path = logs
+    log = EventLog(path)
+    assert log.indexed and len(log.blocks) > 2
+    assert log.count == len(plain)
+    assert list(log) == plain
+
+
+def test_seeks_decompress_the_right_block(logs):
+    plain, _, path = logs
+    log = EventLog(path)
+    for i in range(len(plain)):
+        assert log.snapshot(i) == plain[i]
+    with pytest.raises(IndexError):
+        log.snapshot(len(plain))
+    for t in times_of(plain):
+        expected = [s for s in plain if s["time"] <= t]
+        assert log.snapshot_at(t) == (expected[-1] if expected else plain[0])
+
+
+def test_a_run_cut_short_reads_its_blocks_and_the_staged_tail(logs, tmp_path):
+    plain, text, path = logs
+    full = EventLog(path)
+    kept = len(full.blocks) // 2
+    cut = tmp_path / "events.log"
+    with open(path, "rb") as f:
+        cut.write_bytes(f.read(full.blocks[kept].offset)) # No index, no trailer
+    lines = text.splitlines(keepends=True)
+    (tmp_path / ("events.log" + STAGE_SUFFIX)).write_text("".join(lines[full.blocks[kept].first_snapshot:]), encoding="utf-8")
+
+    log = EventLog(str(cut))
+    assert not log.indexed
+    assert len(log.blocks) == kept
+    assert len(log.tail) == len(plain) - log.block_count > 0
+    assert list(log) == plain
+    for i in range(len(plain)):
+        assert log.snapshot(i) == plain[i]
+    for t in times_of(plain):
+        expected = [s for s in plain if s["time"] <= t]
+        assert log.snapshot_at(t) == (expected[-1] if expected else plain[0])
+
+
+def test_a_block_that_cannot_be_written_stays_staged(executable, logs, tmp_path):
+    # events.log cannot be opened (a directory is in its way): every line must survive in the stage file
+    plain = logs[0]
+    os.makedirs(tmp_path / "events.log")
+    run_logged(executable, tmp_path, "log_compress=zlib", f"log_block={BLOCK_KB}")
+    with open(tmp_path / ("events.log" + STAGE_SUFFIX), "r", encoding="utf-8") as f:
+        assert parse_lines(f.read()) == plain
@@ -0,0 +1,249 @@
+import ctypes
+
+import pytest
+
+from engine_lib import Engine
+
+# ====================================================================
+# ALLOCATOR BEHAVIOUR
+# The allocators are driven directly through the library's internal
+# functions, on a freshly initialised engine, with hand-picked requests and
+# known answers. Windows builds export only the SIM_API entry points, so
+# there these tests skip.
+# ====================================================================
+
+BELADY = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+
+
+@pytest.fixture
+def memory(library):
+    engines = []
+
+    def start(frames, *options, procs=2):
+        engine = Engine(library, ["RR", "2", str(frames), "1", str(procs)] + list(options))
+        engines.append(engine)
+        if not hasattr(engine.lib, "buddy_alloc"):
+            pytest.skip("allocator internals are not exported by this build")
+        return engine.lib
+
+    yield start
+    for engine in engines:
+        engine.close()
+
+
+def global_value(lib, name, ctype=ctypes.c_int):
+    return ctype.in_dll(lib, name).value
+
+
+def free_heads(lib):
+    heads = (ctypes.c_int * 31).in_dll(lib, "buddy_free_head")
+    return {order: heads[order] for order in range(31) if heads[order] != -1}
+
+
+# ---------------------------------------------------------------- buddy
+
+def test_buddy_splits_down_to_the_request_and_coalesces_back(memory):
+    lib = memory(16, "memory=buddy")
+    assert free_heads(lib) == {4: 0}
+
+    # One unit splits the 16-slot block four times, leaving one free buddy per order
+    assert lib.buddy_alloc(1) == 0
+    assert free_heads(lib) == {0: 1, 1: 2, 2: 4, 3: 8}
+    assert lib.buddy_alloc(3) == 4  # Rounded up to 4 slots, taken whole from order 2
+    assert lib.buddy_alloc(2) == 2
+    assert global_value(lib, "buddy_splits", ctypes.c_long) == 4
+    assert global_value(lib, "buddy_free_slots", ctypes.c_longlong) == 16 - 1 - 4 - 2
+
+    for slot in (4, 0, 2):
+        lib.buddy_release(slot)
+    assert global_value(lib, "buddy_merges", ctypes.c_long) == 4
+    assert free_heads(lib) == {4: 0}
+    assert global_value(lib, "buddy_free_slots", ctypes.c_longlong) == 16
+
+
+def test_buddy_does_not_merge_a_block_with_a_busy_buddy(memory):
+    lib = memory(16, "memory=buddy")
+    slots = [lib.buddy_alloc(1) for _ in range(16)]
+    assert sorted(slots) == list(range(16))
+    for slot in slots[::2]:
+        lib.buddy_release(slot)
+
+    # Half of memory is free, but in single slots whose buddies are all held
+    assert global_value(lib, "buddy_merges", ctypes.c_long) == 0
+    assert lib.buddy_alloc(2) == -1
+    assert global_value(lib, "buddy_frag_failures", ctypes.c_long) == 1
+
+
+def test_buddy_covers_memory_that_is_not_a_power_of_two(memory):
+    lib = memory(12, "memory=buddy")
+    assert free_heads(lib) == {3: 0, 2: 8}
+    assert lib.buddy_alloc(5) == 0
+    assert lib.buddy_alloc(4) == 8
+    assert lib.buddy_alloc(1) == -1
+
+
+# ----------------------------------------------------------- contiguous
+
+def three_holes(lib):
+    """16 frames left with holes (0, 2), (6, 4) and (11, 5), in address order."""
+    starts = [lib.part_alloc(size) for size in (2, 4, 4, 1)]
+    assert starts == [0, 2, 6, 10]
+    lib.part_release(0, 2)
+    lib.part_release(6, 4)
+    assert global_value(lib, "hole_count") == 3
+    assert global_value(lib, "hole_free_frames") == 11
+
+
+@pytest.mark.parametrize("fit,expected", [
+    ("best", [6, 0]),   # Tightest hole: 4 frames exactly, then the 2-frame hole
+    ("worst", [11, 6]), # Largest hole each time
+    ("next", [11, 0]),  # From the last placement on, wrapping to the first hole that fits
+])
+def test_contiguous_fit_picks_the_policy_hole(memory, fit, expected):
+    lib = memory(16, "memory=contiguous", f"fit={fit}")
+    three_holes(lib)
+    assert [lib.part_alloc(4), lib.part_alloc(2)] == expected
+
+
+def test_contiguous_release_merges_with_both_neighbours(memory):
+    lib = memory(16, "memory=contiguous")
+    lib.external_fragmentation.restype = ctypes.c_double
+    three_holes(lib)
+    assert lib.largest_hole() == 5
+    assert lib.external_fragmentation() == pytest.approx(1 - 5 / 11)
+
+    lib.part_release(2, 4)  # Joins (0, 2) and (6, 4) into one hole
+    assert global_value(lib, "hole_count") == 2
+    assert lib.largest_hole() == 10
+    lib.part_release(10, 1)
+    assert global_value(lib, "hole_count") == 1
+    assert global_value(lib, "hole_free_frames") == 16
+    assert lib.largest_hole() == 16
+    assert lib.external_fragmentation() == 0.0
+
+
+def test_contiguous_failure_with_enough_scattered_frames_is_fragmentation(memory):
+    lib = memory(16, "memory=contiguous")
+    three_holes(lib)
+    assert lib.part_alloc(6) == -1
+    assert global_value(lib, "part_frag_failures", ctypes.c_long) == 1
+    assert lib.part_alloc(12) == -1
+    assert global_value(lib, "part_frag_failures", ctypes.c_long) == 1
+
+
+def hole_list(lib):
+    head = global_value(lib, "hole_head")
+    start, size, nxt = ((ctypes.c_int * 50).in_dll(lib, name) for name in ("hole_start", "hole_size", "hole_next"))
+    holes = []
+    while head >= 0:
+        holes.append((start[head], size[head]))
+        head = nxt[head]
+    return holes
+
+
+@pytest.mark.parametrize("fit", ["best", "worst", "next"])
+def test_free_frame_count_follows_the_holes_through_a_compacting_run(library, fit):
+    # The running count stands in for a walk of the hole list, so the two must never drift apart
+    with Engine(library, ["CFS", "1", "12", "1", "12", "memory=contiguous", f"fit={fit}", "compact=1",
+                          "compact_threshold=10", "seed=1"]) as engine:
+        lib = engine.lib
+        if not hasattr(lib, "hole_free_frames"):
+            pytest.skip("allocator internals are not exported by this build")
+        held = (ctypes.c_int * 50).in_dll(lib, "memory_frames")
+        while engine.step():
+            holes = hole_list(lib)
+            assert global_value(lib, "hole_free_frames") == sum(size for _, size in holes)
+            assert sum(size for _, size in holes) == sum(1 for f in range(12) if held[f] == 0)
+        assert global_value(lib, "compact_moves", ctypes.c_long) > 0
+
+
+# --------------------------------------------------------- demand paging
+
+def replay(policy, frames, pages):
+    """Reference FIFO/LRU/Clock over one process: fault count and the resident set after each access."""
+    resident, loaded, used, ref = [None] * frames, [0] * frames, [0] * frames, [0] * frames
+    hand, faults, sets = 0, 0, []
+    for t, page in enumerate(pages, 1):
+        if page in resident:
+            f = resident.index(page)
+        else:
+            faults += 1
+            if None in resident:
+                f = resident.index(None)
+            elif policy == "fifo":
+                f = loaded.index(min(loaded))
+            elif policy == "lru":
+                f = used.index(min(used))
+            else:
+                while ref[hand]:
+                    ref[hand] = 0
+                    hand = (hand + 1) % frames
+                f, hand = hand, (hand + 1) % frames
+            resident[f], loaded[f] = page, t
+        used[f], ref[f] = t, 1
+        sets.append(set(resident) - {None})
+    return faults, sets
+
+
+def resident_pages(lib, frames):
+    held = (ctypes.c_int * 50).in_dll(lib, "memory_frames")
+    page = (ctypes.c_int * 50).in_dll(lib, "frame_page")
+    return {page[f] for f in range(frames) if held[f]}
+
+
+@pytest.mark.parametrize("policy,frames,faults", [
+    ("fifo", 3, 9),
+    ("fifo", 4, 10), # Belady's anomaly: more frames, more faults
+    ("lru", 3, 10),
+    ("lru", 4, 8),
+    ("clock", 3, 9),
+    ("clock", 4, 10),
+])
+def test_page_replacement_evicts_the_policy_victim(memory, policy, frames, faults):
+    lib = memory(frames, "memory=demand", f"replacement={policy}", procs=1)
+    assert resident_pages(lib, frames) == set()
+    expected_faults, expected_sets = replay(policy, frames, BELADY)
+    assert expected_faults == faults
+
+    for page, expected in zip(BELADY, expected_sets):
+        lib.page_access(0, page)
+        assert resident_pages(lib, frames) == expected
+    assert global_value(lib, "total_faults", ctypes.c_long) == faults
+    assert global_value(lib, "evictions", ctypes.c_long) == faults - frames
+
+
+@pytest.mark.parametrize("policy,refaults", [("lru", 2), ("arc", 0)])
+def test_arc_keeps_reused_pages_through_a_scan(memory, policy, refaults):
+    # Pages 1 and 2 are used twice, then a one-off scan passes through; LRU lets it flush them
+    lib = memory(4, "memory=demand", f"replacement={policy}", procs=1)
+    for page in [1, 2, 1, 2, 3, 4, 5, 6]:
+        lib.page_access(0, page)
+    assert sum(lib.page_access(0, page) for page in (1, 2)) == refaults
+
+
+# ------------------------------------------------------------------ TLB
+
+@pytest.mark.parametrize("repl,evicted", [("lru", 2), ("fifo", 0)])
+def test_tlb_evicts_within_the_set(memory, repl, evicted):
+    # 4 entries in 2 ways: even pages share set 0, odd pages set 1
+    lib = memory(16, "memory=demand", "tlb=4", "tlb_ways=2", f"tlb_repl={repl}")
+    for page in (0, 2, 1):
+        lib.tlb_fill(0, page, page + 10)
+    assert lib.tlb_lookup(0, 0) == 10 # Refreshes page 0 under LRU only
+    lib.tlb_fill(0, 4, 14)
+
+    kept = {0, 2} - {evicted}
+    assert lib.tlb_lookup(0, evicted) == -1
+    assert all(lib.tlb_lookup(0, page) == page + 10 for page in kept | {1, 4})
+
+
+@pytest.mark.parametrize("asid,flushes", [(0, 1), (1, 0)])
+def test_tlb_flushes_on_a_switch_only_without_asids(memory, asid, flushes):
+    lib = memory(16, "memory=demand", "tlb=4", f"tlb_asid={asid}")
+    lib.tlb_switch(0)
+    lib.tlb_fill(0, 3, 7)
+    lib.tlb_switch(1)
+    assert lib.tlb_lookup(1, 3) == -1 # Never another process's translation
+    lib.tlb_switch(0)
+    assert lib.tlb_lookup(0, 3) == (7 if asid else -1)
+    assert global_value(lib, "tlb_flushes", ctypes.c_long) == 2 * flushes
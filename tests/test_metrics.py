@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from metrics import compute_metrics, format_report, jain_index, percentiles
+
+# ====================================================================
+# METRICS
+# Hand-written output.json contents with answers worked out on paper:
+#
+#   P1  burst 4  arrival 0  start 0  completion  4  turnaround 4  waiting 0
+#   P2  burst 2  arrival 1  start 4  completion  6  turnaround 5  waiting 3
+#   P3  burst 4  arrival 2  start 6  completion 10  turnaround 8  waiting 4
+# ====================================================================
+
+
+def process(pid, burst, arrival, start, completion, **extra):
+    turnaround = completion - arrival if completion else 0
+    waiting = turnaround - burst if completion else 0
+    return {"id": pid, "burst": burst, "arrival": arrival, "start": start, "completion": completion,
+            "turnaroundTime": turnaround, "waitingTime": waiting, **extra}
+
+
+def fcfs_run(*extra_processes, **fields):
+    return {
+        "algorithm": "FCFS",
+        "totalTime": 10,
+        "totalBurstTime": 10,
+        "processes": [
+            process(1, 4, 0, 0, 4, switches=2, preemptions=1, switchMs=500),
+            process(2, 2, 1, 4, 6, switches=1, switchMs=250, starvation=2),
+            process(3, 4, 2, 6, 10, switches=1, switchMs=250),
+            *extra_processes,
+        ],
+        **fields,
+    }
+
+
+def test_percentiles_interpolate_linearly():
+    assert percentiles(np.arange(1, 101)) == pytest.approx({"p50": 50.5, "p95": 95.05, "p99": 99.01})
+    assert percentiles(np.array([4, 5, 8])) == pytest.approx({"p50": 5.0, "p95": 7.7, "p99": 7.94})
+
+
+def test_percentiles_of_nothing_are_zero():
+    assert percentiles(np.array([], dtype=np.int64)) == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+
+@pytest.mark.parametrize("values,expected", [
+    ([3, 3, 3, 3], 1.0),
+    ([5, 0, 0, 0], 0.25), # One process gets everything: 1/n
+    ([1, 0.4, 0.5], 1.9 ** 2 / (3 * 1.41)),
+    ([], 1.0),
+    ([0, 0], 1.0),
+])
+def test_jain_index(values, expected):
+    assert jain_index(np.array(values, dtype=float)) == pytest.approx(expected)
+
+
+def test_compute_metrics_summarises_a_known_run():
+    m = compute_metrics(fcfs_run())
+    assert m["algorithm"] == "FCFS"
+    assert (m["num_processes"], m["completed"], m["total_time"]) == (3, 3, 10)
+    assert m["cpu_utilization"] == pytest.approx(100.0)
+    assert m["turnaround"] == pytest.approx({"avg": 17 / 3, "p50": 5.0, "p95": 7.7, "p99": 7.94})
+    assert m["waiting"] == pytest.approx({"avg": 7 / 3, "p50": 3.0, "p95": 3.9, "p99": 3.98})
+    assert m["response"] == m["waiting"] # Non-preemptive: every process waits only before it starts
+    assert m["fairness"] == pytest.approx(1.9 ** 2 / (3 * 1.41)) # Service rates 4/4, 2/5, 4/8
+    assert m["starvation"] == {"processes": 1, "events": 2}
+    assert m["context_switches"] == pytest.approx({"switches": 4, "preemptions": 1, "overhead_seconds": 1.0, "overhead_share": 0.1})
+    assert "deadlines" not in m
+
+
+@pytest.mark.parametrize("window,starts,completions,peak", [
+    (None, list(range(10)), [0, 0, 0, 0, 1, 0, 1, 0, 0, 1], 1.0), # Default: a tenth of the run
+    (5, [0, 5], [1, 2], 0.4), # The last window is closed: completion 10 counts
+    (4, [0, 4, 8], [0, 2, 1], 0.5),
+])
+def test_throughput_windows(window, starts, completions, peak):
+    tp = compute_metrics(fcfs_run(), window=window)["throughput"]
+    assert tp["overall"] == pytest.approx(0.3)
+    assert tp["window"] == (window or 1)
+    assert tp["window_start"] == starts
+    assert tp["completions"] == completions
+    assert tp["peak"] == pytest.approx(peak)
+
+
+def test_a_run_without_processes():
+    m = compute_metrics({"algorithm": "RR", "totalTime": 0, "totalBurstTime": 0, "processes": []})
+    assert (m["num_processes"], m["completed"], m["cpu_utilization"]) == (0, 0, 0.0)
+    for key in ("turnaround", "waiting", "response"):
+        assert m[key] == {"avg": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    assert m["throughput"] == {"overall": 0.0, "window": 1, "window_start": [0], "completions": [0], "peak": 0.0}
+    assert m["fairness"] == 1.0
+    assert m["context_switches"]["overhead_share"] == 0.0
+    format_report(m)
+
+
+def test_a_rejected_process_is_counted_but_not_measured():
+    deadlines = {"utilization": 1.2, "admittedUtilization": 0.9, "bound": 1.0, "schedulable": False,
+                 "admission": True, "rejected": 1, "lateness": [-2, 0, 3]}
+    rejected = process(4, 3, 0, -1, 0, admitted=0)
+    m = compute_metrics(fcfs_run(rejected, deadlines=deadlines))
+
+    # Never started nor finished: absent from every distribution
+    assert (m["num_processes"], m["completed"]) == (4, 3)
+    assert m["turnaround"]["avg"] == pytest.approx(17 / 3)
+    assert m["response"]["avg"] == pytest.approx(7 / 3)
+    assert m["fairness"] == pytest.approx(1.9 ** 2 / (3 * 1.41))
+    assert sum(m["throughput"]["completions"]) == 3
+
+    dl = m["deadlines"]
+    assert (dl["rejected"], dl["jobs"], dl["misses"]) == (1, 3, 1)
+    assert dl["miss_ratio"] == pytest.approx(1 / 3)
+    assert dl["lateness"] == pytest.approx({"avg": 1 / 3, "p50": 0.0, "p95": 2.7, "p99": 2.94, "max": 3})
+    assert dl["tardiness"] == pytest.approx(1.0)
+    assert "Deadline misses: 1/3 jobs (33.3%)" in format_report(m)
+
+
+def test_results_from_older_engines_use_the_defaults():
+    # No start times, switch counts or starvation fields: response is left out rather than guessed
+    m = compute_metrics({"totalTime": 4, "totalBurstTime": 4,
+                         "processes": [{"id": 1, "burst": 4, "completion": 4, "turnaroundTime": 4}]})
+    assert m["algorithm"] == "N/A"
+    assert m["response"]["avg"] == 0.0
+    assert m["turnaround"]["avg"] == 4.0
+    assert m["context_switches"]["switches"] == 0
@@ -0,0 +1,99 @@
+import pytest
+
+from montecarlo import compare_batches, precise_enough, run_batch, summarize, t_critical
+
+# ====================================================================
+# MONTE CARLO STATISTICS
+# Batches run in process on the shared library, over a few seeds each.
+# ====================================================================
+
+WORKLOAD = ["RR", "2", "12", "1", "4"]
+
+
+def batch_command(library, algo="RR"):
+    return [library, algo] + WORKLOAD[1:]
+
+
+@pytest.mark.parametrize("confidence,df,expected", [
+    # Two-sided values from the usual printed Student-t table
+    (0.95, 1, 12.706),
+    (0.95, 2, 4.303),
+    (0.95, 3, 3.182),
+    (0.95, 10, 2.228),
+    (0.95, 29, 2.045),
+    (0.95, 30, 2.042),
+    (0.95, 120, 1.980),
+    (0.90, 2, 2.920),
+    (0.99, 1, 63.657),
+    (0.99, 5, 4.032),
+])
+def test_t_critical_matches_the_table(confidence, df, expected):
+    assert t_critical(confidence, df) == pytest.approx(expected, abs=5e-4)
+
+
+def test_t_critical_approaches_the_normal_quantile():
+    assert t_critical(0.95, 10000) == pytest.approx(1.9602, abs=1e-4)
+    assert t_critical(0.95, 0) == float("inf")
+
+
+def test_summarize_a_known_sample():
+    s = summarize([1, 2, 3, 4, 5])
+    assert (s["n"], s["mean"], s["min"], s["p50"], s["max"]) == (5, 3.0, 1.0, 3.0, 5.0)
+    assert s["std"] == pytest.approx(2.5 ** 0.5)
+    assert s["half_width"] == pytest.approx(2.776 * 2.5 ** 0.5 / 5 ** 0.5, abs=1e-3)
+    assert s["ci_low"] == pytest.approx(3 - s["half_width"])
+    assert s["ci_high"] == pytest.approx(3 + s["half_width"])
+    assert sum(s["histogram"]["counts"]) == 5
+    assert len(s["histogram"]["edges"]) == len(s["histogram"]["counts"]) + 1
+
+
+def test_summarize_one_run_has_no_interval():
+    s = summarize([7])
+    assert (s["mean"], s["std"]) == (7.0, 0.0)
+    assert s["half_width"] == float("inf")
+
+
+@pytest.mark.parametrize("values,expected", [
+    ([4], False), # A single run says nothing about the spread
+    ([4, 4, 4], True),
+    ([9.9, 10, 10.1, 10, 9.9, 10.1], True),
+    ([1, 5, 9], False),
+    ([-1, 1, -1, 1], False), # Mean 0: no relative precision is reachable
+])
+def test_precise_enough(values, expected):
+    assert precise_enough(values, 0.05, 0.95) is expected
+
+
+def test_batch_seeds_do_not_depend_on_the_worker_count(library):
+    kwargs = dict(max_runs=20, min_runs=4, precision=0.5, wave_size=4)
+    one = run_batch(batch_command(library), workers=1, **kwargs)
+    many = run_batch(batch_command(library), workers=3, **kwargs)
+    assert one["seeds"] == many["seeds"]
+    assert one["per_seed"] == many["per_seed"]
+    assert (one["seeds"][1] - one["seeds"][0] + 1) % 4 == 0 # The stop rule only looks at whole waves
+
+
+def test_batch_stops_at_max_runs(library):
+    b = run_batch(batch_command(library), max_runs=6, min_runs=30, wave_size=4, base_seed=11)
+    assert b["seeds"] == [11, 16]
+    assert b["runs"] + b["failed"] == 6
+    assert not b["target"]["reached"]
+
+
+def test_compare_batches_pairs_runs_by_seed(library):
+    c = compare_batches(batch_command(library), ["RR", "FCFS"], max_runs=8, min_runs=30, wave_size=4)
+    rr, fcfs = (c["batches"][v]["per_seed"] for v in ("RR", "FCFS"))
+    assert rr.keys() == fcfs.keys()
+    paired = [fcfs[s]["waiting"] - rr[s]["waiting"] for s in rr]
+    d = c["differences"]["FCFS"]
+    assert d["n"] == len(paired)
+    assert d["mean"] == pytest.approx(sum(paired) / len(paired))
+    assert d["mean"] == pytest.approx(c["batches"]["FCFS"]["metrics"]["waiting"]["mean"] - c["batches"]["RR"]["metrics"]["waiting"]["mean"])
+
+
+def test_pairing_removes_the_workload_variance(library):
+    # The same configuration twice: each batch varies from seed to seed, their paired difference not at all
+    c = compare_batches(batch_command(library), ["RR", "realtime=0"], max_runs=8, min_runs=30, wave_size=4)
+    assert c["batches"]["RR"]["metrics"]["waiting"]["std"] > 0
+    d = c["differences"]["realtime=0"]
+    assert (d["mean"], d["std"], d["half_width"]) == (0.0, 0.0, 0.0)
@@ -0,0 +1,65 @@
+import json
+import subprocess
+
+import numpy as np
+import pytest
+
+from metrics import compute_metrics
+from result_columns import load_columns, read_csv
+
+# ====================================================================
+# COLUMNAR EXPORT ROUND TRIP
+# An engine run with export=1 writes results/ next to output.json; the
+# memory-mapped columns, the CSV and meta.json must say what output.json says.
+# ====================================================================
+
+TIMEOUT = 20
+
+
+@pytest.fixture(params=[
+    ["RR", "2", "12", "1", "10", "seed=4"],
+    ["CFS", "1", "8", "1", "16", "memory=demand", "seed=7"],
+    ["EDF", "2", "12", "1", "6", "rt_jobs=2", "deadline_slack=20", "seed=2"], # Admission control rejects 2 of the 6 tasks
+], ids=["rr", "cfs-demand", "edf-rejections"])
+def exported(request, executable, tmp_path):
+    subprocess.run([executable] + request.param + ["export=1", "realtime=0"], cwd=tmp_path, timeout=TIMEOUT,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    with open(tmp_path / "output.json", "r", encoding="utf-8") as f:
+        return json.load(f), tmp_path / "results"
+
+
+def test_columns_match_output_json(exported):
+    data, results = exported
+    cols = load_columns(str(results))
+    procs = data["processes"]
+    assert len(cols) == data["numProcesses"] == len(procs)
+    for name in cols.columns:
+        assert isinstance(cols[name], np.memmap)
+        assert cols[name].dtype == np.int64
+        assert cols[name].tolist() == [p[name] for p in procs], name
+    assert ["P%d" % pid for pid in cols.timeline.tolist()] == data["timeline"]
+    assert cols.as_results() == {key: data[key] for key in ("numProcesses", "totalTime", "totalBurstTime", "algorithm", "seed")}
+
+
+def test_csv_rows_match_output_json(exported):
+    data, results = exported
+    rows = read_csv(str(results / "results.csv"))
+    by_id = {p["id"]: p for p in data["processes"]}
+    assert sorted(int(row["id"]) for row in rows) == sorted(by_id)
+    for row in rows:
+        p = by_id[int(row["id"])]
+        assert row.pop("status") == p["status"]
+        assert {key: int(value) for key, value in row.items()} == {key: p[key] for key in row}
+
+    # Completion order: finished rows by completion time; rows written at exit (never finished) last
+    done = [int(row["completion"]) for row in rows if int(row["completion"]) > 0]
+    assert done == sorted(done)
+
+
+def test_metrics_from_columns_match_output_json(exported):
+    data, results = exported
+    cols = load_columns(str(results))
+    from_columns = cols.as_results()
+    if "deadlines" in data:
+        from_columns["deadlines"] = data["deadlines"]
+    assert compute_metrics(from_columns, columns=cols) == compute_metrics(data)
@@ -0,0 +1,197 @@
+import pytest
+
+from engine_lib import Engine
+
+# ====================================================================
+# SCHEDULER BEHAVIOUR
+# Small runs in process. The workload comes from the C library's rand(),
+# so expectations are derived from the drawn workload (the result
+# columns): a few-line model of each policy replays it, and the engine's
+# timeline (one entry per slice) must match the model's slice for slice.
+# Memory is large enough that no process ever waits for frames.
+# ====================================================================
+
+TIMEOUT = 20
+SEEDS = [1, 2, 3, 4, 5]
+PROCS = 5
+FRAMES = 20 # Every process's whole claim fits at once, so Banker's never denies
+PRIO_TO_WEIGHT = [9548, 3121, 1024, 335, 110] # sim_engine's CFS weights by priority 1-5
+NICE_0_WEIGHT = 1024
+
+
+def run_engine(library, algo, quantum, seed, *options):
+    args = [algo, str(quantum), str(FRAMES), "1", str(PROCS), f"seed={seed}"] + list(options)
+    with Engine(library, args) as engine:
+        engine.run(timeout=TIMEOUT)
+        return engine.results(), engine.timeline().tolist()
+
+
+def ids(order):
+    return [pid + 1 for pid in order]
+
+
+def queue_model(r, key, preemptive):
+    """Run-queue policies (SJF, SRTF, EDF): lowest key first, ties by arrival then slot.
+
+    A preemptive policy only runs up to the next arrival, where a newcomer may take over.
+    """
+    n = len(r["burst"])
+    remaining = [int(b) for b in r["burst"]]
+    arrival = [int(a) for a in r["arrival"]]
+    t, order, finish = 0, [], [0] * n
+    while any(remaining):
+        ready = [i for i in range(n) if remaining[i] and arrival[i] <= t]
+        later = [arrival[i] for i in range(n) if remaining[i] and arrival[i] > t]
+        if not ready:
+            t = min(later)
+            continue
+        i = min(ready, key=lambda i: (key(i, remaining), arrival[i], i))
+        run = remaining[i]
+        if preemptive and later:
+            run = min(run, min(later) - t)
+        t += run
+        remaining[i] -= run
+        order.append(i)
+        if not remaining[i]:
+            finish[i] = t
+    return order, finish
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_fcfs_scan_runs_one_second_per_process_per_pass(library, seed):
+    r, timeline = run_engine(library, "FCFS", 2, seed, "dispatch=scan")
+    remaining, expected = [int(b) for b in r["burst"]], []
+    while any(remaining):
+        for i in range(PROCS):
+            if remaining[i]:
+                remaining[i] -= 1
+                expected.append(i)
+    assert timeline == ids(expected)
+
+
+@pytest.mark.parametrize("quantum", [1, 2, 3])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_rr_scan_rotates_through_the_table(library, seed, quantum):
+    r, timeline = run_engine(library, "RR", quantum, seed, "dispatch=scan")
+    remaining, expected = [int(b) for b in r["burst"]], []
+    while any(remaining):
+        for i in range(PROCS):
+            if remaining[i]:
+                remaining[i] -= min(quantum, remaining[i])
+                expected.append(i)
+    assert timeline == ids(expected)
+
+
+@pytest.mark.parametrize("algo,quantum", [("RR", 2), ("FCFS", 1)])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_priority_dispatch_runs_the_highest_priority_first(library, seed, algo, quantum):
+    r, timeline = run_engine(library, algo, quantum, seed)
+    expected = []
+    for i in sorted(range(PROCS), key=lambda i: (r["prio"][i], i)):
+        expected += [i] * -(-int(r["burst"][i]) // quantum)
+    assert timeline == ids(expected)
+
+
+@pytest.mark.parametrize("quantum", [1, 2])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_cfs_picks_the_smallest_weighted_vruntime(library, seed, quantum):
+    r, timeline = run_engine(library, "CFS", quantum, seed)
+    weight = [PRIO_TO_WEIGHT[p - 1] for p in r["prio"]]
+    remaining = [int(b) for b in r["burst"]]
+    vruntime = [0] * PROCS
+    expected = []
+    while any(remaining):
+        queued = [i for i in range(PROCS) if remaining[i]]
+        i = min(queued, key=lambda i: (vruntime[i], i))
+        total = sum(weight[j] for j in queued)
+        run = min(remaining[i], max(1, quantum * len(queued) * weight[i] // total))
+        remaining[i] -= run
+        vruntime[i] += run * 1000 * NICE_0_WEIGHT // weight[i]
+        expected.append(i)
+    assert timeline == ids(expected)
+    assert r["vruntime"].tolist() == vruntime
+
+
+@pytest.mark.parametrize("quantum", [1, 2])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_mlfq_demotes_after_a_full_quantum(library, seed, quantum):
+    levels = 3
+    r, timeline = run_engine(library, "MLFQ", quantum, seed, f"mlfq_levels={levels}", "mlfq_boost=0")
+    remaining = [int(b) for b in r["burst"]]
+    level = [0] * PROCS
+    queues = [list(range(PROCS))] + [[] for _ in range(levels - 1)]
+    expected = []
+    while any(queues):
+        l = next(l for l in range(levels) if queues[l])
+        i = queues[l].pop(0)
+        slice_s = quantum << l
+        run = min(slice_s, remaining[i])
+        remaining[i] -= run
+        expected.append(i)
+        if remaining[i]:
+            if run >= slice_s and l < levels - 1:
+                level[i] = l + 1
+            queues[level[i]].append(i)
+    assert timeline == ids(expected)
+    assert r["level"].tolist() == level
+
+
+@pytest.mark.parametrize("gap", [0, 3])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_sjf_runs_the_shortest_arrived_job_to_completion(library, seed, gap):
+    r, timeline = run_engine(library, "SJF", 2, seed, f"arrival_gap={gap}")
+    order, finish = queue_model(r, lambda i, rem: rem[i], preemptive=False)
+    assert timeline == ids(order)
+    assert r["completion"].tolist() == finish
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_srtf_preempts_for_a_shorter_remaining_time(library, seed):
+    r, timeline = run_engine(library, "SRTF", 2, seed, "arrival_gap=3")
+    order, finish = queue_model(r, lambda i, rem: rem[i], preemptive=True)
+    assert timeline == ids(order)
+    assert r["completion"].tolist() == finish
+
+
+@pytest.mark.parametrize("gap", [0, 3])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_edf_runs_the_earliest_deadline_first(library, seed, gap):
+    r, timeline = run_engine(library, "EDF", 2, seed, f"arrival_gap={gap}", "deadline_slack=6", "rt_admit=0")
+    deadline = [int(a + d) for a, d in zip(r["arrival"], r["deadline"])]
+    order, finish = queue_model(r, lambda i, rem: deadline[i], preemptive=True)
+    assert timeline == ids(order)
+    assert r["completion"].tolist() == finish
+    assert r["misses"].tolist() == [int(f > d) for f, d in zip(finish, deadline)]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_srtf_waits_no_longer_than_fcfs_or_sjf(library, seed):
+    # SRTF minimises the average waiting time on a workload with arrivals
+    waits = {algo: run_engine(library, algo, 2, seed, "arrival_gap=2")[0]["waitingTime"].mean()
+             for algo in ("SRTF", "SJF", "FCFS")}
+    assert waits["SRTF"] <= waits["SJF"] and waits["SRTF"] <= waits["FCFS"]
+
+
+def run_results(library, args):
+    with Engine(library, args) as engine:
+        engine.run(timeout=TIMEOUT)
+        return engine.results()
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("algo", ["EDF", "RR", "CFS", "MLFQ", "SJF"])
+def test_a_lone_periodic_task_never_waits(library, algo, seed):
+    # Parked between releases is not waiting: with nobody to compete with, every job runs on release
+    r = run_results(library, [algo, "2", "12", "1", "1", "rt_jobs=3", "deadline_slack=8", f"seed={seed}"])
+    assert r["jobs"][0] == 3
+    assert r["waitingTime"][0] == 0
+    assert r["turnaroundTime"][0] >= 3 * r["burst"][0]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_periodic_waiting_leaves_out_the_time_parked(library, seed):
+    r = run_results(library, ["EDF", "2", "20", "1", "3", "rt_jobs=3", f"seed={seed}"])
+    done = r["admitted"] == 1
+    waiting = r["waitingTime"][done]
+    assert (waiting >= 0).all()
+    assert (waiting <= r["turnaroundTime"][done] - r["burst"][done] * r["jobs"][done]).all()